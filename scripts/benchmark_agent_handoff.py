@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: handing an uploaded dataset to an agent, dict payload vs dataset reference
+The old API path loaded the session's frame and embedded df.to_dict() in
+the task (the first 10 000 rows for /analyze, everything for /visualize);
+tasks now carry the dataset path and agents load it through the shared
+dataset cache.
+
+Every case is timed cold (dataset cache cleared, so the upload is parsed
+again) and warm. The reference case runs a full 'analyze' task through
+DataAnalysisAgent, so its time includes loading and analysing the data,
+while the dict cases stop once the payload is built. Each case runs in its
+own process, so the RSS before and after its cold call is not inflated by
+the other cases; the peak Python heap of that call is reported alongside.
+
+1M-row upload (50 MB CSV), one core:
+  task payload                      cold s  warm s  RSS before  RSS after  peak MB
+  analyze: head(10000).to_dict()     0.144   0.019       355.4      363.1     24.8
+  visualize: to_dict()               2.658   2.784       365.0     1377.8    439.7
+  dataset reference + agent          0.221   0.113       346.9      353.3     24.8
+"""
+
+import gc
+import sys
+import time
+import subprocess
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import psutil
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from agents import DataAnalysisAgent
+from storage import get_dataset_cache, ingest_file, load_dataset
+
+
+def dict_payload(dataset_path: str, head: int = None) -> dict:
+    df = load_dataset(dataset_path)
+    if head is not None and len(df) >= head:
+        df = df.head(head)
+    return {'type': 'analyze', 'data': df.to_dict()}
+
+
+def reference_task(agent: DataAnalysisAgent, dataset_path: str) -> dict:
+    result = agent.execute({'type': 'analyze', 'data_path': dataset_path})
+    assert result.get('success'), result
+    return result
+
+
+def rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 1024**2
+
+
+def measure(func, *args, repeats: int = 3) -> dict:
+    """Cold and warm best-of wall times, RSS around a cold call and its peak heap"""
+    cache = get_dataset_cache()
+
+    cold = []
+    for _ in range(repeats):
+        cache.clear()
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        cold.append(time.perf_counter() - start)
+
+    warm = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        warm.append(time.perf_counter() - start)
+
+    cache.clear()
+    gc.collect()
+    rss_before = rss_mb()
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = rss_mb()
+    del result
+
+    return {
+        'cold': min(cold),
+        'warm': min(warm),
+        'rss_before': rss_before,
+        'rss_after': rss_after,
+        'peak': peak / 1024**2
+    }
+
+
+CASES = [
+    ('analyze: head(10000).to_dict()', lambda path: (dict_payload, (path, 10_000))),
+    ('visualize: to_dict()', lambda path: (dict_payload, (path,))),
+    ('dataset reference + agent', lambda path: (reference_task, (DataAnalysisAgent(), path)))
+]
+
+
+def run_case(index: int, dataset_path: str, repeats: int):
+    name, make = CASES[index]
+    func, func_args = make(dataset_path)
+    m = measure(func, *func_args, repeats=repeats)
+    print(f"{name:<32} {m['cold']:>8.3f} {m['warm']:>8.3f} "
+          f"{m['rss_before']:>11.1f} {m['rss_after']:>10.1f} {m['peak']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    # Internal: measure one case on an already ingested dataset
+    parser.add_argument('--case', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--dataset', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case is not None:
+        run_case(args.case, args.dataset, args.repeats)
+        return
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'id': np.arange(args.rows),
+        'value': rng.normal(size=args.rows),
+        'amount': rng.exponential(100, size=args.rows),
+        'category': rng.choice(['a', 'b', 'c', 'd'], size=args.rows),
+        'flag': rng.integers(0, 2, size=args.rows).astype(bool)
+    })
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = Path(tmpdir) / "upload.csv"
+        df.to_csv(csv_path, index=False)
+        del df
+        dataset_path = ingest_file(csv_path).dataset_path
+
+        print(f"{args.rows:,} rows uploaded ({csv_path.stat().st_size / 1024**2:.0f} MB CSV)")
+        print(f"{'task payload':<32} {'cold s':>8} {'warm s':>8} "
+              f"{'RSS before':>11} {'RSS after':>10} {'peak MB':>8}")
+        for index in range(len(CASES)):
+            subprocess.run(
+                [sys.executable, __file__, '--case', str(index),
+                 '--dataset', str(dataset_path), '--repeats', str(args.repeats)],
+                check=True
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ModelTrainer auto mode, sequential single-core loop vs parallel candidates
+The old loop fitted RandomForest (one core), LogisticRegression and SVC one
+after another; candidates now run concurrently in the process pool with
+n_jobs budgeted across the cores. The gain scales with cores: with one core
+both paths run the candidates one at a time (16.9s vs 14.6s at 20k rows,
+within run-to-run noise), and no multi-core run has been recorded yet
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.svm import SVC
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from ml.candidates import core_budget, fit_candidates, get_candidate_pool
+
+
+def make_candidates() -> dict:
+    return {
+        'rf': RandomForestClassifier(random_state=42),
+        'lr': LogisticRegression(random_state=42, max_iter=1000),
+        'svm': SVC(random_state=42)
+    }
+
+
+def sequential(X_train, y_train, X_test, y_test) -> dict:
+    timings = {}
+    for name, model in make_candidates().items():
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        model.score(X_test, y_test)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--features', type=int, default=20)
+    args = parser.parse_args()
+
+    X, y = make_classification(n_samples=args.rows, n_features=args.features, random_state=0)
+    X = pd.DataFrame(X, columns=[f"f{i}" for i in range(args.features)])
+    X_train, X_test, y_train, y_test = train_test_split(X, pd.Series(y), test_size=0.2, random_state=42)
+
+    pool = get_candidate_pool()
+    pool.warm()
+    workers, n_jobs = core_budget(3, pool.max_workers)
+    print(f"{args.rows:,} rows x {args.features} features, {os.cpu_count()} cores, "
+          f"{workers} candidates at a time with n_jobs={n_jobs}")
+
+    start = time.perf_counter()
+    timings = sequential(X_train, y_train, X_test, y_test)
+    baseline = time.perf_counter() - start
+    print(f"sequential: {baseline:.2f}s  " + "  ".join(f"{k}={v:.2f}s" for k, v in timings.items()))
+
+    start = time.perf_counter()
+    results = fit_candidates(make_candidates(), X_train, y_train, X_test, y_test, pool=pool)
+    elapsed = time.perf_counter() - start
+    print(f"parallel:   {elapsed:.2f}s  " + "  ".join(f"{r.name}={r.fit_time:.2f}s" for r in results)
+          + f"  ({baseline / elapsed:.1f}x)")
+
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dataset fingerprinting cost
+Compares the former registry hash (SHA-256 of X.to_json()) with
+data_fingerprint, full and sampled, on mixed-type frames. The JSON hash is
+only timed up to --legacy-max-rows since it needs gigabytes of strings
+beyond that.
+"""
+
+import sys
+import time
+import hashlib
+import argparse
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from storage import data_fingerprint
+from storage.fingerprint import xxhash
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'sales': rng.normal(100, 10, rows),
+        'cost': rng.normal(50, 5, rows),
+        'units': rng.integers(1, 20, rows),
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D'),
+        'region': pd.Categorical(rng.choice(['north', 'south', 'east', 'west'], rows)),
+        'sku': rng.choice([f'sku-{i}' for i in range(1000)], rows)
+    })
+
+
+def legacy_hash(df: pd.DataFrame) -> str:
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # to_json's date format deprecation
+        return hashlib.sha256(df.to_json().encode()).hexdigest()[:16]
+
+
+def best_of(func, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--sample-rows', type=int, default=100_000)
+    parser.add_argument('--legacy-max-rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"digest: {'xxh3_128' if xxhash is not None else 'sha256'}")
+    print(f"{'rows':>11} {'MB':>8} {'to_json (s)':>12} {'full (s)':>9} {'sampled (s)':>12}")
+    for rows in args.rows:
+        df = make_frame(rows)
+        size_mb = df.memory_usage(deep=True).sum() / 1024**2
+
+        legacy = '-'
+        if rows <= args.legacy_max_rows:
+            legacy = f"{best_of(lambda: legacy_hash(df), 1):.3f}"
+        full = best_of(lambda: data_fingerprint(df), args.runs)
+        sampled = best_of(lambda: data_fingerprint(df, sample_rows=args.sample_rows), args.runs)
+
+        print(f"{rows:>11,} {size_mb:>8.0f} {legacy:>12} {full:>9.3f} {sampled:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
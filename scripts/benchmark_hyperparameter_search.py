@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark: RandomForest tuning, exhaustive GridSearchCV vs successive halving
+Same 18-configuration grid ModelTrainer uses; reports wall time, the chosen
+parameters, holdout accuracy and the halving schedule with per-rung timings
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import pandas as pd
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GridSearchCV, train_test_split
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from ml.search import halving_search
+
+PARAM_GRID = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [None, 10, 20],
+    'min_samples_split': [2, 5]
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--features', type=int, default=10)
+    parser.add_argument('--cv', type=int, default=3)
+    parser.add_argument('--time-budget', type=float, default=None)
+    args = parser.parse_args()
+
+    X, y = make_classification(n_samples=args.rows, n_features=args.features, n_informative=5, random_state=0)
+    X = pd.DataFrame(X, columns=[f"f{i}" for i in range(args.features)])
+    X_train, X_test, y_train, y_test = train_test_split(X, pd.Series(y), test_size=0.2, random_state=42)
+    model = RandomForestClassifier(random_state=42)
+
+    start = time.perf_counter()
+    grid = GridSearchCV(model, PARAM_GRID, cv=args.cv, scoring='accuracy', n_jobs=-1).fit(X_train, y_train)
+    grid_seconds = time.perf_counter() - start
+    print(f"grid:    {grid_seconds:7.2f}s  holdout {grid.best_estimator_.score(X_test, y_test):.4f}  "
+          f"{grid.best_params_}")
+
+    start = time.perf_counter()
+    result = halving_search(model, PARAM_GRID, X_train, y_train, scoring='accuracy',
+                            cv=args.cv, time_budget=args.time_budget)
+    halving_seconds = time.perf_counter() - start
+    print(f"halving: {halving_seconds:7.2f}s  holdout {result.best_estimator.score(X_test, y_test):.4f}  "
+          f"{result.best_params}  ({grid_seconds / halving_seconds:.1f}x)")
+
+    print(f"{'rung':>4} {'rows':>8} {'candidates':>10} {'seconds':>8} {'best cv':>8}")
+    for rung in result.rungs:
+        print(f"{rung.rung:>4} {rung.n_samples:>8,} {rung.n_candidates:>10} {rung.seconds:>8.2f} {rung.best_score:>8.4f}")
+    print(f"refit {result.refit_seconds:.2f}s, stopped early: {result.stopped_early}")
+
+
+if __name__ == "__main__":
+    main()
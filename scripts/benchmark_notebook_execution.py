@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-task latency of CLI vs in-process Marimo notebook execution
+Runs the workflow profiling notebook repeatedly through NotebookRunner,
+once as a fresh Python process per task and once through App.run() with
+the dataset already loaded
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from marimo_integration import NotebookRunner
+from storage import load_dataset
+from workflow.workflow_manager import SimpleNotebookGenerator
+
+PROFILING_CODE = """
+profiling_results = {
+    'shape': df.shape,
+    'missing': df.isnull().sum().to_dict(),
+    'summary': df.describe().to_dict()
+}
+"""
+
+
+def make_dataset(path: Path, rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'sales': rng.normal(100, 10, rows),
+        'cost': rng.normal(50, 5, rows),
+        'units': rng.integers(1, 20, rows),
+        'region': rng.choice(['north', 'south', 'east', 'west'], rows)
+    }).to_csv(path, index=False)
+
+
+def time_runs(runner: NotebookRunner, notebook: Path, runs: int, data=None) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = runner.run_notebook(str(notebook), data=data)
+        timings.append(time.perf_counter() - start)
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        data_path = tmpdir / "data.csv"
+        make_dataset(data_path, args.rows)
+
+        notebook = tmpdir / "profiling.py"
+        notebook.write_text(SimpleNotebookGenerator().generate_notebook(
+            data_path=str(data_path),
+            analysis_type="profiling",
+            output_var="profiling_results",
+            additional_code=PROFILING_CODE
+        ))
+
+        cli = time_runs(NotebookRunner(tmpdir, in_process=False), notebook, args.runs)
+
+        in_process_runner = NotebookRunner(tmpdir, in_process=True)
+        data = load_dataset(str(data_path))
+        # First in-process run pays the imports once, like a warm server would have
+        first = time_runs(in_process_runner, notebook, 1, data=data)[0]
+        warm = time_runs(in_process_runner, notebook, args.runs, data=data)
+
+    print(f"{args.rows} rows, {args.runs} runs per mode")
+    print(f"{'mode':<22} {'median (s)':>11} {'min (s)':>9}")
+    print(f"{'cli (process/task)':<22} {np.median(cli):>11.3f} {min(cli):>9.3f}")
+    print(f"{'in-process (first)':<22} {first:>11.3f} {first:>9.3f}")
+    print(f"{'in-process (warm)':<22} {np.median(warm):>11.3f} {min(warm):>9.3f}")
+    print(f"speedup (median, warm): {np.median(cli) / np.median(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-row prediction throughput with and without micro-batching
+Concurrent clients send one-row requests for a registered RandomForest,
+either each calling predict/predict_proba itself (as the endpoint did) or
+through a PredictionBatcher
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from ml.model_registry import ModelRegistry
+from ml.batching import PredictionBatcher
+
+
+def direct_predict(registry: ModelRegistry, model_id: str, X: pd.DataFrame):
+    model = registry.load_model(model_id)
+    model.predict(X)
+    model.predict_proba(X)
+
+
+def run_clients(request, rows: list, clients: int) -> tuple:
+    """(requests per second, per-request latencies in ms)"""
+    def timed(row):
+        start = time.perf_counter()
+        request(row)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = list(pool.map(timed, rows))
+    return len(rows) / (time.perf_counter() - start), np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--window-ms', type=float, default=3)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(20_000, 10)), columns=[f"f{i}" for i in range(10)])
+    y = pd.Series((X['f0'] + rng.normal(size=len(X)) > 0).astype(int), name='target')
+    model = RandomForestClassifier(n_estimators=args.trees, max_depth=12, random_state=0).fit(X, y)
+    rows = [X.iloc[[i % len(X)]] for i in range(args.requests)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        registry = ModelRegistry(registry_path=tmpdir)
+        model_id = registry.register_model(model, "bench_forest", "1.0", X, y, auto_evaluate=False)
+        registry.load_model(model_id)
+
+        direct = run_clients(lambda row: direct_predict(registry, model_id, row), rows, args.clients)
+        batcher = PredictionBatcher(registry, args.window_ms, args.max_batch_size)
+        batched = run_clients(lambda row: batcher.predict(model_id, row), rows, args.clients)
+        stats = batcher.get_stats()
+
+    print(f"{args.requests} single-row requests, {args.clients} clients, {args.trees} trees")
+    print(f"{'mode':<10} {'req/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for name, (throughput, latencies) in [('direct', direct), ('batched', batched)]:
+        print(f"{name:<10} {throughput:>8.0f} {np.percentile(latencies, 50):>9.1f} "
+              f"{np.percentile(latencies, 99):>9.1f}")
+    print(f"batches: {stats['batches']}, mean rows/batch: {stats['mean_batch_rows']:.1f}, "
+          f"max: {stats['max_batch_rows']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bulk prediction request/response encoding, JSON vs Arrow vs Parquet
+Times the full serialization path of a predict call on both sides (client
+encode, server decode, predict/predict_proba, server encode, client
+decode) for a logistic regression on 10 float features
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from storage import ARROW_STREAM_TYPE, PARQUET_TYPE, decode_frame, encode_frame
+
+
+def json_round_trip(model, X: pd.DataFrame) -> int:
+    body = json.dumps({'data': X.to_dict('records')})
+    # Server
+    rows = pd.DataFrame(json.loads(body)['data'])
+    response = json.dumps({
+        'predictions': model.predict(rows).tolist(),
+        'probabilities': model.predict_proba(rows).tolist()
+    })
+    # Client
+    json.loads(response)
+    return len(body) + len(response)
+
+
+def columnar_round_trip(model, X: pd.DataFrame, content_type: str) -> int:
+    body = encode_frame(X, content_type)
+    # Server
+    rows = decode_frame(body, content_type)
+    probabilities = model.predict_proba(rows)
+    frame = pd.DataFrame({'prediction': model.predict(rows)})
+    for i in range(probabilities.shape[1]):
+        frame[f'probability_{i}'] = probabilities[:, i]
+    response = encode_frame(frame, content_type)
+    # Client
+    decode_frame(response, content_type)
+    return len(body) + len(response)
+
+
+def timed(func, *args) -> tuple:
+    start = time.perf_counter()
+    nbytes = func(*args)
+    return time.perf_counter() - start, nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    columns = [f"f{i}" for i in range(10)]
+    train = pd.DataFrame(rng.normal(size=(10_000, 10)), columns=columns)
+    model = LogisticRegression().fit(train, train['f0'] > 0)
+
+    print(f"{'rows':>10} {'format':<8} {'seconds':>9} {'MB on wire':>11} {'speedup':>8}")
+    for rows in args.rows:
+        X = pd.DataFrame(rng.normal(size=(rows, 10)), columns=columns)
+        baseline, nbytes = timed(json_round_trip, model, X)
+        print(f"{rows:>10,} {'json':<8} {baseline:>9.3f} {nbytes / 1024**2:>11.1f} {1.0:>7.1f}x")
+        for name, content_type in [('arrow', ARROW_STREAM_TYPE), ('parquet', PARQUET_TYPE)]:
+            seconds, nbytes = timed(columnar_round_trip, model, X, content_type)
+            print(f"{rows:>10,} {name:<8} {seconds:>9.3f} {nbytes / 1024**2:>11.1f} "
+                  f"{baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-row prediction latency with and without the model cache
+Runs what the predict endpoint does per request (registry lookup, model
+load, one-row predict_proba) against a registered RandomForest, once
+unpickling the model on every call and once served from the ModelCache
+after pre-warming production models
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from ml.model_registry import ModelRegistry
+
+
+def predict_once(registry: ModelRegistry, model_id: str, row: pd.DataFrame) -> tuple:
+    """(model lookup seconds, total seconds) for one request"""
+    start = time.perf_counter()
+    model = registry.load_model(model_id)
+    metadata = registry.get_model_metadata(model_id)
+    loaded = time.perf_counter()
+    X = row[metadata.feature_names]
+    model.predict(X)
+    model.predict_proba(X)
+    return loaded - start, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--trees', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--cold-requests', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(args.rows, 10)), columns=[f"f{i}" for i in range(10)])
+    y = pd.Series((X['f0'] + rng.normal(size=args.rows) > 0).astype(int), name='target')
+    model = RandomForestClassifier(n_estimators=args.trees, n_jobs=-1, random_state=0).fit(X, y)
+    # Single-row requests don't benefit from fanning out over cores
+    model.set_params(n_jobs=1)
+    row = X.iloc[[0]]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        registry = ModelRegistry(registry_path=tmpdir)
+        model_id = registry.register_model(model, "bench_forest", "1.0", X, y, auto_evaluate=False)
+        registry.promote_model(model_id, "production")
+        size_mb = Path(registry.get_model_metadata(model_id).file_path).stat().st_size / 1024**2
+
+        cold = []
+        for _ in range(args.cold_requests):
+            registry.model_cache.clear()
+            cold.append(predict_once(registry, model_id, row))
+
+        registry.model_cache.clear()
+        registry.warm_cache()
+        warm = [predict_once(registry, model_id, row) for _ in range(args.requests)]
+
+    print(f"RandomForest, {args.trees} trees, {size_mb:.0f} MB pickled")
+    print(f"{'mode':<18} {'load p50':>9} {'load p99':>9} {'total p50':>10} {'total p99':>10}  (ms)")
+    for name, timings in [('unpickle/request', cold), ('model cache', warm)]:
+        load, total = (np.array(t) * 1000 for t in zip(*timings))
+        print(f"{name:<18} {np.percentile(load, 50):>9.2f} {np.percentile(load, 99):>9.2f} "
+              f"{np.percentile(total, 50):>10.1f} {np.percentile(total, 99):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
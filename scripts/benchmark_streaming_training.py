@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MLAgent training, in-memory fit vs streaming partial_fit
+Each mode runs in a fresh process on the same CSV; reports wall time, peak
+RSS and holdout metrics. In-memory peak grows with the file, streaming
+peak with chunk_size
+"""
+
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+
+def run_mode(mode: str, path: str, chunk_size: int):
+    """Child process: train once and print a JSON summary"""
+    from agents import MLAgent
+
+    task = {'ml_task': 'train', 'data_path': path, 'target_column': 'target', 'model_type': 'linear'}
+    if mode == 'streaming':
+        task.update(mode='streaming', chunk_size=chunk_size)
+
+    start = time.perf_counter()
+    result = MLAgent().execute(task)
+    print(json.dumps({
+        'seconds': time.perf_counter() - start,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'model_type': result.get('model_type'),
+        'metrics': result.get('metrics'),
+        'error': result.get('error')
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--features', type=int, default=20)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--run', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_mode(args.run[0], args.run[1], args.chunk_size)
+        return
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.rows, args.features))
+    df = pd.DataFrame(X, columns=[f"f{i}" for i in range(args.features)])
+    df['target'] = X @ rng.normal(size=args.features) + rng.normal(scale=0.5, size=args.rows)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "train.csv")
+        df.to_csv(path, index=False)
+        del df, X
+        print(f"{args.rows:,} rows x {args.features} features, "
+              f"{Path(path).stat().st_size / 1024**2:.0f} MB CSV, chunk_size {args.chunk_size:,}")
+
+        print(f"{'mode':<10} {'seconds':>8} {'peak RSS MB':>12} {'model':>13}  metrics")
+        for mode in ['in-memory', 'streaming']:
+            output = subprocess.run(
+                [sys.executable, __file__, '--chunk-size', str(args.chunk_size), '--run', mode, path],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            summary = json.loads(output)
+            print(f"{mode:<10} {summary['seconds']:>8.2f} {summary['peak_rss_mb']:>12.0f} "
+                  f"{summary['model_type']:>13}  {summary['metrics'] or summary['error']}")
+
+
+if __name__ == "__main__":
+    main()
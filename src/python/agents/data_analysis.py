@@ -4,6 +4,8 @@ from typing import Any, Dict, Optional, List
 from pathlib import Path
 
 from .base import BaseAgent, AgentConfig
+from storage import load_dataset
+from execution.profiling import profile_file, DEFAULT_CHUNK_SIZE
 
 
 class DataAnalysisAgent(BaseAgent):
@@ -36,6 +38,9 @@ class DataAnalysisAgent(BaseAgent):
         if not data_path:
             return {'error': 'No data_path provided'}
         
+        if task.get('mode') == 'streaming':
+            return self._analyze_streaming(data_path, task.get('chunk_size', DEFAULT_CHUNK_SIZE))
+        
         try:
             # Load data
             df = self._load_data(data_path)
@@ -60,6 +65,27 @@ class DataAnalysisAgent(BaseAgent):
             self.logger.error(f"Analysis failed: {e}")
             return {'error': str(e)}
     
+    def _analyze_streaming(self, data_path: str, chunk_size: int) -> Dict[str, Any]:
+        """Same analysis as _analyze_data, computed chunk by chunk for files larger than RAM"""
+        try:
+            profiler = profile_file(data_path, chunk_size=chunk_size)
+            profile = profiler.profile()
+            
+            analysis = {
+                'shape': (profile['shape']['rows'], profile['shape']['columns']),
+                'columns': profile['columns'],
+                'dtypes': profile['dtypes'],
+                'missing_values': profile['missing_values'],
+                'summary': profiler.describe(),
+                'approximate': True
+            }
+            
+            return {'success': True, 'analysis': analysis}
+            
+        except Exception as e:
+            self.logger.error(f"Streaming analysis failed: {e}")
+            return {'error': str(e)}
+    
     def _summarize_data(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Generate data summary"""
         data_path = task.get('data_path')
@@ -116,19 +142,8 @@ class DataAnalysisAgent(BaseAgent):
             return {'error': str(e)}
     
     def _load_data(self, path: str) -> pd.DataFrame:
-        """Load data from various formats"""
-        path = Path(path)
-        
-        if path.suffix == '.csv':
-            return pd.read_csv(path)
-        elif path.suffix in ['.xlsx', '.xls']:
-            return pd.read_excel(path)
-        elif path.suffix == '.json':
-            return pd.read_json(path)
-        elif path.suffix == '.parquet':
-            return pd.read_parquet(path)
-        else:
-            raise ValueError(f"Unsupported file format: {path.suffix}")
+        """Load data from various formats (through the shared dataset cache)"""
+        return load_dataset(path)
     
     def _save_data(self, df: pd.DataFrame, path: str) -> None:
         """Save data to file"""
@@ -10,6 +10,7 @@ import pandas as pd
 import json
 
 from .base import BaseAgent, AgentConfig
+from storage import load_dataset
 from llm import GeminiClient, LLMConfig
 
 
@@ -67,7 +68,7 @@ class IntelligentAgent(BaseAgent):
         
         try:
             # Load data
-            df = pd.read_csv(data_path)
+            df = load_dataset(data_path)
             
             # Basic analysis (no API calls)
             basic_stats = {
@@ -4,13 +4,12 @@ Performs predictive analysis and model training
 """
 
 import pandas as pd
-import numpy as np
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
-import json
 import pickle
 
 from .base import BaseAgent, AgentConfig
+from storage import load_dataset, attach_frame
 
 
 class MLAgent(BaseAgent):
@@ -42,23 +41,27 @@ class MLAgent(BaseAgent):
     
     def _train_model(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Train a machine learning model"""
+        if task.get('mode') == 'streaming':
+            return self._train_streaming(task)
+        
         try:
             # Import here to avoid dependency issues if not installed
             from sklearn.model_selection import train_test_split
             from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
             from sklearn.linear_model import LinearRegression, LogisticRegression
             from sklearn.metrics import mean_squared_error, accuracy_score, r2_score
+            from ml.preprocessing import PREPROCESS_STEP, build_preprocessor, describe_preprocessor, with_preprocessing
             
             data_path = task.get('data_path')
             target_column = task.get('target_column')
             model_type = task.get('model_type', 'auto')
             task_type = task.get('task_type', 'auto')  # regression or classification
             
-            if not data_path or not target_column:
+            if not (data_path or task.get('shared_frame')) or not target_column:
                 return {'error': 'data_path and target_column required'}
             
             # Load data
-            df = pd.read_csv(data_path)
+            df = self._load_frame(task)
             
             if target_column not in df.columns:
                 return {'error': f'Target column {target_column} not found'}
@@ -127,11 +130,13 @@ class MLAgent(BaseAgent):
                 else:
                     model = RandomForestRegressor(n_estimators=100, random_state=42)
             
-            # Train
-            model.fit(X_train, y_train)
+            # Train behind a preprocessing stage fitted on the training rows
+            pipeline = with_preprocessing(build_preprocessor(X_train), model)
+            pipeline.fit(X_train, y_train)
+            preprocessor = pipeline[PREPROCESS_STEP]
             
             # Evaluate
-            y_pred = model.predict(X_test)
+            y_pred = pipeline.predict(X_test)
             
             if task_type == 'regression':
                 mse = mean_squared_error(y_test, y_pred)
@@ -142,12 +147,14 @@ class MLAgent(BaseAgent):
                 metrics = {'accuracy': float(accuracy)}
             
             # Store model
-            model_id = f"{Path(data_path).stem}_{target_column}_{model_type}"
+            model_id = f"{Path(data_path or 'shared').stem}_{target_column}_{model_type}"
+            preprocessing = describe_preprocessor(preprocessor)
             self.models[model_id] = {
-                'model': model,
+                'model': pipeline,
                 'feature_names': list(X.columns),
                 'target_column': target_column,
-                'task_type': task_type
+                'task_type': task_type,
+                'preprocessing': preprocessing
             }
             
             # Feature importance for tree-based models
@@ -156,7 +163,7 @@ class MLAgent(BaseAgent):
                 importance = model.feature_importances_
                 feature_importance = {
                     col: float(imp) 
-                    for col, imp in zip(X.columns, importance)
+                    for col, imp in zip(preprocessor.get_feature_names_out(), importance)
                 }
                 feature_importance = dict(sorted(
                     feature_importance.items(), 
@@ -171,6 +178,7 @@ class MLAgent(BaseAgent):
                 'model_type': type(model).__name__,
                 'metrics': metrics,
                 'feature_importance': feature_importance,
+                'preprocessing': preprocessing,
                 'training_samples': len(X_train),
                 'test_samples': len(X_test)
             }
@@ -181,6 +189,58 @@ class MLAgent(BaseAgent):
             self.logger.error(f"Model training failed: {e}")
             return {'error': str(e)}
     
+    def _train_streaming(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Same as _train_model, trained chunk by chunk with partial_fit for files larger than RAM"""
+        try:
+            from ml.incremental import train_incremental
+            from execution.profiling import DEFAULT_CHUNK_SIZE
+            
+            data_path = task.get('data_path')
+            target_column = task.get('target_column')
+            model_type = task.get('model_type', 'auto')
+            task_type = task.get('task_type', 'auto')
+            
+            if not data_path or not (target_column or task_type == 'clustering'):
+                return {'error': 'data_path and target_column required'}
+            
+            result = train_incremental(
+                data_path,
+                target_column,
+                task_type=task_type,
+                model_type=model_type,
+                chunk_size=task.get('chunk_size', DEFAULT_CHUNK_SIZE),
+                test_size=task.get('test_size', 0.2),
+                epochs=task.get('epochs', 1),
+                **task.get('model_params', {})
+            )
+            
+            # Store model (scaler + estimator pipeline, usable by _predict)
+            model_id = f"{Path(data_path).stem}_{target_column}_{model_type}"
+            self.models[model_id] = {
+                'model': result.model,
+                'feature_names': result.feature_names,
+                'target_column': target_column,
+                'task_type': result.task_type
+            }
+            
+            return {
+                'success': True,
+                'model_id': model_id,
+                'task_type': result.task_type,
+                'model_type': type(result.model[-1]).__name__,
+                'metrics': result.metrics,
+                'feature_importance': {},
+                'preprocessing': {'numeric': result.feature_names},
+                'training_samples': result.training_samples,
+                'test_samples': result.test_samples
+            }
+            
+        except ImportError as e:
+            return {'error': f'ML libraries not installed: {e}'}
+        except Exception as e:
+            self.logger.error(f"Streaming model training failed: {e}")
+            return {'error': str(e)}
+    
     def _predict(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Make predictions using trained model"""
         try:
@@ -190,27 +250,26 @@ class MLAgent(BaseAgent):
             if not model_id or model_id not in self.models:
                 return {'error': f'Model {model_id} not found'}
             
-            if not data_path:
+            if not (data_path or task.get('shared_frame')):
                 return {'error': 'data_path required for prediction'}
             
             # Load data
-            df = pd.read_csv(data_path)
+            df = self._load_frame(task)
             model_info = self.models[model_id]
             model = model_info['model']
-            feature_names = model_info['feature_names']
             
             # Prepare features
-            X = df[feature_names].fillna(0)
+            X = self._model_features(df, model_info)
             
             # Predict
             predictions = model.predict(X)
             
-            # Add predictions to dataframe
-            df['prediction'] = predictions
+            # Add predictions to a copy (cached frames are shared)
+            output_df = df.assign(prediction=predictions)
             
             # Save results
             output_path = task.get('output_path', f'/tmp/predictions_{model_id}.csv')
-            df.to_csv(output_path, index=False)
+            output_df.to_csv(output_path, index=False)
             
             return {
                 'success': True,
@@ -234,14 +293,13 @@ class MLAgent(BaseAgent):
             if not model_id or model_id not in self.models:
                 return {'error': f'Model {model_id} not found'}
             
-            if not data_path:
+            if not (data_path or task.get('shared_frame')):
                 return {'error': 'data_path required for evaluation'}
             
             # Load data
-            df = pd.read_csv(data_path)
+            df = self._load_frame(task)
             model_info = self.models[model_id]
             model = model_info['model']
-            feature_names = model_info['feature_names']
             target_column = model_info['target_column']
             task_type = model_info['task_type']
             
@@ -249,7 +307,7 @@ class MLAgent(BaseAgent):
                 return {'error': f'Target column {target_column} not found'}
             
             # Prepare data
-            X = df[feature_names].fillna(0)
+            X = self._model_features(df, model_info)
             y = df[target_column]
             
             # Predict
@@ -290,24 +348,49 @@ class MLAgent(BaseAgent):
     def _auto_ml(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Automated machine learning - try multiple models"""
         try:
-            from sklearn.model_selection import cross_val_score
-            from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-            from sklearn.linear_model import LinearRegression, Ridge
+            from sklearn.ensemble import (
+                RandomForestRegressor, GradientBoostingRegressor,
+                RandomForestClassifier, GradientBoostingClassifier
+            )
+            from sklearn.linear_model import LinearRegression, Ridge, LogisticRegression
+            from ml.cross_validation import FoldCache, TASK_METRICS, cross_validate_models
+            from ml.preprocessing import build_preprocessor, with_preprocessing
             
             data_path = task.get('data_path')
             target_column = task.get('target_column')
+            task_type = task.get('task_type', 'auto')  # regression or classification
             
-            if not data_path or not target_column:
+            if not (data_path or task.get('shared_frame')) or not target_column:
                 return {'error': 'data_path and target_column required'}
             
             # Load and prepare data
-            df = pd.read_csv(data_path)
+            df = self._load_frame(task)
             X, y = self._prepare_data(df, target_column)
             
+            if task_type == 'auto':
+                task_type = 'classification' if y.nunique() < 10 else 'regression'
+            
             # Adjust models based on dataset size
             n_samples = len(X)
             
-            if n_samples < 100:
+            if task_type == 'classification':
+                if n_samples < 100:
+                    models = {
+                        'LogisticRegression': LogisticRegression(max_iter=1000, C=0.1),
+                        'RandomForest': RandomForestClassifier(
+                            n_estimators=10,
+                            max_depth=3,
+                            min_samples_split=5,
+                            random_state=42
+                        )
+                    }
+                else:
+                    models = {
+                        'LogisticRegression': LogisticRegression(max_iter=1000),
+                        'RandomForest': RandomForestClassifier(n_estimators=50, random_state=42),
+                        'GradientBoosting': GradientBoostingClassifier(n_estimators=50, random_state=42)
+                    }
+            elif n_samples < 100:
                 # Simpler models for small datasets
                 models = {
                     'LinearRegression': LinearRegression(),
@@ -328,34 +411,27 @@ class MLAgent(BaseAgent):
                     'GradientBoosting': GradientBoostingRegressor(n_estimators=50, random_state=42)
                 }
             
-            results = {}
-            best_score = -float('inf')
-            best_model = None
-            
-            for name, model in models.items():
-                try:
-                    scores = cross_val_score(model, X, y, cv=5, scoring='r2')
-                    mean_score = float(scores.mean())
-                    std_score = float(scores.std())
-                    
-                    results[name] = {
-                        'mean_r2': mean_score,
-                        'std_r2': std_score
-                    }
-                    
-                    if mean_score > best_score:
-                        best_score = mean_score
-                        best_model = name
-                        
-                except Exception as e:
-                    results[name] = {'error': str(e)}
+            # Every fold fits its own preprocessing stage, so medians, scales
+            # and category codes never come from the rows it is scored on
+            preprocessor = build_preprocessor(X)
+            models = {name: with_preprocessing(preprocessor, model) for name, model in models.items()}
+            
+            # Folds are split once and shared; (model x fold) fits run in parallel
+            folds = FoldCache(X, y, n_folds=task.get('cv_folds', 5), task_type=task_type)
+            results = cross_validate_models(models, folds)
+            
+            metric = TASK_METRICS[task_type]
+            scored = {name: r[f'mean_{metric}'] for name, r in results.items() if 'error' not in r}
+            best_model = max(scored, key=scored.get) if scored else None
             
             return {
                 'success': True,
+                'task_type': task_type,
+                'metric': metric,
                 'models_tested': len(models),
                 'results': results,
                 'best_model': best_model,
-                'best_score': best_score
+                'best_score': scored[best_model] if scored else -float('inf')
             }
             
         except ImportError as e:
@@ -364,21 +440,30 @@ class MLAgent(BaseAgent):
             self.logger.error(f"AutoML failed: {e}")
             return {'error': str(e)}
     
+    def _load_frame(self, task: Dict[str, Any]) -> pd.DataFrame:
+        """Frame from task['shared_frame'] (a SharedFrameHandle dict) or task['data_path']"""
+        if task.get('shared_frame'):
+            return attach_frame(task['shared_frame'])
+        return load_dataset(task['data_path'])
+    
     def _prepare_data(self, df: pd.DataFrame, target_column: str) -> Tuple[pd.DataFrame, pd.Series]:
-        """Prepare data for ML"""
-        # Select numeric columns only
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        
-        # Remove target from features
-        if target_column in numeric_cols:
-            numeric_cols.remove(target_column)
+        """Prepare data for ML (raw features; encoding and imputation happen in ml.preprocessing)"""
+        from ml.preprocessing import feature_columns
         
-        # Prepare X and y
-        X = df[numeric_cols].fillna(0)
+        X = df[feature_columns(df, target_column)]
         y = df[target_column]
         
         return X, y
     
+    def _model_features(self, df: pd.DataFrame, model_info: Dict[str, Any]) -> pd.DataFrame:
+        """Feature frame for a stored model"""
+        X = df[model_info['feature_names']]
+        if 'preprocessing' in model_info:
+            # The model pipeline imputes and encodes
+            return X
+        # Streaming and older models were trained on NaN -> 0 numeric features
+        return X.fillna(0)
+    
     def save_model(self, model_id: str, filepath: Path):
         """Save a trained model to file"""
         if model_id not in self.models:
@@ -5,8 +5,10 @@ Simple, practical implementation without over-engineering
 
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import logging
+import time
 from pathlib import Path
 import json
 
@@ -15,6 +17,45 @@ from .data_analysis import DataAnalysisAgent
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent.parent.parent / "config" / "agents_config.yaml"
+
+# Orchestrator agent names for the agent keys in config/agents_config.yaml
+CONFIG_AGENT_NAMES = {
+    'analysis_agent': 'data_analysis',
+    'ml_agent': 'ml',
+    'data_agent': 'data',
+    'visualization_agent': 'visualization',
+    'report_agent': 'report'
+}
+
+
+def load_concurrency_limits(config_path: Path = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Read per-agent ``max_concurrent_tasks`` and the global
+    ``performance.max_parallel_tasks`` from the agents config file
+    """
+    limits = {'max_parallel_tasks': None, 'per_agent': {}}
+    
+    try:
+        import yaml
+    except ImportError:
+        logger.warning("PyYAML not installed - using default concurrency limits")
+        return limits
+    
+    if not Path(config_path).exists():
+        return limits
+    
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f) or {}
+    
+    for key, agent_config in config.get('agents', {}).items():
+        if 'max_concurrent_tasks' in agent_config:
+            name = CONFIG_AGENT_NAMES.get(key, key)
+            limits['per_agent'][name] = int(agent_config['max_concurrent_tasks'])
+    
+    limits['max_parallel_tasks'] = config.get('performance', {}).get('max_parallel_tasks')
+    return limits
+
 
 @dataclass
 class Task:
@@ -24,18 +65,32 @@ class Task:
     data: Dict[str, Any]
     agent_type: str
     dependencies: List[str] = None
-    status: str = "pending"  # pending, running, completed, failed
+    status: str = "pending"  # pending, running, completed, failed, skipped
     result: Optional[Dict[str, Any]] = None
+    
+    def __post_init__(self):
+        if self.dependencies is None:
+            self.dependencies = []
 
 
 class AgentOrchestrator:
     """Coordinates multiple agents to complete complex tasks"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        config_path: Path = DEFAULT_CONFIG_PATH
+    ):
         self.agents: Dict[str, BaseAgent] = {}
         self.tasks: Dict[str, Task] = {}
         self.results: Dict[str, Any] = {}
         
+        # Concurrency for execute_parallel: explicit values win over the config file
+        limits = load_concurrency_limits(config_path)
+        self.max_workers = max_workers or limits['max_parallel_tasks'] or 4
+        self.concurrency_limits = {**limits['per_agent'], **(concurrency_limits or {})}
+        
         # Register default agents
         self._register_default_agents()
     
@@ -162,31 +217,153 @@ class AgentOrchestrator:
         }
     
     async def execute_parallel(self, tasks: List[Task]) -> Dict[str, Any]:
-        """Execute independent tasks in parallel (Phase 2 feature)"""
-        # Group tasks by dependencies
-        independent_tasks = [t for t in tasks if not t.dependencies]
-        dependent_tasks = [t for t in tasks if t.dependencies]
+        """
+        Execute tasks as a DAG on a thread pool (Phase 2 feature)
         
-        # Execute independent tasks in parallel
-        async def run_task(task):
-            return task.id, self.execute_task(task.id)
+        Every task whose dependencies have finished is dispatched as soon as
+        a worker and a slot for its agent type are free, so independent
+        branches overlap instead of waiting for whole levels to complete.
+        """
+        for task in tasks:
+            self.tasks[task.id] = task
         
-        # Run independent tasks concurrently
-        results = {}
-        if independent_tasks:
-            task_coroutines = [run_task(t) for t in independent_tasks]
-            task_results = await asyncio.gather(*task_coroutines)
-            results.update(dict(task_results))
+        task_ids = {t.id for t in tasks}
+        waiting_on = {
+            t.id: {d for d in t.dependencies if d in task_ids}
+            for t in tasks
+        }
+        results: Dict[str, Any] = {}
+        dependents: Dict[str, List[str]] = {t.id: [] for t in tasks}
+        for task_id, deps in waiting_on.items():
+            for dep_id in deps:
+                dependents[dep_id].append(task_id)
         
-        # Then execute dependent tasks
-        for task in self._topological_sort(dependent_tasks):
-            results[task.id] = self.execute_task(task.id)
+        def finish_failed(task_id: str, error: Dict[str, Any], status: str = "failed"):
+            """Record a task that did not complete and skip everything downstream of it"""
+            task = self.tasks[task_id]
+            task.status = status
+            task.result = error
+            results[task_id] = error
+            for child_id in dependents[task_id]:
+                if child_id not in results:
+                    finish_failed(child_id, {"error": f"Dependency {task_id} {status}"}, "skipped")
+        
+        # Dependencies that are neither in this batch nor registered earlier
+        # can never complete; fail those tasks up front
+        for task in tasks:
+            unknown = [d for d in task.dependencies if d not in task_ids and d not in self.tasks]
+            if unknown and task.id not in results:
+                finish_failed(task.id, {"error": f"Unknown dependencies: {', '.join(unknown)}"})
+        
+        # Ready tasks in submission order; dispatched when their agent has capacity
+        ready = [t.id for t in tasks if not waiting_on[t.id] and t.id not in results]
+        running_per_agent: Dict[str, int] = {}
+        in_flight: Dict[asyncio.Future, str] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        
+        def run_task(task_id: str):
+            task_start = time.perf_counter()
+            result = self.execute_task(task_id)
+            return result, task_start, time.perf_counter()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while ready or in_flight:
+                for task_id in list(ready):
+                    if len(in_flight) >= self.max_workers:
+                        break
+                    agent_type = self.tasks[task_id].agent_type
+                    limit = self.concurrency_limits.get(agent_type)
+                    if limit is not None and running_per_agent.get(agent_type, 0) >= limit:
+                        continue
+                    
+                    ready.remove(task_id)
+                    running_per_agent[agent_type] = running_per_agent.get(agent_type, 0) + 1
+                    future = loop.run_in_executor(pool, run_task, task_id)
+                    in_flight[future] = task_id
+                
+                if not in_flight:
+                    # Nothing dispatchable (limits of 0); fail what is left
+                    for task_id in ready:
+                        if task_id not in results:
+                            finish_failed(task_id, {"error": f"No capacity for agent {self.tasks[task_id].agent_type}"})
+                    break
+                
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task_id = in_flight.pop(future)
+                    agent_type = self.tasks[task_id].agent_type
+                    running_per_agent[agent_type] -= 1
+                    
+                    result, task_start, task_end = future.result()
+                    timings[task_id] = {
+                        'start': task_start - start,
+                        'end': task_end - start,
+                        'wall_time': task_end - task_start
+                    }
+                    if self.tasks[task_id].status != "completed":
+                        # Covers errors execute_task returns without setting a status
+                        finish_failed(task_id, result)
+                        continue
+                    results[task_id] = result
+                    
+                    for child_id in dependents[task_id]:
+                        waiting_on[child_id].discard(task_id)
+                        if not waiting_on[child_id] and child_id not in results:
+                            ready.append(child_id)
+        
+        # Anything still waiting never became ready: it is on, or downstream
+        # of, a dependency cycle, or behind a task that was never dispatched
+        for task in tasks:
+            if task.id not in results:
+                pending = ', '.join(sorted(waiting_on[task.id]))
+                task.status = "failed"
+                task.result = {"error": f"Dependency cycle or unmet dependency: {task.id} waits on {pending}"}
+                results[task.id] = task.result
+        
+        elapsed = time.perf_counter() - start
+        total_task_time = sum(t['wall_time'] for t in timings.values())
         
         return {
             "parallel_execution": True,
-            "results": results
+            "results": results,
+            "timing": {
+                "elapsed": elapsed,
+                "total_task_time": total_task_time,
+                "critical_path": self._critical_path(tasks, timings),
+                "speedup": total_task_time / elapsed if elapsed > 0 else 1.0,
+                "tasks": timings
+            }
         }
     
+    def _critical_path(self, tasks: List[Task], timings: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+        """Longest chain of dependent tasks by measured wall time"""
+        longest: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        
+        for task in self._topological_sort(tasks):
+            own = timings.get(task.id, {}).get('wall_time', 0.0)
+            best_dep, best_len = None, 0.0
+            for dep_id in task.dependencies:
+                if longest.get(dep_id, 0.0) > best_len:
+                    best_dep, best_len = dep_id, longest[dep_id]
+            longest[task.id] = best_len + own
+            previous[task.id] = best_dep
+        
+        if not longest:
+            return {"length": 0.0, "tasks": []}
+        
+        end = max(longest, key=longest.get)
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = previous.get(node)
+        
+        return {"length": longest[end], "tasks": list(reversed(path))}
+    
     def save_workflow(self, filepath: Path, tasks: List[Task]):
         """Save workflow definition to file"""
         workflow = {
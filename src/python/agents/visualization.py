@@ -3,13 +3,13 @@ Phase 2: Visualization Agent
 Creates various types of visualizations from data
 """
 
-import pandas as pd
 import numpy as np
 from typing import Dict, Any, Optional, List
 import json
 from pathlib import Path
 
 from .base import BaseAgent, AgentConfig
+from storage import load_dataset
 from marimo_integration import NotebookBuilder
 
 
@@ -44,7 +44,8 @@ class VisualizationAgent(BaseAgent):
             return {'error': 'No data_path provided'}
         
         try:
-            df = pd.read_csv(data_path)
+            # Requested columns narrow which ones get plotted
+            df = load_dataset(data_path, task.get('columns') or None)
             
             # Analyze data to determine best visualizations
             numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
@@ -148,7 +149,7 @@ plt.show()
             return {'error': 'No data_path provided'}
         
         try:
-            df = pd.read_csv(data_path)
+            df = load_dataset(data_path, task.get('columns') or None)
             
             # Create Plotly-based dashboard notebook
             builder = NotebookBuilder()
@@ -192,7 +193,7 @@ fig.show()
             return {'error': 'No data_path provided'}
         
         try:
-            df = pd.read_csv(data_path)
+            df = load_dataset(data_path, task.get('columns') or None)
             
             builder = NotebookBuilder()
             builder.add_markdown(f"# Data Analysis Report")
@@ -203,7 +204,7 @@ fig.show()
             
             # Add summary statistics
             builder.add_markdown("## Summary Statistics")
-            builder.add_cell("df.describe()")
+            builder.add_cell(f"df[{list(df.columns)}].describe()" if task.get('columns') else "df.describe()")
             
             # Add visualizations based on analysis
             builder.add_markdown("## Data Visualizations")
@@ -249,7 +250,7 @@ plt.show()
             return {'error': 'No data_path provided'}
         
         try:
-            df = pd.read_csv(data_path)
+            df = load_dataset(data_path)
             
             builder = NotebookBuilder()
             builder.add_markdown(f"# {viz_type.title()} Visualization")
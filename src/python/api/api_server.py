@@ -22,7 +22,7 @@ import base64
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
@@ -32,12 +32,22 @@ from agents.orchestrator import OrchestrationAgent
 from agents.intelligent_agent import IntelligentAgent
 from llm import GeminiClient
 from ml.model_registry import ModelRegistry, ModelTrainer
+from ml.batching import PredictionBatcher
+from ml.candidates import DEFAULT_TIME_BUDGET
+from api.job_queue import JobQueue, JobWorkerPool
+from storage import (
+    ingest_file, inspect_upload, load_dataset, columnar_type, decode_frame, encode_frame
+)
 
 # Configuration
 SECRET_KEY = os.getenv('API_SECRET_KEY', 'your-secret-key-change-in-production')
 UPLOAD_FOLDER = './uploads'
-MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB
+MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 100 * 1024 * 1024))  # 100MB
+# Raw (non-multipart) upload bodies are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'json', 'parquet'}
+# Upper bound for ?wait= long-polls on job status
+MAX_JOB_WAIT = 60
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -63,6 +73,14 @@ agents = {
 
 model_registry = ModelRegistry()
 model_trainer = ModelTrainer(model_registry)
+# Concurrent predict calls per model are served by one vectorized call
+prediction_batcher = PredictionBatcher(model_registry)
+# Analyses run on job workers; the queue is shared by every API process
+job_queue = JobQueue()
+
+# Load production models up front so the first predictions don't pay for unpickling
+if os.getenv('PREWARM_MODELS', 'true').lower() == 'true':
+    model_registry.warm_cache()
 
 # Initialize Gemini if API key available
 gemini_key = os.getenv('GEMINI_API_KEY')
@@ -77,13 +95,44 @@ if gemini_key:
 users = {}
 api_keys = {}
 sessions = {}
-analysis_jobs = {}
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def refresh_session(session: Dict) -> Dict:
+    """Merge the outcome of a session's background ingestion once it has finished"""
+    if session.get('status') != 'ingesting':
+        return session
+    
+    job = job_queue.get(session['ingest_job_id'])
+    if job is None or job['status'] not in ('completed', 'failed'):
+        return session
+    
+    if job['status'] == 'completed':
+        dataset = job['result']
+        session.update(
+            status='ready',
+            dataset_path=dataset['dataset_path'],
+            shape=(dataset['rows'], len(dataset['columns'])),
+            columns=dataset['columns'],
+            dtypes=dataset['schema'],
+            columnar=dataset['columnar']
+        )
+    else:
+        # The original file is still readable, just without column projection
+        session.update(status='ready', ingest_error=job['error'])
+    return session
+
+def session_dataset_path(session: Dict) -> str:
+    """A session's dataset, preferring the columnar copy once ingestion has made it"""
+    return refresh_session(session).get('dataset_path', session['file_path'])
+
+def load_session_data(session: Dict, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load a session's dataset"""
+    return load_dataset(session_dataset_path(session), columns)
+
 def generate_api_key():
     """Generate a unique API key"""
     return hashlib.sha256(f"{uuid.uuid4()}{datetime.now()}".encode()).hexdigest()
@@ -199,69 +248,112 @@ def login():
 @app.route('/api/v1/upload', methods=['POST'])
 @verify_token
 def upload_file():
-    """Upload data file"""
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file provided'}), 400
-    
-    file = request.files['file']
+    """
+    Upload data file
+    
+    Either a multipart form with a 'file' field, or the raw file as the
+    request body with ?filename=<name>; raw bodies are streamed to disk.
+    The response carries the schema and preview of the file's leading block;
+    row count and final types come from a background ingestion job
+    (see GET /api/v1/sessions/<session_id>).
+    """
+    if request.mimetype == 'multipart/form-data':
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file provided'}), 400
+        file = request.files['file']
+        original_name = file.filename
+    else:
+        file = None
+        original_name = request.args.get('filename', '')
     
-    if file.filename == '':
+    if original_name == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    if not allowed_file(file.filename):
+    if not allowed_file(original_name):
         return jsonify({'error': 'File type not allowed'}), 400
     
     # Save file
-    filename = secure_filename(file.filename)
+    filename = secure_filename(original_name)
     file_id = f"{uuid.uuid4()}_{filename}"
     file_path = Path(UPLOAD_FOLDER) / file_id
-    file.save(str(file_path))
+    if file is not None:
+        file.save(str(file_path))
+    else:
+        save_request_body(file_path)
     
-    # Process file
+    # Answer from the leading block; converting to the typed Parquet copy
+    # that later endpoints read with column projection runs as a job
     try:
-        if filename.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        elif filename.endswith('.xlsx'):
-            df = pd.read_excel(file_path)
-        elif filename.endswith('.json'):
-            df = pd.read_json(file_path)
-        elif filename.endswith('.parquet'):
-            df = pd.read_parquet(file_path)
-        else:
-            return jsonify({'error': 'Unsupported file format'}), 400
-        
-        # Store in session
-        session_id = str(uuid.uuid4())
-        sessions[session_id] = {
-            'file_id': file_id,
-            'file_path': str(file_path),
-            'filename': filename,
-            'shape': df.shape,
-            'columns': df.columns.tolist(),
-            'dtypes': df.dtypes.astype(str).to_dict(),
-            'uploaded_at': datetime.now().isoformat(),
-            'user_id': request.user.get('user_id')
-        }
-        
-        return jsonify({
-            'session_id': session_id,
-            'file_id': file_id,
-            'filename': filename,
-            'shape': df.shape,
-            'columns': df.columns.tolist(),
-            'preview': df.head(5).to_dict('records')
-        }), 201
-        
+        inspection = inspect_upload(file_path, n_rows=5)
     except Exception as e:
         logger.error(f"Error processing file: {e}")
+        file_path.unlink(missing_ok=True)
         return jsonify({'error': f'Failed to process file: {str(e)}'}), 500
+    
+    user_id = request.user.get('user_id')
+    ingest_job_id = job_queue.enqueue('ingest', {'file_path': str(file_path)}, user_id=user_id)
+    
+    # Store in session
+    session_id = str(uuid.uuid4())
+    sessions[session_id] = {
+        'file_id': file_id,
+        'file_path': str(file_path),
+        'filename': filename,
+        'status': 'ingesting',
+        'ingest_job_id': ingest_job_id,
+        'shape': (inspection.rows, len(inspection.columns)),
+        'columns': inspection.columns,
+        'dtypes': inspection.schema,
+        'uploaded_at': datetime.now().isoformat(),
+        'user_id': user_id
+    }
+    
+    return jsonify({
+        'session_id': session_id,
+        'file_id': file_id,
+        'filename': filename,
+        'status': 'ingesting',
+        'shape': (inspection.rows, len(inspection.columns)),
+        'columns': inspection.columns,
+        'dtypes': inspection.schema,
+        'preview': inspection.preview.to_dict('records')
+    }), 201
+
+def save_request_body(file_path: Path):
+    """Copy the raw request body to disk without holding it in memory"""
+    with open(file_path, 'wb') as f:
+        while True:
+            chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            f.write(chunk)
+
+def run_ingest_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler converting an upload to its columnar copy"""
+    return ingest_file(payload['file_path']).to_dict()
+
+@app.route('/api/v1/sessions/<session_id>', methods=['GET'])
+@verify_token
+def get_session(session_id):
+    """Get an upload session, including the outcome of its ingestion"""
+    if session_id not in sessions:
+        return jsonify({'error': 'Invalid session'}), 404
+    
+    session = refresh_session(sessions[session_id])
+    
+    # Check ownership
+    if session.get('user_id') != request.user.get('user_id'):
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    fields = ['filename', 'status', 'shape', 'columns', 'dtypes', 'columnar', 'uploaded_at', 'ingest_error']
+    return jsonify({'session_id': session_id, **{k: session[k] for k in fields if k in session}}), 200
 
 # === Analysis Endpoints ===
 
 @app.route('/api/v1/analyze', methods=['POST'])
 @verify_token
 def analyze_data():
-    """Run data analysis"""
+    """Queue a data analysis job"""
     data = request.json
     
     if not data or not data.get('session_id'):
@@ -273,80 +365,66 @@ def analyze_data():
         return jsonify({'error': 'Invalid session'}), 404
     
     session = sessions[session_id]
+    agent_name = data.get('agent', 'data_analysis')
+    
+    if agent_name not in agents:
+        return jsonify({'error': f'Agent {agent_name} not available'}), 400
+    
+    job_id = job_queue.enqueue('analysis', {
+        'dataset_path': session_dataset_path(session),
+        'type': data.get('type', 'summary'),
+        'agent': agent_name,
+        'parameters': data.get('parameters', {})
+    }, user_id=request.user.get('user_id'))
+    
+    response = jsonify({'job_id': job_id, 'status': 'queued'})
+    response.headers['Location'] = f'/api/v1/jobs/{job_id}'
+    return response, 202
+
+def run_analysis_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler for queued analyses; runs on a job worker thread"""
+    # Agents get the dataset by reference and load it through the shared
+    # dataset cache, so repeated analyses of a session parse it once
+    task = {
+        'type': payload['type'],
+        'data_path': payload['dataset_path']
+    }
     
-    # Load data
-    try:
-        df = pd.read_csv(session['file_path']) if session['filename'].endswith('.csv') else \
-             pd.read_excel(session['file_path']) if session['filename'].endswith('.xlsx') else \
-             pd.read_json(session['file_path'])
-    except Exception as e:
-        return jsonify({'error': f'Failed to load data: {str(e)}'}), 500
+    # Add custom parameters
+    task.update(payload['parameters'])
     
-    # Create analysis job
-    job_id = str(uuid.uuid4())
-    analysis_jobs[job_id] = {
-        'id': job_id,
-        'status': 'running',
-        'created_at': datetime.now().isoformat(),
-        'user_id': request.user.get('user_id')
-    }
+    return agents[payload['agent']].execute(task)
+
+job_workers = JobWorkerPool(job_queue, {'analysis': run_analysis_job, 'ingest': run_ingest_job})
+job_workers.start()
+
+def get_user_job(job_id: str, wait: float = 0):
+    """A job of the requesting user, or an error response tuple"""
+    job = job_queue.wait(job_id, wait) if wait > 0 else job_queue.get(job_id)
     
-    # Run analysis
-    try:
-        analysis_type = data.get('type', 'summary')
-        agent_name = data.get('agent', 'data_analysis')
-        
-        if agent_name not in agents:
-            return jsonify({'error': f'Agent {agent_name} not available'}), 400
-        
-        agent = agents[agent_name]
-        
-        task = {
-            'type': analysis_type,
-            'data': df.to_dict() if len(df) < 10000 else df.head(10000).to_dict()
-        }
-        
-        # Add custom parameters
-        if 'parameters' in data:
-            task.update(data['parameters'])
-        
-        result = agent.execute(task)
-        
-        # Update job
-        analysis_jobs[job_id]['status'] = 'completed'
-        analysis_jobs[job_id]['result'] = result
-        analysis_jobs[job_id]['completed_at'] = datetime.now().isoformat()
-        
-        return jsonify({
-            'job_id': job_id,
-            'status': 'completed',
-            'result': result
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Analysis failed: {e}")
-        analysis_jobs[job_id]['status'] = 'failed'
-        analysis_jobs[job_id]['error'] = str(e)
-        
-        return jsonify({
-            'job_id': job_id,
-            'status': 'failed',
-            'error': str(e)
-        }), 500
+    if job is None:
+        return None, (jsonify({'error': 'Job not found'}), 404)
+    
+    # Check ownership
+    if job.get('user_id') != request.user.get('user_id'):
+        return None, (jsonify({'error': 'Unauthorized'}), 403)
+    
+    return job, None
 
 @app.route('/api/v1/jobs/<job_id>', methods=['GET'])
 @verify_token
 def get_job_status(job_id):
-    """Get analysis job status"""
-    if job_id not in analysis_jobs:
-        return jsonify({'error': 'Job not found'}), 404
-    
-    job = analysis_jobs[job_id]
+    """Get analysis job status; ?wait=<seconds> holds the request until the job finishes"""
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), MAX_JOB_WAIT)
+    except ValueError:
+        return jsonify({'error': 'wait must be a number of seconds'}), 400
     
-    # Check ownership
-    if job.get('user_id') != request.user.get('user_id'):
-        return jsonify({'error': 'Unauthorized'}), 403
+    job, error = get_user_job(job_id, wait)
+    if error:
+        return error
     
+    job.pop('payload')
     return jsonify(job), 200
 
 # === Model Management Endpoints ===
@@ -384,9 +462,7 @@ def train_model():
     if session_id not in sessions:
         return jsonify({'error': 'Invalid session'}), 404
     
-    # Load data
     session = sessions[session_id]
-    df = pd.read_csv(session['file_path'])
     
     # Get training parameters
     target_column = data.get('target')
@@ -395,7 +471,14 @@ def train_model():
     if not target_column or not feature_columns:
         return jsonify({'error': 'Target and features required'}), 400
     
+    unknown = [c for c in feature_columns + [target_column] if c not in session['columns']]
+    if unknown:
+        return jsonify({'error': f'Unknown columns: {unknown}'}), 400
+    
     try:
+        # Load only the columns the model needs
+        df = load_session_data(session, feature_columns + [target_column])
+        
         X = df[feature_columns]
         y = df[target_column]
         
@@ -408,6 +491,8 @@ def train_model():
             name=data.get('name', 'api_model'),
             version=data.get('version', '1.0'),
             test_size=data.get('test_size', 0.2),
+            time_budget=data.get('time_budget', DEFAULT_TIME_BUDGET),
+            search=data.get('search', 'halving'),
             author=request.user.get('email', 'unknown')
         )
         
@@ -426,19 +511,31 @@ def train_model():
 @app.route('/api/v1/models/<model_id>/predict', methods=['POST'])
 @verify_token
 def predict(model_id):
-    """Make predictions using a model"""
-    data = request.json
-    
-    if not data or 'data' not in data:
-        return jsonify({'error': 'Data required for prediction'}), 400
+    """
+    Make predictions using a model
+    
+    Rows come as JSON ({'data': row or [rows]}) or, for bulk requests, as an
+    Arrow IPC stream or Parquet body named by Content-Type. Columnar
+    requests get a columnar response (in the Accept type if columnar) with
+    a 'prediction' column and 'probability_<i>' columns for classifiers.
+    """
+    body_type = columnar_type(request.mimetype)
+    
+    if body_type:
+        if not request.content_length:
+            return jsonify({'error': 'Data required for prediction'}), 400
+    else:
+        data = request.json
+        if not data or 'data' not in data:
+            return jsonify({'error': 'Data required for prediction'}), 400
     
     try:
-        # Load model
-        model = model_registry.load_model(model_id)
         metadata = model_registry.get_model_metadata(model_id)
         
         # Prepare data
-        if isinstance(data['data'], list):
+        if body_type:
+            X = decode_frame(request.get_data(), body_type)
+        elif isinstance(data['data'], list):
             X = pd.DataFrame(data['data'])
         else:
             X = pd.DataFrame([data['data']])
@@ -449,17 +546,31 @@ def predict(model_id):
                 'error': f'Expected features: {metadata.feature_names}'
             }), 400
         
-        # Make predictions
-        predictions = model.predict(X[metadata.feature_names])
+        # Make predictions (with probabilities for classification), batched
+        # with concurrent requests for the same model
+        result = prediction_batcher.predict(model_id, X[metadata.feature_names])
         
-        # Get probabilities for classification
-        probabilities = None
-        if metadata.model_type == 'classification' and hasattr(model, 'predict_proba'):
-            probabilities = model.predict_proba(X[metadata.feature_names]).tolist()
+        if body_type:
+            # Answer in the request's format unless Accept names the other one
+            accepted = [value for value, _ in request.accept_mimetypes if columnar_type(value)]
+            response_type = accepted[0] if accepted else body_type
+            return Response(
+                encode_frame(_prediction_frame(result), response_type),
+                status=200,
+                mimetype=response_type,
+                headers={
+                    'X-Model-Id': model_id,
+                    'X-Model-Name': metadata.name,
+                    'X-Model-Version': metadata.version,
+                    'X-Batch-Size': str(result['batch_size'])
+                }
+            )
         
+        probabilities = result['probabilities']
         return jsonify({
-            'predictions': predictions.tolist(),
-            'probabilities': probabilities,
+            'predictions': result['predictions'].tolist(),
+            'probabilities': probabilities.tolist() if probabilities is not None else None,
+            'batch_size': result['batch_size'],
             'model_id': model_id,
             'model_name': metadata.name,
             'model_version': metadata.version
@@ -469,6 +580,14 @@ def predict(model_id):
         logger.error(f"Prediction failed: {e}")
         return jsonify({'error': f'Prediction failed: {str(e)}'}), 500
 
+def _prediction_frame(result: Dict[str, Any]) -> pd.DataFrame:
+    """Predictions (and class probabilities) as columns for a columnar response"""
+    columns = {'prediction': result['predictions']}
+    if result['probabilities'] is not None:
+        for i in range(result['probabilities'].shape[1]):
+            columns[f'probability_{i}'] = result['probabilities'][:, i]
+    return pd.DataFrame(columns)
+
 @app.route('/api/v1/models/<model_id>/promote', methods=['POST'])
 @verify_token
 def promote_model(model_id):
@@ -507,9 +626,7 @@ def create_visualization():
     if session_id not in sessions:
         return jsonify({'error': 'Invalid session'}), 404
     
-    # Load data
     session = sessions[session_id]
-    df = pd.read_csv(session['file_path'])
     
     # Create visualization
     viz_type = data.get('type', 'auto')
@@ -517,8 +634,9 @@ def create_visualization():
     
     try:
         task = {
-            'type': viz_type,
-            'data': df[columns].to_dict() if columns else df.to_dict(),
+            'viz_type': viz_type,
+            'data_path': session_dataset_path(session),
+            'columns': columns,
             'options': data.get('options', {})
         }
         
@@ -536,14 +654,12 @@ def create_visualization():
 @verify_token
 def export_results(job_id):
     """Export analysis results"""
-    if job_id not in analysis_jobs:
-        return jsonify({'error': 'Job not found'}), 404
+    job, error = get_user_job(job_id)
+    if error:
+        return error
     
-    job = analysis_jobs[job_id]
-    
-    # Check ownership
-    if job.get('user_id') != request.user.get('user_id'):
-        return jsonify({'error': 'Unauthorized'}), 403
+    if job['status'] != 'completed':
+        return jsonify({'error': f"Job is {job['status']}"}), 409
     
     format_type = request.args.get('format', 'json')
     
@@ -579,7 +695,10 @@ def health_check():
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'agents': list(agents.keys()),
-        'models_count': len(model_registry.models)
+        'models_count': len(model_registry.models),
+        'model_cache': model_registry.model_cache.get_stats(),
+        'prediction_batching': prediction_batcher.get_stats(),
+        'jobs': job_queue.count_by_status()
     }), 200
 
 @app.route('/api/v1/stats', methods=['GET'])
@@ -588,12 +707,13 @@ def get_stats():
     """Get usage statistics"""
     user_id = request.user.get('user_id')
     
-    user_jobs = [j for j in analysis_jobs.values() if j.get('user_id') == user_id]
+    job_counts = job_queue.count_by_status(user_id)
     
     return jsonify({
-        'total_jobs': len(user_jobs),
-        'completed_jobs': len([j for j in user_jobs if j['status'] == 'completed']),
-        'failed_jobs': len([j for j in user_jobs if j['status'] == 'failed']),
+        'total_jobs': sum(job_counts.values()),
+        'completed_jobs': job_counts.get('completed', 0),
+        'failed_jobs': job_counts.get('failed', 0),
+        'queued_jobs': job_counts.get('queued', 0) + job_counts.get('running', 0),
         'active_sessions': len([s for s in sessions.values() if s.get('user_id') == user_id])
     }), 200
 
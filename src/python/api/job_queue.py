@@ -0,0 +1,326 @@
+"""
+Persistent analysis job queue
+Jobs live in a SQLite database (WAL mode) shared by all API workers, so a
+job enqueued by one process can be run by another and its status read by
+any of them; a pool of worker threads claims and runs queued jobs.
+
+A claimed job carries a lease that its worker pool renews while the job
+runs. Only jobs whose lease has lapsed (the worker's process died) are put
+back in the queue, so a job running in another live process is never
+started twice.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DB = os.getenv('JOB_QUEUE_DB', './jobs.db')
+DEFAULT_JOB_WORKERS = int(os.getenv('ANALYSIS_WORKERS', 2))
+
+TERMINAL_STATUSES = ('completed', 'failed')
+# How often idle workers and long-polls look for changes made by other processes
+POLL_INTERVAL = 0.5
+# A running job whose lease is not renewed within this time is assumed
+# orphaned by a dead worker; pools renew leases every LEASE_RENEW_INTERVAL
+LEASE_DURATION = timedelta(seconds=60)
+LEASE_RENEW_INTERVAL = LEASE_DURATION / 4
+# Running jobs claimed before leases existed are orphaned after this long
+STALE_AFTER = timedelta(hours=1)
+
+
+def _json_default(value: Any) -> Any:
+    """Keep numpy scalars and arrays numeric in stored results; str() only as a last resort"""
+    if hasattr(value, 'tolist') and hasattr(value, 'shape') and value.shape != ():
+        return value.tolist()
+    if hasattr(value, 'item'):
+        try:
+            return value.item()
+        except (TypeError, ValueError):
+            pass
+    return str(value)
+
+
+class JobQueue:
+    """SQLite-backed queue of analysis jobs"""
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_JOB_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Wakes waiters in this process; other processes are seen by polling
+        self._changed = threading.Condition()
+        self._init_database()
+
+    @contextmanager
+    def _connect(self):
+        """Connection committing on success, rolling back on error"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_database(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    user_id TEXT,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    completed_at TEXT,
+                    worker_id TEXT,
+                    lease_expires TEXT
+                )
+            """)
+            existing = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for name in ('worker_id', 'lease_expires'):
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs (user_id)")
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], user_id: Optional[str] = None) -> str:
+        """Add a job; returns its id"""
+        job_id = str(uuid.uuid4())
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, user_id, payload, created_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, user_id, json.dumps(payload), datetime.now().isoformat())
+            )
+        self._notify()
+        return job_id
+
+    def claim(self, worker_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job running under a fresh lease and return it, or None"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            now = datetime.now()
+            started_at = now.isoformat()
+            lease_expires = (now + LEASE_DURATION).isoformat()
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, worker_id = ?, lease_expires = ? WHERE id = ?",
+                (started_at, worker_id, lease_expires, row['id'])
+            )
+        job = self._to_dict(row)
+        job.update(status='running', started_at=started_at, worker_id=worker_id, lease_expires=lease_expires)
+        return job
+
+    def renew(self, job_ids: List[str], worker_id: Optional[str]) -> int:
+        """Extend the leases of running jobs held by a worker; returns how many were renewed"""
+        if not job_ids:
+            return 0
+        lease_expires = (datetime.now() + LEASE_DURATION).isoformat()
+        placeholders = ', '.join('?' * len(job_ids))
+        with self._connect() as conn:
+            return conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE status = 'running' AND worker_id IS ? "
+                f"AND id IN ({placeholders})",
+                (lease_expires, worker_id, *job_ids)
+            ).rowcount
+
+    def complete(self, job_id: str, result: Any, worker_id: Optional[str] = None) -> bool:
+        return self._finish(job_id, 'completed', worker_id, result=json.dumps(result, default=_json_default))
+
+    def fail(self, job_id: str, error: str, worker_id: Optional[str] = None) -> bool:
+        return self._finish(job_id, 'failed', worker_id, error=error)
+
+    def _finish(self, job_id: str, status: str, worker_id: Optional[str],
+                result: Optional[str] = None, error: Optional[str] = None) -> bool:
+        """
+        Record a job's outcome; False if the job is no longer running under
+        worker_id (its lease lapsed and it was re-queued or claimed again)
+        """
+        with self._connect() as conn:
+            finished = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, completed_at = ?, lease_expires = NULL "
+                "WHERE id = ? AND status = 'running' AND worker_id IS ?",
+                (status, result, error, datetime.now().isoformat(), job_id, worker_id)
+            ).rowcount
+        if finished:
+            self._notify()
+        else:
+            logger.warning(f"Job {job_id} is no longer held by this worker; dropping its {status} outcome")
+        return bool(finished)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status (and result once completed), or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Like get(), but first waits up to timeout seconds for the job to finish"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job['status'] in TERMINAL_STATUSES or remaining <= 0:
+                return job
+            with self._changed:
+                self._changed.wait(min(POLL_INTERVAL, remaining))
+
+    def list_jobs(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Jobs (newest first), optionally of one user"""
+        query = "SELECT * FROM jobs"
+        params = []
+        if user_id is not None:
+            query += " WHERE user_id = ?"
+            params.append(user_id)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC", params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def count_by_status(self, user_id: Optional[str] = None) -> Dict[str, int]:
+        query = "SELECT status, COUNT(*) AS n FROM jobs"
+        params = []
+        if user_id is not None:
+            query += " WHERE user_id = ?"
+            params.append(user_id)
+        with self._connect() as conn:
+            rows = conn.execute(query + " GROUP BY status", params).fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+    def requeue_stale(self) -> int:
+        """Put running jobs whose lease lapsed (their worker died) back in the queue"""
+        now = datetime.now()
+        with self._connect() as conn:
+            count = conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, worker_id = NULL, lease_expires = NULL "
+                "WHERE status = 'running' AND (lease_expires < ? OR (lease_expires IS NULL AND started_at < ?))",
+                (now.isoformat(), (now - STALE_AFTER).isoformat())
+            ).rowcount
+        if count:
+            logger.warning(f"Re-queued {count} stale jobs")
+            self._notify()
+        return count
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+
+class JobWorkerPool:
+    """Worker threads running queued jobs through per-kind handlers"""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Callable[[Dict[str, Any]], Any]],
+        max_workers: int = DEFAULT_JOB_WORKERS
+    ):
+        """
+        Args:
+            queue: Queue to consume
+            handlers: Job kind -> function of the job payload returning a
+                JSON-serialisable result; exceptions fail the job
+            max_workers: Worker threads
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.max_workers = max_workers
+        # Identifies this pool's leases among every process sharing the queue
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running: set = set()
+        self._running_lock = threading.Lock()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        self.queue.requeue_stale()
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _heartbeat(self):
+        """Renew the leases of running jobs and recover jobs of dead workers"""
+        while not self._stop.wait(LEASE_RENEW_INTERVAL.total_seconds()):
+            with self._running_lock:
+                running = list(self._running)
+            try:
+                self.queue.renew(running, self.worker_id)
+                self.queue.requeue_stale()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not renew job leases: {e}")
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim(self.worker_id)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not claim job: {e}")
+                job = None
+
+            if job is None:
+                with self.queue._changed:
+                    self.queue._changed.wait(POLL_INTERVAL)
+                continue
+
+            self.run_job(job)
+
+    def run_job(self, job: Dict[str, Any]):
+        """Run one claimed job and record its outcome"""
+        handler = self.handlers.get(job['kind'])
+        with self._running_lock:
+            self._running.add(job['id'])
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind {job['kind']}")
+            result = handler(job['payload'])
+        except Exception as e:
+            logger.error(f"Job {job['id']} failed: {e}")
+            self.queue.fail(job['id'], str(e), self.worker_id)
+            return
+        finally:
+            with self._running_lock:
+                self._running.discard(job['id'])
+        self.queue.complete(job['id'], result, self.worker_id)
+
+    def shutdown(self, wait: bool = True):
+        self._stop.set()
+        self.queue._notify()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
@@ -0,0 +1,142 @@
+"""
+Process-pool backend for CPU-bound TaskExecutor tasks
+
+Segmentation, anomaly detection, predictive modeling and the scipy
+normality tests hold the GIL for seconds at a time. Running them in a
+pool of warm worker processes keeps Streamlit scripts and Flask workers
+responsive and lets several plans use all cores at once.
+"""
+import os
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from threading import Lock
+from typing import Dict, Any, Optional
+
+import pandas as pd
+
+from storage import share_frame
+
+logger = logging.getLogger(__name__)
+
+# Task types worth the cost of shipping work to another process
+CPU_BOUND_TASK_TYPES = {
+    'segmentation',
+    'anomaly_detection',
+    'predictive_modeling',
+    'statistical_analysis'
+}
+
+# Per-process TaskExecutor, created once by the worker initializer
+_worker_executor = None
+
+
+def _warm_worker():
+    """Pay the sklearn/scipy import and agent setup cost once per worker"""
+    global _worker_executor
+
+    import scipy.stats  # noqa: F401
+    import sklearn.cluster  # noqa: F401
+    import sklearn.ensemble  # noqa: F401
+    import sklearn.model_selection  # noqa: F401
+    import sklearn.preprocessing  # noqa: F401
+
+    from execution.task_executor import TaskExecutor
+    # The submitting executor owns result caching
+    _worker_executor = TaskExecutor(cache_results=False)
+
+
+def _ping() -> int:
+    """No-op used to force worker start-up"""
+    return os.getpid()
+
+
+def _run_task(task: Dict[str, Any], data) -> Dict[str, Any]:
+    """Execute a task inside a worker process"""
+    if _worker_executor is None:
+        _warm_worker()
+    # data is a SharedFrameHandle, a pickled frame, or None for tasks that
+    # only carry a data_path (loaded through the worker's dataset cache)
+    return _worker_executor.execute_task(task, data)
+
+
+class ProcessTaskBackend:
+    """Runs TaskExecutor tasks in a pool of pre-warmed worker processes"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a threaded Streamlit/Flask process is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_worker
+                )
+            return self._pool
+
+    def warm(self):
+        """Start every worker now instead of on the first task"""
+        futures = [self.pool.submit(_ping) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def handles(self, task: Dict[str, Any]) -> bool:
+        """Whether a task should run in a worker process"""
+        return task.get('type') in CPU_BOUND_TASK_TYPES
+
+    def submit(self, task: Dict[str, Any], data=None) -> Future:
+        """
+        Queue a task; the returned future resolves to the TaskExecutor result
+
+        data may be a DataFrame or a SharedFrameHandle. Callers running
+        several tasks on one frame should share it once and pass the handle;
+        a bare DataFrame is shared for this task only.
+        """
+        shared = None
+        if isinstance(data, pd.DataFrame):
+            try:
+                shared = share_frame(data)
+                data = shared.handle
+            except ImportError:
+                pass  # No pyarrow: the frame is pickled instead
+
+        try:
+            future = self.pool.submit(_run_task, task, data)
+        except Exception:
+            # Nothing will run on the share, so nothing else will close it
+            if shared is not None:
+                shared.close()
+            raise
+        if shared is not None:
+            future.add_done_callback(lambda _: shared.close())
+        return future
+
+    def execute_task(self, task: Dict[str, Any], data=None) -> Dict[str, Any]:
+        """Run a task in a worker and wait for its result"""
+        return self.submit(task, data).result()
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+_backend: Optional[ProcessTaskBackend] = None
+_backend_lock = Lock()
+
+
+def get_process_backend() -> ProcessTaskBackend:
+    """Process-wide backend; sized by TASK_WORKERS (defaults to all cores)"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            workers = os.getenv('TASK_WORKERS')
+            _backend = ProcessTaskBackend(max_workers=int(workers) if workers else None)
+        return _backend
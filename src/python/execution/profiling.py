@@ -0,0 +1,454 @@
+"""
+Streaming data profiler for datasets larger than RAM
+Computes the TaskExecutor profile in one pass over file chunks using
+mergeable sketches instead of whole-frame pandas calls
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def numeric_profile_kernel(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Summary statistics and IQR outlier counts for every column of a 2-D array.
+
+    ``values`` is a (rows, columns) float array with NaN for missing values.
+    One column-wise sort yields all quantiles plus min/max, and outliers come
+    from one masked comparison, instead of one pandas pass per statistic per
+    column. Results match pandas (sample std, linear quantile interpolation).
+    """
+    # Column-contiguous layout makes every axis-0 reduction a linear scan
+    values = np.asfortranarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    counts = values.shape[0] - missing.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        filled = np.where(missing, 0.0, values)
+        mean = filled.sum(axis=0) / counts
+        deviations = np.where(missing, 0.0, values - mean)
+        std = np.sqrt((deviations ** 2).sum(axis=0) / (counts - 1))
+
+        # NaNs sort to the end, so the first ``counts`` rows of each column
+        # are its ordered observed values
+        ordered = np.sort(values, axis=0)
+        last = np.maximum(counts - 1, 0)
+
+        def quantile(q: float) -> np.ndarray:
+            position = q * last
+            below = np.floor(position).astype(np.int64)
+            above = np.ceil(position).astype(np.int64)
+            low = np.take_along_axis(ordered, below[None, :], axis=0)[0]
+            high = np.take_along_axis(ordered, above[None, :], axis=0)[0]
+            return low + (high - low) * (position - below)
+
+        q25, median, q75 = quantile(0.25), quantile(0.5), quantile(0.75)
+        stats = {
+            'mean': mean,
+            'median': median,
+            'std': std,
+            'min': ordered[0],
+            'max': np.take_along_axis(ordered, last[None, :], axis=0)[0],
+            'q25': q25,
+            'q75': q75
+        }
+
+        iqr = q75 - q25
+        lower = q25 - 1.5 * iqr
+        upper = q75 + 1.5 * iqr
+        # NaN compares False on both sides, so missing values are never outliers
+        stats['outliers'] = ((values < lower) | (values > upper)).sum(axis=0)
+
+    # All-missing columns have no statistics, as in pandas
+    for key in ['mean', 'median', 'std', 'min', 'max', 'q25', 'q75']:
+        stats[key] = np.where(counts > 0, stats[key], np.nan)
+    return stats
+
+
+class QuantileSketch:
+    """
+    KLL-style mergeable quantile sketch.
+
+    Values enter level 0; when a level holds more than ``k`` items it is
+    sorted and every other item (random offset) is promoted to the next
+    level with double weight. Rank error is roughly O(1/k).
+    """
+
+    def __init__(self, k: int = 2048, seed: int = 42):
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of non-null values"""
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values.astype(np.float64)])
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self.k:
+                items = np.sort(self.levels[level])
+                offset = int(self._rng.integers(0, 2))
+                promoted = items[offset::2]
+                self.levels[level] = np.empty(0)
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(values), 2 ** level, dtype=np.float64)
+            for level, values in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind='mergesort')
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs: List[float]) -> List[float]:
+        """Approximate quantiles (linear interpolation between sketch items)"""
+        if self.count == 0:
+            return [float('nan')] * len(qs)
+        items, cum_weights = self._weighted_items()
+        # Rescale so the sketch's total weight matches the true count
+        positions = cum_weights / cum_weights[-1] * self.count
+        targets = np.asarray(qs) * (self.count - 1) + 1
+        return [float(v) for v in np.interp(targets, positions, items)]
+
+    def rank(self, value: float) -> float:
+        """Approximate number of values strictly below ``value``"""
+        if self.count == 0:
+            return 0.0
+        items, cum_weights = self._weighted_items()
+        idx = np.searchsorted(items, value, side='left')
+        below = cum_weights[idx - 1] if idx > 0 else 0.0
+        return float(below / cum_weights[-1] * self.count)
+
+    def count_above(self, value: float) -> float:
+        """Approximate number of values strictly above ``value``"""
+        if self.count == 0:
+            return 0.0
+        items, cum_weights = self._weighted_items()
+        idx = np.searchsorted(items, value, side='right')
+        at_or_below = cum_weights[idx - 1] if idx > 0 else 0.0
+        return float((cum_weights[-1] - at_or_below) / cum_weights[-1] * self.count)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over pre-hashed 64-bit values"""
+
+    def __init__(self, precision: int = 14):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> None:
+        """Add a batch of uint64 hashes"""
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # bit_length via the float exponent; off by one only next to powers of
+        # two above 2**53, which is noise at HLL's error level
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = (64 - self.p) - bit_length + 1
+        np.maximum.at(self.registers, idx, rank.astype(np.uint8))
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values"""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m ** 2 / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * self.m and zeros > 0:
+            # Small range correction (linear counting)
+            return float(self.m * np.log(self.m / zeros))
+        return float(raw)
+
+
+class _ColumnStats:
+    """Running per-column accumulators"""
+
+    def __init__(self, sketch_size: int):
+        self.dtype: Optional[str] = None
+        self.numeric = True
+        self.nulls = 0
+        self.count = 0  # non-null numeric values
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = QuantileSketch(k=sketch_size)
+        self.distinct = HyperLogLog()
+
+
+class StreamingProfiler:
+    """
+    One-pass profiler that consumes a dataset chunk by chunk.
+
+    Means and variances are merged per chunk with the parallel form of
+    Welford's algorithm; quantiles, distinct counts and duplicate rows are
+    approximate. Row duplicates are counted exactly from a set of 64-bit row
+    hashes until ``exact_row_limit`` distinct rows have been seen, after
+    which a HyperLogLog estimate is used. Per-chunk hashes are buffered and
+    only merged into the sorted set once they outnumber it, so the set is
+    re-sorted a logarithmic number of times rather than once per chunk.
+    """
+
+    def __init__(
+        self,
+        sketch_size: int = 2048,
+        exact_row_limit: int = 10_000_000
+    ):
+        self.sketch_size = sketch_size
+        self.exact_row_limit = exact_row_limit
+        self.rows = 0
+        self.memory_bytes = 0
+        self.columns: Dict[str, _ColumnStats] = {}
+        self._row_hashes: Optional[np.ndarray] = np.empty(0, dtype=np.uint64)
+        self._pending_hashes: List[np.ndarray] = []
+        self._pending_count = 0
+        self._row_distinct = HyperLogLog()
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold one chunk into the running profile"""
+        if chunk.empty:
+            return
+
+        self.rows += len(chunk)
+        self.memory_bytes += int(chunk.memory_usage(deep=True).sum())
+
+        for col in chunk.columns:
+            stats = self.columns.get(col)
+            if stats is None:
+                stats = self.columns[col] = _ColumnStats(self.sketch_size)
+            self._update_column(stats, chunk[col])
+
+        row_hashes = pd.util.hash_pandas_object(chunk, index=False).values
+        self._row_distinct.update(row_hashes)
+        if self._row_hashes is not None:
+            self._pending_hashes.append(row_hashes)
+            self._pending_count += len(row_hashes)
+            if self._pending_count > len(self._row_hashes):
+                self._merge_row_hashes()
+
+    def _merge_row_hashes(self) -> None:
+        """Fold buffered chunk hashes into the exact distinct-row set"""
+        if self._row_hashes is None or not self._pending_hashes:
+            return
+        self._row_hashes = np.unique(np.concatenate([self._row_hashes, *self._pending_hashes]))
+        self._pending_hashes = []
+        self._pending_count = 0
+        if len(self._row_hashes) > self.exact_row_limit:
+            logger.info("Row hash set exceeded limit, switching to approximate duplicate count")
+            self._row_hashes = None
+
+    def _update_column(self, stats: _ColumnStats, series: pd.Series) -> None:
+        stats.dtype = _merge_dtype(stats.dtype, str(series.dtype))
+        null_mask = series.isna()
+        stats.nulls += int(null_mask.sum())
+
+        non_null = series[~null_mask]
+        if len(non_null) > 0:
+            stats.distinct.update(pd.util.hash_pandas_object(non_null, index=False).values)
+
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            stats.numeric = False
+            return
+        if not stats.numeric:
+            return
+
+        values = non_null.to_numpy(dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+
+        # Chan et al. merge of (count, mean, M2) for the chunk into the total
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        total = stats.count + n
+        delta = chunk_mean - stats.mean
+        stats.mean += delta * n / total
+        stats.m2 += chunk_m2 + delta ** 2 * stats.count * n / total
+        stats.count = total
+
+        stats.min = min(stats.min, float(values.min()))
+        stats.max = max(stats.max, float(values.max()))
+        stats.sketch.update(values)
+
+    @property
+    def numeric_columns(self) -> List[str]:
+        return [col for col, s in self.columns.items() if s.numeric and s.count > 0]
+
+    def duplicate_rows(self) -> int:
+        """Number of rows that repeat an earlier row"""
+        self._merge_row_hashes()
+        if self._row_hashes is not None:
+            return self.rows - len(self._row_hashes)
+        return max(0, int(round(self.rows - self._row_distinct.estimate())))
+
+    def _std(self, stats: _ColumnStats) -> float:
+        # Sample standard deviation, as pandas reports
+        return float(np.sqrt(stats.m2 / (stats.count - 1))) if stats.count > 1 else float('nan')
+
+    def profile(self) -> Dict[str, Any]:
+        """Profile in the TaskExecutor._profile_data schema"""
+        missing = {col: s.nulls for col, s in self.columns.items()}
+        duplicates = self.duplicate_rows()
+
+        profile = {
+            'shape': {'rows': self.rows, 'columns': len(self.columns)},
+            'columns': list(self.columns),
+            'dtypes': {col: s.dtype for col, s in self.columns.items()},
+            'missing_values': missing,
+            'missing_percentage': {
+                col: round(n / self.rows * 100, 2) if self.rows else 0.0
+                for col, n in missing.items()
+            },
+            'duplicates': duplicates,
+            'memory_usage': f"{self.memory_bytes / 1024 / 1024:.2f} MB",
+            'distinct_counts': {
+                col: int(round(s.distinct.estimate())) for col, s in self.columns.items()
+            },
+            'streaming': True,
+            'insights': []
+        }
+
+        numeric_cols = self.numeric_columns
+        if numeric_cols:
+            profile['numeric_stats'] = {}
+            for col in numeric_cols:
+                s = self.columns[col]
+                q25, median, q75 = s.sketch.quantiles([0.25, 0.5, 0.75])
+                profile['numeric_stats'][col] = {
+                    'mean': s.mean,
+                    'median': median,
+                    'std': self._std(s),
+                    'min': s.min,
+                    'max': s.max,
+                    'q25': q25,
+                    'q75': q75
+                }
+
+        # Generate insights
+        total_missing = sum(missing.values())
+        if total_missing > 0:
+            columns_with_missing = sum(1 for n in missing.values() if n > 0)
+            profile['insights'].append(
+                f"Found {total_missing} missing values across {columns_with_missing} columns"
+            )
+
+        if duplicates > 0:
+            profile['insights'].append(f"Found {duplicates} duplicate rows")
+
+        for col in numeric_cols:
+            stats = profile['numeric_stats'][col]
+            if stats['std'] == 0:
+                profile['insights'].append(f"Column '{col}' has no variation (constant values)")
+
+            iqr = stats['q75'] - stats['q25']
+            sketch = self.columns[col].sketch
+            outliers = int(round(
+                sketch.rank(stats['q25'] - 1.5 * iqr) + sketch.count_above(stats['q75'] + 1.5 * iqr)
+            ))
+            if outliers > 0:
+                profile['insights'].append(f"Column '{col}' has {outliers} potential outliers")
+
+        return profile
+
+    def describe(self) -> Dict[str, Dict[str, float]]:
+        """Numeric summary in the ``DataFrame.describe().to_dict()`` layout"""
+        summary = {}
+        for col in self.numeric_columns:
+            s = self.columns[col]
+            q25, median, q75 = s.sketch.quantiles([0.25, 0.5, 0.75])
+            summary[col] = {
+                'count': float(s.count),
+                'mean': s.mean,
+                'std': self._std(s),
+                'min': s.min,
+                '25%': q25,
+                '50%': median,
+                '75%': q75,
+                'max': s.max
+            }
+        return summary
+
+
+def iter_chunks(
+    path: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Yield a dataset as DataFrame chunks without loading it whole"""
+    path = Path(path)
+
+    if path.suffix == '.csv':
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif path.suffix == '.json':
+        if _is_json_lines(path):
+            yield from pd.read_json(path, lines=True, chunksize=chunk_size)
+        else:
+            # A JSON document (array or object) has no record boundaries to
+            # stream on; read it whole, as read_dataset does
+            logger.info(f"{path.name} is not JSON Lines, reading it in memory")
+            df = pd.read_json(path)
+            for start in range(0, len(df), chunk_size):
+                yield df.iloc[start:start + chunk_size]
+    else:
+        raise ValueError(f"Streaming not supported for file format: {path.suffix}")
+
+
+def profile_file(
+    path: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **profiler_kwargs
+) -> StreamingProfiler:
+    """Run a StreamingProfiler over every chunk of a file"""
+    profiler = StreamingProfiler(**profiler_kwargs)
+    for chunk in iter_chunks(path, chunk_size):
+        profiler.update(chunk)
+    return profiler
+
+
+def _is_json_lines(path: Path) -> bool:
+    """Whether a .json file holds one JSON object per line rather than one document"""
+    with open(path, 'r') as f:
+        first = f.readline().strip()
+        if not first.startswith('{'):
+            return False
+        try:
+            record = json.loads(first)
+        except json.JSONDecodeError:
+            # An object spread over several lines
+            return False
+        if any(line.strip() for line in f):
+            return True
+    # A single-line file is a record unless it nests like a columns/index-oriented frame
+    return not all(isinstance(v, (dict, list)) for v in record.values())
+
+
+def _merge_dtype(current: Optional[str], new: str) -> str:
+    """Widen a column dtype seen across chunks (e.g. int64 + float64 -> float64)"""
+    if current is None or current == new:
+        return new
+    try:
+        return str(np.result_type(np.dtype(current), np.dtype(new)))
+    except (TypeError, ValueError):
+        return 'object'
@@ -10,15 +10,49 @@ from datetime import datetime
 import traceback
 import io
 import base64
+import hashlib
 from pathlib import Path
+from concurrent.futures import Future
+
+from storage import (
+    load_dataset, SharedFrameHandle, data_fingerprint, file_fingerprint,
+    get_result_cache, make_result_key
+)
+from execution.profiling import profile_file, numeric_profile_kernel, DEFAULT_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Task fields besides type and data that change what a task computes
+CACHE_PARAMETER_KEYS = ('mode', 'chunk_size', 'parameters')
+
+
+def _code_version() -> str:
+    """Hash of the analysis code, so cached results expire when it changes"""
+    digest = hashlib.sha256()
+    for module_file in [Path(__file__), Path(__file__).with_name('profiling.py')]:
+        digest.update(module_file.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+CODE_VERSION = _code_version()
+
 class TaskExecutor:
     """Executes analysis tasks using appropriate agents"""
     
-    def __init__(self):
+    def __init__(self, backend=None, result_cache=None, cache_results: bool = False):
+        """
+        Args:
+            backend: Optional ProcessTaskBackend; CPU-bound task types are
+                shipped to its worker processes instead of running here
+            result_cache: ResultCache to consult before executing
+            cache_results: Use the process-wide cache (under
+                RESULT_CACHE_DIR) when no result_cache is given
+        """
         self.agents = self._initialize_agents()
+        self.backend = backend
+        if result_cache is None and cache_results:
+            result_cache = get_result_cache()
+        self.result_cache = result_cache
         
     def _initialize_agents(self) -> Dict:
         """Initialize available analysis agents"""
@@ -50,17 +84,47 @@ class TaskExecutor:
         
         Args:
             task: Task dictionary with type, parameters, etc.
-            data: DataFrame to analyze
+            data: DataFrame (or SharedFrameHandle) to analyze; loaded from
+                task['data_path'] through the shared dataset cache when not given. Profiling tasks with
+                task['mode'] == 'streaming' read the file in chunks instead.
             
         Returns:
-            Results dictionary with status, outputs, insights
+            Results dictionary with status, outputs, insights; cache_hit
+            tells whether it was served from the result cache
         """
         start_time = datetime.now()
         
+        cache_key = self._result_key(task, data)
+        if cache_key:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return self._cached_result(task, cached, start_time)
+        
+        if self.backend is not None and self.backend.handles(task):
+            result = self._execute_remote(task, data)
+        else:
+            result = self._execute_local(task, data, start_time)
+        
+        return self._store_result(cache_key, result)
+    
+    def _execute_local(self, task: Dict, data, start_time: datetime) -> Dict:
+        """Run a task in this process"""
         try:
             task_type = task.get('type', 'unknown')
             logger.info(f"Executing task: {task.get('name')} (type: {task_type})")
             
+            # Streaming profiles never materialize the whole file
+            stream_profile = (
+                task_type == 'data_profiling' and
+                task.get('mode') == 'streaming' and
+                bool(task.get('data_path'))
+            )
+            
+            if isinstance(data, SharedFrameHandle):
+                data = data.attach()
+            elif data is None and task.get('data_path') and not stream_profile:
+                data = load_dataset(task['data_path'])
+            
             # Get appropriate agent
             agent = self.agents.get(task_type)
             
@@ -69,7 +133,12 @@ class TaskExecutor:
                 return self._execute_fallback(task, data)
             
             # Execute based on task type
-            if task_type == 'data_profiling':
+            if stream_profile:
+                results = profile_file(
+                    task['data_path'],
+                    chunk_size=task.get('chunk_size', DEFAULT_CHUNK_SIZE)
+                ).profile()
+            elif task_type == 'data_profiling':
                 results = self._profile_data(data)
             elif task_type == 'statistical_analysis':
                 results = self._statistical_analysis(data)
@@ -113,55 +182,143 @@ class TaskExecutor:
                 'timestamp': datetime.now().isoformat()
             }
     
+    def submit_task(self, task: Dict, data: pd.DataFrame = None) -> Future:
+        """
+        Start a task without blocking the caller
+        
+        CPU-bound task types run in the process backend; everything else
+        (or every task, without a backend) runs inline and returns an
+        already-resolved future.
+        """
+        future = Future()
+        
+        if self.backend is not None and self.backend.handles(task):
+            start_time = datetime.now()
+            cache_key = self._result_key(task, data)
+            cached = self.result_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                future.set_result(self._cached_result(task, cached, start_time))
+                return future
+            
+            def store(remote: Future):
+                try:
+                    future.set_result(self._store_result(cache_key, remote.result()))
+                except Exception as e:
+                    future.set_exception(e)
+            
+            self.backend.submit(task, data).add_done_callback(store)
+            return future
+        
+        future.set_result(self.execute_task(task, data))
+        return future
+    
+    def _result_key(self, task: Dict, data) -> Optional[str]:
+        """Result cache key, or None when caching is off or the data has no identity"""
+        if self.result_cache is None:
+            return None
+        
+        try:
+            if isinstance(data, SharedFrameHandle):
+                # A shared file never changes while it exists; its bytes are
+                # hashed once per path and mtime instead of attaching the frame
+                fingerprint = file_fingerprint(data.path)
+            elif isinstance(data, pd.DataFrame):
+                fingerprint = data_fingerprint(data)
+            elif data is None and task.get('data_path') and Path(task['data_path']).exists():
+                fingerprint = file_fingerprint(task['data_path'])
+            else:
+                return None
+        except Exception as e:
+            # e.g. object columns holding unhashable values
+            logger.debug(f"Not caching task {task.get('id')}: {e}")
+            return None
+        
+        parameters = {key: task.get(key) for key in CACHE_PARAMETER_KEYS}
+        return make_result_key(fingerprint, task.get('type', 'unknown'), parameters, CODE_VERSION)
+    
+    def _cached_result(self, task: Dict, cached: Dict, start_time: datetime) -> Dict:
+        """A stored result relabelled for this task, timed as the lookup it was"""
+        execution_time = (datetime.now() - start_time).total_seconds()
+        return {
+            **cached,
+            'task_id': task.get('id'),
+            'task_name': task.get('name'),
+            'execution_time': f"{execution_time:.2f} seconds",
+            'cached_execution_time': cached.get('execution_time'),
+            'timestamp': datetime.now().isoformat(),
+            'cache_hit': True
+        }
+    
+    def _store_result(self, cache_key: Optional[str], result: Dict) -> Dict:
+        """Cache successful results and mark them as computed"""
+        if cache_key and result.get('status') == 'success':
+            try:
+                self.result_cache.put(cache_key, result)
+            except Exception as e:
+                logger.warning(f"Could not cache result: {e}")
+        return {**result, 'cache_hit': False}
+    
+    def _execute_remote(self, task: Dict, data: pd.DataFrame = None) -> Dict:
+        """Run a task in a backend worker, reporting pool failures like task failures"""
+        try:
+            return self.backend.execute_task(task, data)
+        except Exception as e:
+            logger.error(f"Worker execution failed: {str(e)}")
+            return {
+                'status': 'failed',
+                'task_id': task.get('id'),
+                'task_name': task.get('name'),
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+    
     def _profile_data(self, data: pd.DataFrame) -> Dict:
         """Profile data quality and characteristics"""
         if data is None or data.empty:
             return {'error': 'No data provided'}
         
+        missing = data.isnull().sum()
+        
         profile = {
             'shape': {'rows': len(data), 'columns': len(data.columns)},
             'columns': list(data.columns),
             'dtypes': {col: str(dtype) for col, dtype in data.dtypes.items()},
-            'missing_values': data.isnull().sum().to_dict(),
-            'missing_percentage': (data.isnull().sum() / len(data) * 100).round(2).to_dict(),
-            'duplicates': len(data[data.duplicated()]),
+            'missing_values': missing.to_dict(),
+            'missing_percentage': (missing / len(data) * 100).round(2).to_dict(),
+            'duplicates': int(data.duplicated().sum()),
             'memory_usage': f"{data.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB",
             'insights': []
         }
         
-        # Numeric columns statistics
+        # Numeric columns statistics, all columns at once
         numeric_cols = data.select_dtypes(include=[np.number]).columns
+        stats = {}
         if len(numeric_cols) > 0:
+            values = data[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            stats = numeric_profile_kernel(values)
+            
             profile['numeric_stats'] = {}
-            for col in numeric_cols:
+            for i, col in enumerate(numeric_cols):
                 profile['numeric_stats'][col] = {
-                    'mean': float(data[col].mean()),
-                    'median': float(data[col].median()),
-                    'std': float(data[col].std()),
-                    'min': float(data[col].min()),
-                    'max': float(data[col].max()),
-                    'q25': float(data[col].quantile(0.25)),
-                    'q75': float(data[col].quantile(0.75))
+                    key: float(stats[key][i])
+                    for key in ['mean', 'median', 'std', 'min', 'max', 'q25', 'q75']
                 }
         
         # Generate insights
-        total_missing = data.isnull().sum().sum()
+        total_missing = missing.sum()
         if total_missing > 0:
-            profile['insights'].append(f"Found {total_missing} missing values across {data.isnull().any().sum()} columns")
+            profile['insights'].append(f"Found {total_missing} missing values across {(missing > 0).sum()} columns")
         
         if profile['duplicates'] > 0:
             profile['insights'].append(f"Found {profile['duplicates']} duplicate rows")
         
         # Check for potential issues
-        for col in numeric_cols:
-            if data[col].std() == 0:
+        for i, col in enumerate(numeric_cols):
+            if stats['std'][i] == 0:
                 profile['insights'].append(f"Column '{col}' has no variation (constant values)")
             
-            # Check for outliers using IQR
-            Q1 = data[col].quantile(0.25)
-            Q3 = data[col].quantile(0.75)
-            IQR = Q3 - Q1
-            outliers = len(data[(data[col] < Q1 - 1.5 * IQR) | (data[col] > Q3 + 1.5 * IQR)])
+            # Outliers using IQR
+            outliers = int(stats['outliers'][i])
             if outliers > 0:
                 profile['insights'].append(f"Column '{col}' has {outliers} potential outliers")
         
@@ -273,6 +430,9 @@ class TaskExecutor:
         
         results = {'insights': [], 'trends': {}}
         
+        # Date parsing below writes columns; don't touch the caller's (possibly cached) frame
+        data = data.copy()
+        
         # Look for date columns
         date_cols = []
         for col in data.columns:
@@ -1,4 +1,5 @@
 from .notebook_runner import NotebookRunner
 from .notebook_builder import NotebookBuilder
+from .worker_pool import NotebookWorkerPool
 
-__all__ = ['NotebookRunner', 'NotebookBuilder']
\ No newline at end of file
+__all__ = ['NotebookRunner', 'NotebookBuilder', 'NotebookWorkerPool']
\ No newline at end of file
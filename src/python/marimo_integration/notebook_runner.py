@@ -1,23 +1,60 @@
 import marimo as mo
 import subprocess
 import json
+import os
+import io
+import sys
+import contextlib
+import types
+import linecache
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 import tempfile
 import logging
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# Variable the generated notebooks load their dataset into
+DATA_VARIABLE = 'df'
+
+# Package root (src/python) made importable for notebooks run as scripts
+SOURCE_ROOT = str(Path(__file__).resolve().parent.parent)
+
 
 class NotebookRunner:
     """Simple Marimo notebook runner - no over-engineering"""
     
-    def __init__(self, notebook_dir: Optional[Path] = None):
+    def __init__(self, notebook_dir: Optional[Path] = None, in_process: bool = True):
+        """
+        Args:
+            notebook_dir: Directory for created notebooks and relative lookups
+            in_process: Run notebooks through marimo's App.run() in this
+                interpreter (default) instead of a fresh Python per notebook
+        """
         self.notebook_dir = notebook_dir or Path("marimo_notebooks")
         self.notebook_dir.mkdir(exist_ok=True)
+        self.in_process = in_process
+        # Compiled apps keyed by path, reused while the file is unchanged
+        self._apps: Dict[str, Tuple[int, Any]] = {}
+        # App.run() and stdout capture are process-global; one notebook at a time
+        self._run_lock = threading.Lock()
     
-    def run_notebook(self, notebook_path: str, inputs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Run a Marimo notebook with given inputs"""
+    def run_notebook(self, notebook_path: str, inputs: Optional[Dict[str, Any]] = None,
+                     data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Run a Marimo notebook with given inputs
+        
+        Args:
+            notebook_path: Notebook file, absolute or relative to notebook_dir
+            inputs: JSON-serialisable inputs; inputs['shared_frame'] is the
+                path of a shared frame the notebook should use as its data,
+                and inputs['data_source'] the file read if it cannot be mapped
+            data: Already-loaded DataFrame used in place of the notebook's
+                own data loading cell (in-process mode only)
+        """
         try:
             notebook_path = Path(notebook_path)
             if not notebook_path.exists():
@@ -26,17 +63,43 @@ class NotebookRunner:
                 if not notebook_path.exists():
                     return {'error': f'Notebook not found: {notebook_path}'}
             
-            # For Phase 1: Simple execution using marimo CLI
-            # In real implementation, we'd use marimo's Python API
-            result = self._execute_notebook_cli(notebook_path, inputs)
-            return result
+            if self.in_process:
+                return self._execute_notebook_in_process(notebook_path, inputs, data)
+            return self._execute_notebook_cli(notebook_path, inputs)
             
         except Exception as e:
             logger.error(f"Failed to run notebook: {e}")
             return {'error': str(e)}
     
+    def _execute_notebook_in_process(self, notebook_path: Path, inputs: Optional[Dict[str, Any]] = None,
+                                     data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Execute notebook cells with marimo's App.run(), reusing loaded modules and data"""
+        try:
+            with self._run_lock:
+                app = self._load_app(notebook_path)
+                result = run_app(app, notebook_defs(inputs, data))
+            result['notebook'] = str(notebook_path)
+            return result
+            
+        except Exception as e:
+            # A failed run can leave the app's cell graph half-built; recompile next time
+            self._apps.pop(str(notebook_path.resolve()), None)
+            return {'error': f'Notebook execution failed: {e}'}
+    
+    def _load_app(self, notebook_path: Path):
+        """Compile a notebook file and return its marimo App"""
+        key = str(notebook_path.resolve())
+        mtime = notebook_path.stat().st_mtime_ns
+        cached = self._apps.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        app = compile_app(notebook_path.read_text(), key)
+        self._apps[key] = (mtime, app)
+        return app
+    
     def _execute_notebook_cli(self, notebook_path: Path, inputs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute notebook using CLI (simplified for Phase 1)"""
+        """Execute notebook as a script in a fresh Python process"""
         try:
             # Create a temporary file for inputs if provided
             input_file = None
@@ -45,16 +108,24 @@ class NotebookRunner:
                     json.dump(inputs, f)
                     input_file = f.name
             
-            # Run the notebook
-            cmd = ['marimo', 'run', str(notebook_path)]
+            # Run the notebook as a script; `marimo run` would start a web server
+            cmd = [sys.executable, str(notebook_path)]
             if input_file:
-                cmd.extend(['--args', input_file])
+                cmd.append(input_file)
+            
+            # Generated notebooks map a shared frame with storage.attach_frame
+            # instead of re-reading the data
+            env = None
+            if inputs and inputs.get('shared_frame'):
+                python_path = os.pathsep.join(filter(None, [SOURCE_ROOT, os.environ.get('PYTHONPATH')]))
+                env = {**os.environ, 'SHARED_FRAME': inputs['shared_frame'], 'PYTHONPATH': python_path}
             
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=60  # 1 minute timeout for Phase 1
+                timeout=60,  # 1 minute timeout for Phase 1
+                env=env
             )
             
             # Clean up input file
@@ -106,4 +177,63 @@ class NotebookRunner:
         # Write notebook
         notebook_path.write_text('\n'.join(notebook_content))
         
-        return notebook_path
\ No newline at end of file
+        return notebook_path
+
+
+def compile_app(source: str, filename: str):
+    """Execute notebook source in a fresh namespace and return its marimo App"""
+    # marimo reads cell source through inspect; make it available without a file
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    namespace = {'__name__': f"marimo_notebook_{Path(filename).stem}", '__file__': filename}
+    exec(compile(source, filename, 'exec'), namespace)
+    app = namespace.get('app')
+    if not isinstance(app, mo.App):
+        raise ValueError(f"No marimo app defined in {filename}")
+    return app
+
+
+def notebook_defs(inputs: Optional[Dict[str, Any]] = None, data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Variable overrides for App.run(); providing the data variable skips the loading cell"""
+    defs = {}
+    if data is not None:
+        # Shallow copy: notebooks adding columns leave the caller's frame alone
+        defs[DATA_VARIABLE] = data.copy(deep=False)
+    elif inputs and inputs.get('shared_frame'):
+        from storage import attach_frame, load_dataset
+        try:
+            defs[DATA_VARIABLE] = attach_frame(inputs['shared_frame'])
+        except Exception as e:
+            # The share can be gone by the time a queued task runs; use the file
+            source = inputs.get('data_source')
+            logger.warning(f"Could not attach shared frame {inputs['shared_frame']}: {e}")
+            if source and Path(source).exists():
+                defs[DATA_VARIABLE] = load_dataset(source).copy(deep=False)
+    return defs
+
+
+def run_app(app, defs: Dict[str, Any]) -> Dict[str, Any]:
+    """Run an app's cells, returning captured stdout and JSON-safe variables"""
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        _, definitions = app.run(defs=defs)
+    
+    return {
+        'success': True,
+        'output': stdout.getvalue(),
+        'results': _json_definitions(definitions, exclude=defs)
+    }
+
+
+def _json_definitions(definitions: Dict[str, Any], exclude: Dict[str, Any]) -> Dict[str, Any]:
+    """Notebook variables as JSON-safe results; modules, functions and frames are dropped"""
+    results = {}
+    for name, value in definitions.items():
+        if name in exclude or name.startswith('_'):
+            continue
+        if callable(value) or isinstance(value, (types.ModuleType, pd.DataFrame, pd.Series)):
+            continue
+        try:
+            results[name] = json.loads(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            continue
+    return results
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""
+Warm notebook worker pool
+Long-lived worker processes with the analysis stack pre-imported run
+generated notebooks sent over a pipe, so every notebook keeps a process
+boundary without paying interpreter start-up and imports per job
+"""
+
+import time
+import queue
+import logging
+import importlib
+import threading
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Set
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+PRELOAD_MODULES = [
+    'pandas',
+    'numpy',
+    'scipy.stats',
+    'sklearn.cluster',
+    'sklearn.ensemble',
+    'sklearn.metrics',
+    'sklearn.model_selection',
+    'sklearn.preprocessing',
+    'matplotlib.pyplot',
+    'seaborn',
+    'marimo'
+]
+
+# How often a waiting job checks the worker's memory and liveness
+POLL_INTERVAL = 0.25
+# Allowance for a fresh worker to finish its imports before the first job
+STARTUP_TIMEOUT = 120.0
+
+
+def _worker_main(conn):
+    """Worker loop: import once, then run notebooks until told to stop"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    import matplotlib.pyplot as plt
+    from marimo_integration.notebook_runner import compile_app, notebook_defs, run_app
+
+    conn.send({'ready': True})
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        try:
+            app = compile_app(job['source'], job['filename'])
+            result = run_app(app, notebook_defs(job.get('inputs')))
+        except Exception as e:
+            result = {'error': f'Notebook execution failed: {e}'}
+        finally:
+            plt.close('all')
+
+        conn.send(result)
+
+
+def _rss(process: psutil.Process) -> int:
+    try:
+        return process.memory_info().rss
+    except psutil.Error:
+        return 0  # Exited; caught by the liveness check
+
+
+class _Worker:
+    """One worker process and the parent end of its pipe"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.jobs = 0
+
+    def stop(self):
+        try:
+            if self.process.is_alive():
+                self.conn.send(None)
+                self.process.join(timeout=5)
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class NotebookWorkerPool:
+    """
+    Pool of warm processes executing notebook source
+
+    Jobs exceeding the timeout or memory limit have their worker killed and
+    replaced; workers are also recycled after max_jobs_per_worker jobs so
+    leaks in notebook code do not accumulate.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        timeout: float = 60.0,
+        max_jobs_per_worker: int = 50,
+        memory_limit_mb: Optional[int] = None
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.memory_limit_mb = memory_limit_mb
+
+        self._context = multiprocessing.get_context('spawn')
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: Set[_Worker] = set()
+        # Reentrant: start() spawns workers while holding it
+        self._lock = threading.RLock()
+        self._started = False
+        # Threads only wait on pipes; the work happens in the processes
+        self._dispatch = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notebook-pool")
+
+    def start(self):
+        """Spawn the workers; they import the analysis stack in the background"""
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.max_workers):
+                self._idle.put(self._spawn())
+            self._started = True
+
+    def submit(self, source: str, inputs: Optional[Dict[str, Any]] = None,
+               filename: str = "notebook.py") -> Future:
+        """Queue a notebook; the future resolves to the runner-style result dict"""
+        return self._dispatch.submit(self.run, source, inputs, filename)
+
+    def run(self, source: str, inputs: Optional[Dict[str, Any]] = None,
+            filename: str = "notebook.py") -> Dict[str, Any]:
+        """Run notebook source in a worker and wait for the result"""
+        self.start()
+        worker = self._idle.get()
+        job = {'source': source, 'inputs': inputs, 'filename': filename}
+
+        result = None
+        try:
+            result = self._run_on(worker, job)
+        except (EOFError, OSError, psutil.Error):
+            result = {'error': 'Notebook worker exited unexpectedly', 'pool_error': True}
+        except Exception as e:
+            # e.g. inputs that cannot be pickled; the pipe's state is unknown
+            logger.exception("Notebook job could not be run in the pool")
+            result = {'error': f'Notebook job failed: {e}', 'pool_error': True}
+        finally:
+            # Always hand a worker back, or callers block on _idle forever
+            self._idle.put(self._after_job(worker, result))
+        return result
+
+    def _after_job(self, worker: _Worker, result: Optional[Dict[str, Any]]) -> _Worker:
+        """The worker to put back: the same one, or a replacement"""
+        if result is None or result.pop('pool_error', False) or not worker.process.is_alive():
+            return self._replace(worker)
+        worker.jobs += 1
+        if worker.jobs >= self.max_jobs_per_worker:
+            return self._replace(worker)
+        return worker
+
+    def _run_on(self, worker: _Worker, job: Dict[str, Any]) -> Dict[str, Any]:
+        if not worker.ready:
+            if not worker.conn.poll(STARTUP_TIMEOUT):
+                return {'error': 'Notebook worker failed to start', 'pool_error': True}
+            worker.conn.recv()
+            worker.ready = True
+
+        worker.conn.send(job)
+        deadline = time.monotonic() + self.timeout
+        process = psutil.Process(worker.process.pid)
+
+        while not worker.conn.poll(POLL_INTERVAL):
+            if time.monotonic() > deadline:
+                return {'error': 'Notebook execution timed out', 'pool_error': True}
+            if not worker.process.is_alive():
+                return {'error': 'Notebook worker exited unexpectedly', 'pool_error': True}
+            if self.memory_limit_mb and _rss(process) > self.memory_limit_mb * 1024 * 1024:
+                return {
+                    'error': f'Notebook exceeded memory limit of {self.memory_limit_mb} MB',
+                    'pool_error': True
+                }
+
+        return worker.conn.recv()
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        """Kill a worker (timed out, over memory or used up) and start a fresh one"""
+        logger.info(f"Recycling notebook worker {worker.process.pid} after {worker.jobs} jobs")
+        with self._lock:
+            self._workers.discard(worker)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        worker.conn.close()
+        return self._spawn()
+
+    def shutdown(self):
+        """Stop all workers; the pool starts again on the next job"""
+        self._dispatch.shutdown(wait=True)
+        self._dispatch = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="notebook-pool")
+        with self._lock:
+            for worker in list(self._workers):
+                worker.stop()
+            self._workers.clear()
+            self._idle = queue.Queue()
+            self._started = False
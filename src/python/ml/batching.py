@@ -0,0 +1,177 @@
+"""
+Micro-batching for model predictions
+Concurrent prediction requests for the same model are coalesced into one
+vectorized predict/predict_proba call, amortizing the per-call overhead
+of single-row requests
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_WINDOW_MS = float(os.getenv('PREDICT_BATCH_WINDOW_MS', 3))
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv('PREDICT_MAX_BATCH_SIZE', 64))
+
+# A model's dispatcher thread exits after this long without requests
+IDLE_TIMEOUT = 60.0
+
+_Request = Tuple[pd.DataFrame, Future]
+
+
+class PredictionBatcher:
+    """
+    Coalesces prediction requests per model
+
+    The first request for a model opens a batch; requests arriving within
+    batch_window_ms join it until it holds max_batch_size rows. Each model
+    gets its own dispatcher thread, started on demand.
+    """
+
+    def __init__(
+        self,
+        registry,
+        batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    ):
+        """
+        Args:
+            registry: ModelRegistry the models are loaded from
+            batch_window_ms: How long a batch waits for more requests
+            max_batch_size: Rows that close a batch early
+        """
+        self.registry = registry
+        self.batch_window_ms = batch_window_ms
+        self.max_batch_size = max_batch_size
+
+        self._queues: Dict[str, "queue.Queue[_Request]"] = {}
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.max_batch_rows = 0
+
+    def submit(self, model_id: str, X: pd.DataFrame) -> Future:
+        """
+        Queue rows for prediction
+
+        Args:
+            model_id: Registry model id
+            X: Rows with the model's feature columns, in training order
+
+        Returns:
+            Future resolving to {'predictions', 'probabilities', 'batch_size'},
+            predictions and probabilities as NumPy arrays
+        """
+        future = Future()
+        with self._lock:
+            requests = self._queues.get(model_id)
+            if requests is None:
+                requests = self._queues[model_id] = queue.Queue()
+                threading.Thread(
+                    target=self._serve, args=(model_id, requests),
+                    name=f"predict-batcher-{model_id}", daemon=True
+                ).start()
+            requests.put((X, future))
+        return future
+
+    def predict(self, model_id: str, X: pd.DataFrame) -> Dict[str, Any]:
+        """Predict rows through the batcher (blocking)"""
+        return self.submit(model_id, X).result()
+
+    def _serve(self, model_id: str, requests: "queue.Queue[_Request]"):
+        """Dispatcher loop for one model"""
+        window = self.batch_window_ms / 1000
+
+        while True:
+            try:
+                first = requests.get(timeout=IDLE_TIMEOUT)
+            except queue.Empty:
+                with self._lock:
+                    # submit() enqueues under the lock, so nothing can slip in
+                    if requests.empty():
+                        del self._queues[model_id]
+                        return
+                continue
+
+            batch = [first]
+            rows = len(first[0])
+            deadline = time.monotonic() + window
+            while rows < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                rows += len(request[0])
+
+            self._run_batch(model_id, batch)
+
+    def _run_batch(self, model_id: str, batch: List[_Request]):
+        try:
+            results = self._predict(model_id, [X for X, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # Retry one by one so a malformed request only fails itself
+            logger.debug(f"Batch of {len(batch)} for {model_id} failed ({e}), retrying individually")
+            for request in batch:
+                self._run_batch(model_id, [request])
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _predict(self, model_id: str, frames: List[pd.DataFrame]) -> List[Dict[str, Any]]:
+        """One predict (and predict_proba) call over all frames, split back per frame"""
+        model = self.registry.load_model(model_id)
+        metadata = self.registry.get_model_metadata(model_id)
+
+        X = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        predictions = model.predict(X)
+        probabilities = None
+        if metadata.model_type == 'classification' and hasattr(model, 'predict_proba'):
+            probabilities = model.predict_proba(X)
+
+        with self._lock:
+            self.batches += 1
+            self.requests += len(frames)
+            self.rows += len(X)
+            self.max_batch_rows = max(self.max_batch_rows, len(X))
+
+        results = []
+        start = 0
+        for frame in frames:
+            end = start + len(frame)
+            results.append({
+                'predictions': predictions[start:end],
+                'probabilities': probabilities[start:end] if probabilities is not None else None,
+                'batch_size': len(X)
+            })
+            start = end
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Achieved batch sizes, for tuning the window and size limit"""
+        with self._lock:
+            return {
+                'batch_window_ms': self.batch_window_ms,
+                'max_batch_size': self.max_batch_size,
+                'batches': self.batches,
+                'requests': self.requests,
+                'rows': self.rows,
+                'mean_batch_rows': self.rows / self.batches if self.batches else 0.0,
+                'mean_batch_requests': self.requests / self.batches if self.batches else 0.0,
+                'max_batch_rows': self.max_batch_rows
+            }
@@ -0,0 +1,347 @@
+"""
+Parallel candidate fitting
+Fits several estimators on the same train/test split concurrently, one per
+worker of a dedicated process pool, with n_jobs budgeted so that pool
+workers and multi-threaded estimators (forests) don't oversubscribe cores.
+The pool is separate from the analysis task pool, and each training holds
+its pool on its own, so that fits still running when the time budget
+expires can be killed without touching other work.
+"""
+
+import os
+import sys
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+from sklearn.ensemble import BaseEnsemble
+from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+_budget = os.getenv('AUTO_TRAIN_TIME_BUDGET')
+DEFAULT_TIME_BUDGET = float(_budget) if _budget else None
+
+# Below this many training rows, process start-up and shipping the data
+# cost more than fitting the candidates one after another in-process
+PARALLEL_MIN_SAMPLES = 5_000
+
+# ProcessPoolExecutor has no public way to stop a running call. CPython keeps
+# a pool's workers in the private _processes dict (pid -> Process), laid out
+# the same in these versions; on others terminate() shuts the pool down
+# without killing running fits
+_WORKER_TABLE_VERSIONS = ((3, 8), (3, 14))
+
+
+@dataclass
+class CandidateResult:
+    """Outcome of fitting one candidate estimator"""
+    name: str
+    algorithm: str
+    status: str  # fitted, failed, timed_out
+    score: Optional[float] = None
+    fit_time: Optional[float] = None
+    error: Optional[str] = None
+    estimator: Optional[BaseEstimator] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Everything but the estimator, for model metadata"""
+        return {
+            'name': self.name,
+            'algorithm': self.algorithm,
+            'status': self.status,
+            'score': self.score,
+            'fit_time': self.fit_time,
+            'error': self.error
+        }
+
+
+class CandidatePool:
+    """
+    Process pool for candidate fits that can be torn down mid-fit
+
+    Workers are started on first use and reused across trainings; when a
+    time budget expires, terminate() kills them so abandoned fits stop
+    holding cores, and the next training starts a fresh pool. Since that
+    kills every worker, one training at a time claims the pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+        self._claim = Lock()
+
+    def claim(self) -> bool:
+        """Reserve the pool for one training; False if another holds it"""
+        return self._claim.acquire(blocking=False)
+
+    def release(self):
+        self._claim.release()
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a threaded Streamlit/Flask process is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._pool
+
+    def warm(self):
+        """Start every worker now instead of on the first training"""
+        futures = [self.pool.submit(os.getpid) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def workers(self) -> List[multiprocessing.Process]:
+        """Started worker processes; empty if the pool is not running or they cannot be listed"""
+        with self._lock:
+            pool = self._pool
+        return (_worker_processes(pool) or []) if pool is not None else []
+
+    def terminate(self):
+        """Cancel queued fits and kill the workers, including running fits"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        processes = _worker_processes(pool)
+        if processes is None:
+            logger.warning(
+                f"Cannot kill candidate workers on Python {sys.version.split()[0]}; "
+                "running fits finish in the background"
+            )
+            pool.shutdown(wait=False, cancel_futures=True)
+            return
+        pool.shutdown(wait=False)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+def _worker_processes(pool: ProcessPoolExecutor) -> Optional[List[multiprocessing.Process]]:
+    """A pool's worker processes, or None where its private worker table is not known"""
+    low, high = _WORKER_TABLE_VERSIONS
+    if not low <= sys.version_info[:2] <= high:
+        return None
+    processes = getattr(pool, '_processes', None)
+    if processes is None:
+        # Cleared once the pool has shut down
+        return []
+    if not isinstance(processes, dict) or not all(hasattr(p, 'terminate') for p in processes.values()):
+        return None
+    return list(processes.values())
+
+
+_candidate_pool: Optional[CandidatePool] = None
+_candidate_pool_lock = Lock()
+
+
+def get_candidate_pool() -> CandidatePool:
+    """Process-wide candidate pool; sized by TASK_WORKERS (defaults to all cores)"""
+    global _candidate_pool
+    with _candidate_pool_lock:
+        if _candidate_pool is None:
+            workers = os.getenv('TASK_WORKERS')
+            _candidate_pool = CandidatePool(max_workers=int(workers) if workers else None)
+        return _candidate_pool
+
+
+def core_budget(n_candidates: int, max_workers: int) -> Tuple[int, int]:
+    """(concurrent candidates, n_jobs per candidate) sharing the machine's cores"""
+    cores = os.cpu_count() or 1
+    workers = max(1, min(n_candidates, max_workers, cores))
+    return workers, max(1, cores // workers)
+
+
+def _final_estimator(estimator: BaseEstimator) -> BaseEstimator:
+    """The model itself, past any preprocessing stage in front of it"""
+    return estimator[-1] if isinstance(estimator, Pipeline) else estimator
+
+
+def _algorithm(estimator: BaseEstimator) -> str:
+    return type(_final_estimator(estimator)).__name__
+
+
+def _set_n_jobs(estimator: BaseEstimator, n_jobs: Optional[int]) -> None:
+    """Thread count of ensembles; linear models and SVMs are single-threaded here"""
+    estimator = _final_estimator(estimator)
+    if isinstance(estimator, BaseEnsemble) and 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=n_jobs)
+
+
+def _fit_candidate(
+    name: str,
+    estimator: BaseEstimator,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series
+) -> CandidateResult:
+    """Fit and score one candidate (in a pool worker or in-process)"""
+    algorithm = _algorithm(estimator)
+    start = time.perf_counter()
+    try:
+        estimator.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+        score = float(estimator.score(X_test, y_test))
+    except Exception as e:
+        return CandidateResult(name, algorithm, 'failed', fit_time=time.perf_counter() - start, error=str(e))
+
+    # Registered models serve single-row predictions, where per-call
+    # thread start-up costs more than it saves
+    _set_n_jobs(estimator, None)
+    return CandidateResult(name, algorithm, 'fitted', score=score, fit_time=fit_time, estimator=estimator)
+
+
+def fit_candidates(
+    candidates: Dict[str, BaseEstimator],
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+    pool: Optional[CandidatePool] = None
+) -> List[CandidateResult]:
+    """
+    Fit and score every candidate, concurrently when the data is large enough
+
+    Args:
+        candidates: Name -> unfitted estimator
+        X_train, y_train, X_test, y_test: The split to fit and score on
+        time_budget: Seconds after which candidates that have not finished
+            are stopped (status 'timed_out'); None waits for all
+        pool: CandidatePool that runs the fits; defaults to the
+            process-wide one for datasets of PARALLEL_MIN_SAMPLES rows.
+            While another training holds it, this one runs in a private
+            pool of the same size, so a budget expiry only kills its own fits
+
+    Returns:
+        One CandidateResult per candidate, in the order given; pool errors
+        (a crashed worker, an estimator that cannot be pickled) are
+        reported as 'failed' results
+    """
+    names = list(candidates)
+    if pool is None and len(X_train) >= PARALLEL_MIN_SAMPLES and len(names) > 1:
+        pool = get_candidate_pool()
+
+    if pool is None:
+        return _fit_sequential(candidates, X_train, y_train, X_test, y_test, time_budget)
+
+    if pool.claim():
+        try:
+            return _fit_in_pool(candidates, X_train, y_train, X_test, y_test, time_budget, pool)
+        finally:
+            pool.release()
+
+    logger.info("Candidate pool is busy with another training; using a private pool")
+    private = CandidatePool(max_workers=pool.max_workers)
+    try:
+        return _fit_in_pool(candidates, X_train, y_train, X_test, y_test, time_budget, private)
+    finally:
+        private.shutdown()
+
+
+def _fit_in_pool(
+    candidates: Dict[str, BaseEstimator],
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    time_budget: Optional[float],
+    pool: CandidatePool
+) -> List[CandidateResult]:
+    """Submit every candidate to a pool this training holds on its own"""
+    names = list(candidates)
+    workers, n_jobs = core_budget(len(names), pool.max_workers)
+    logger.info(f"Fitting {len(names)} candidates, {workers} at a time with n_jobs={n_jobs}")
+
+    futures = {}
+    errors = {}
+    for name in names:
+        _set_n_jobs(candidates[name], n_jobs)
+        try:
+            futures[name] = pool.pool.submit(
+                _fit_candidate, name, candidates[name], X_train, y_train, X_test, y_test
+            )
+        except Exception as e:
+            errors[name] = e
+
+    _, not_done = wait(futures.values(), timeout=time_budget)
+    if not_done:
+        # Stop the fits that are still running instead of letting them hold
+        # workers until they finish
+        logger.warning(f"{len(not_done)} candidates exceeded the {time_budget}s budget; stopping them")
+        pool.terminate()
+
+    results = []
+    for name in names:
+        algorithm = _algorithm(candidates[name])
+        future = futures.get(name)
+        if future in not_done:
+            results.append(CandidateResult(name, algorithm, 'timed_out'))
+            continue
+        try:
+            if future is None:
+                raise errors[name]
+            results.append(future.result())
+        except Exception as e:
+            errors[name] = e
+            results.append(CandidateResult(name, algorithm, 'failed', error=_describe(e)))
+
+    if not not_done and any(isinstance(e, BrokenProcessPool) for e in errors.values()):
+        # A broken pool refuses further work; start clean next time
+        pool.terminate()
+    return results
+
+
+def _describe(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+def _fit_sequential(
+    candidates: Dict[str, BaseEstimator],
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    time_budget: Optional[float]
+) -> List[CandidateResult]:
+    """In-process fallback: one candidate at a time, each using every core"""
+    start = time.monotonic()
+    results = []
+    for name, estimator in candidates.items():
+        if time_budget is not None and time.monotonic() - start >= time_budget:
+            results.append(CandidateResult(name, _algorithm(estimator), 'timed_out'))
+            continue
+        _set_n_jobs(estimator, -1)
+        results.append(_fit_candidate(name, estimator, X_train, y_train, X_test, y_test))
+    return results
+
+
+def best_candidate(results: List[CandidateResult]) -> CandidateResult:
+    """Highest-scoring fitted candidate"""
+    fitted = [r for r in results if r.status == 'fitted' and not np.isnan(r.score)]
+    if not fitted:
+        errors = '; '.join(f"{r.name}: {r.error or r.status}" for r in results)
+        raise ValueError(f"No candidate model could be trained ({errors})")
+    return max(fitted, key=lambda r: r.score)
@@ -0,0 +1,146 @@
+"""
+Cross-validation harness
+Splits a dataset into folds once and scores any number of models on the
+same folds, fitting the (model x fold) pairs in parallel. Rows are stored
+in fold order, so every test fold is a zero-copy slice of one contiguous
+array; joblib memory-maps that array into the workers instead of pickling
+the data per fit. Training rows are the complement of a test block, so
+each fit gathers them into one fresh array (a copy of ~(k-1)/k of X).
+
+DataFrames are kept as frames (in the same fold order) so models can be
+Pipelines whose preprocessing stage selects columns by name and is fitted
+on each fold's training rows only.
+"""
+
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import check_cv
+
+from ml.candidates import PARALLEL_MIN_SAMPLES
+
+logger = logging.getLogger(__name__)
+
+# Score reported per task type; result keys are mean_<metric> / std_<metric>
+TASK_METRICS = {'regression': 'r2', 'classification': 'accuracy'}
+
+
+class FoldCache:
+    """
+    A dataset split into cross-validation folds once
+
+    Same folds as cross_val_score(cv=n_folds): KFold for regression,
+    StratifiedKFold for classification.
+    """
+
+    def __init__(
+        self,
+        X: Union[pd.DataFrame, np.ndarray],
+        y: Union[pd.Series, np.ndarray],
+        n_folds: int = 5,
+        task_type: str = 'regression'
+    ):
+        y = np.asarray(y)
+        splits = check_cv(n_folds, y, classifier=task_type == 'classification').split(np.zeros(len(y)), y)
+        test_folds = [test for _, test in splits]
+
+        # Reorder rows so fold k's test rows are rows bounds[k]:bounds[k + 1]
+        order = np.concatenate(test_folds)
+        if isinstance(X, pd.DataFrame):
+            self.X = X.iloc[order].reset_index(drop=True)
+        else:
+            self.X = np.ascontiguousarray(np.asarray(X)[order])
+        self.y = np.ascontiguousarray(y[order])
+        self.bounds = np.cumsum([0] + [len(test) for test in test_folds])
+        self.n_folds = len(test_folds)
+        self.task_type = task_type
+        # Row positions outside each test block, computed once
+        rows = np.arange(len(self.y))
+        self.train_index = [
+            np.concatenate([rows[:self.bounds[k]], rows[self.bounds[k + 1]:]])
+            for k in range(self.n_folds)
+        ]
+
+    def _rows(self, index) -> Union[pd.DataFrame, np.ndarray]:
+        return self.X.iloc[index] if isinstance(self.X, pd.DataFrame) else self.X[index]
+
+    def test(self, fold: int) -> Tuple[Union[pd.DataFrame, np.ndarray], np.ndarray]:
+        """Test rows of a fold (views, no copy)"""
+        start, end = self.bounds[fold], self.bounds[fold + 1]
+        return self._rows(slice(start, end)), self.y[start:end]
+
+    def train(self, fold: int) -> Tuple[Union[pd.DataFrame, np.ndarray], np.ndarray]:
+        """Training rows of a fold: the rows before and after its test block (a copy)"""
+        index = self.train_index[fold]
+        return self._rows(index), self.y[index]
+
+
+def _fit_fold(model: BaseEstimator, folds: FoldCache, fold: int, scoring: str) -> Tuple[float, float]:
+    """(score, fit seconds) of a fresh copy of model on one fold"""
+    X_train, y_train = folds.train(fold)
+    X_test, y_test = folds.test(fold)
+    start = time.perf_counter()
+    fitted = clone(model).fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    return float(get_scorer(scoring)(fitted, X_test, y_test)), fit_time
+
+
+def _safe_fit_fold(model, folds, fold, scoring) -> Union[Tuple[float, float], Exception]:
+    try:
+        return _fit_fold(model, folds, fold, scoring)
+    except Exception as e:
+        return e
+
+
+def cross_validate_models(
+    models: Dict[str, BaseEstimator],
+    folds: FoldCache,
+    scoring: Optional[str] = None,
+    n_jobs: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Score every model on every fold
+
+    Args:
+        models: Name -> unfitted estimator
+        folds: Shared folds
+        scoring: sklearn scorer name; defaults to the task type's metric
+        n_jobs: Parallel fits; defaults to all cores from PARALLEL_MIN_SAMPLES
+            rows, else 1 (worker start-up would dominate)
+
+    Returns:
+        Name -> {'mean_<metric>', 'std_<metric>', 'mean_fit_time'}, or
+        {'error'} for models that failed on any fold
+    """
+    scoring = scoring or TASK_METRICS[folds.task_type]
+    if n_jobs is None:
+        n_jobs = -1 if len(folds.y) >= PARALLEL_MIN_SAMPLES else 1
+
+    pairs = [(name, fold) for name in models for fold in range(folds.n_folds)]
+    outcomes = Parallel(n_jobs=n_jobs)(
+        delayed(_safe_fit_fold)(models[name], folds, fold, scoring) for name, fold in pairs
+    )
+
+    by_model: Dict[str, list] = {name: [] for name in models}
+    for (name, _), outcome in zip(pairs, outcomes):
+        by_model[name].append(outcome)
+
+    results = {}
+    for name, outcomes in by_model.items():
+        errors = [o for o in outcomes if isinstance(o, Exception)]
+        if errors:
+            results[name] = {'error': str(errors[0])}
+            continue
+        scores = np.array([score for score, _ in outcomes])
+        results[name] = {
+            f'mean_{scoring}': float(scores.mean()),
+            f'std_{scoring}': float(scores.std()),
+            'mean_fit_time': float(np.mean([fit_time for _, fit_time in outcomes]))
+        }
+    return results
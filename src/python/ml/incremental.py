@@ -0,0 +1,212 @@
+"""
+Out-of-core model training
+Trains partial_fit estimators (SGD, online naive Bayes, mini-batch k-means)
+over file chunks, so datasets larger than RAM never have to be loaded whole.
+Three passes over the file: feature scaling statistics and target classes,
+training on the non-holdout rows, then streaming metrics on the holdout rows.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.linear_model import SGDClassifier, SGDRegressor
+from sklearn.naive_bayes import GaussianNB
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from execution.profiling import DEFAULT_CHUNK_SIZE, iter_chunks
+
+logger = logging.getLogger(__name__)
+
+# Targets with fewer distinct values than this are treated as classes
+MAX_CLASSES = 10
+
+
+def make_incremental_estimator(task_type: str, model_type: str = 'auto', **params) -> BaseEstimator:
+    """partial_fit estimator for a task: SGD by default, 'naive_bayes' or k-means"""
+    if task_type == 'regression':
+        return SGDRegressor(random_state=42, **params)
+    if task_type == 'classification':
+        if model_type == 'naive_bayes':
+            return GaussianNB(**params)
+        return SGDClassifier(loss='log_loss', random_state=42, **params)
+    if task_type == 'clustering':
+        return MiniBatchKMeans(n_clusters=params.pop('n_clusters', 8), random_state=42, n_init=3, **params)
+    raise ValueError(f"Unknown task type: {task_type}")
+
+
+@dataclass
+class _StreamingMetrics:
+    """Holdout metrics accumulated chunk by chunk"""
+    task_type: str
+    n: int = 0
+    correct: int = 0
+    sum_sq_error: float = 0.0
+    sum_y: float = 0.0
+    sum_y_sq: float = 0.0
+    inertia: float = 0.0
+
+    def update(self, model: BaseEstimator, X: np.ndarray, y: Optional[np.ndarray]) -> None:
+        self.n += len(X)
+        if self.task_type == 'clustering':
+            # score() is the negative inertia of the rows
+            self.inertia -= float(model.score(X))
+            return
+        y_pred = model.predict(X)
+        if self.task_type == 'classification':
+            self.correct += int((y_pred == y).sum())
+        else:
+            y = y.astype(float)
+            self.sum_sq_error += float(((y - y_pred) ** 2).sum())
+            self.sum_y += float(y.sum())
+            self.sum_y_sq += float((y ** 2).sum())
+
+    def result(self) -> Dict[str, float]:
+        if self.n == 0:
+            return {}
+        if self.task_type == 'classification':
+            return {'accuracy': self.correct / self.n}
+        if self.task_type == 'clustering':
+            return {'inertia': self.inertia, 'mean_inertia': self.inertia / self.n}
+        total = self.sum_y_sq - self.sum_y ** 2 / self.n
+        return {
+            'mse': self.sum_sq_error / self.n,
+            'r2': 1 - self.sum_sq_error / total if total > 0 else 0.0
+        }
+
+
+@dataclass
+class IncrementalTrainingResult:
+    """A model trained out of core and what it was trained on"""
+    model: Pipeline  # StandardScaler + estimator
+    task_type: str
+    feature_names: List[str]
+    metrics: Dict[str, float]
+    training_samples: int
+    test_samples: int
+    classes: List[Any] = field(default_factory=list)
+
+
+def _holdout_mask(chunk_index: int, n_rows: int, test_size: float, random_state: int) -> np.ndarray:
+    """Rows of a chunk held out for testing; the same rows on every pass"""
+    return np.random.default_rng([random_state, chunk_index]).random(n_rows) < test_size
+
+
+def _chunk_features(chunk: pd.DataFrame, feature_names: List[str]) -> pd.DataFrame:
+    """
+    Features of a chunk, with the same NaN -> 0 rule as in-memory training
+
+    Kept as a DataFrame so the scaler records the feature names that
+    prediction frames are checked against.
+    """
+    X = chunk.reindex(columns=feature_names)
+    return X.apply(pd.to_numeric, errors='coerce').fillna(0).astype(float)
+
+
+def _chunks(path: Union[str, Path], chunk_size: int, target_column: Optional[str]) -> Iterator[pd.DataFrame]:
+    for chunk in iter_chunks(path, chunk_size):
+        if target_column is not None:
+            # Rows without a target can't be trained or scored on
+            chunk = chunk[chunk[target_column].notna()]
+        yield chunk
+
+
+def train_incremental(
+    data_path: Union[str, Path],
+    target_column: Optional[str],
+    task_type: str = 'auto',
+    model_type: str = 'auto',
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    epochs: int = 1,
+    **model_params
+) -> IncrementalTrainingResult:
+    """
+    Train a partial_fit estimator over a file too large to load
+
+    Args:
+        data_path: CSV, Parquet or JSON-lines file
+        target_column: Column to predict; None for clustering
+        task_type: regression, classification, clustering, or auto
+            (classification when the target has fewer than MAX_CLASSES values)
+        model_type: 'naive_bayes' for GaussianNB classification, else SGD
+        chunk_size: Rows per chunk held in memory
+        test_size: Fraction of rows held out (chosen per row, reproducibly)
+        random_state: Seed of the holdout choice
+        epochs: Training passes over the non-holdout rows
+        **model_params: Passed to the estimator (e.g. n_clusters)
+    """
+    # Pass 1: features, scaling statistics and target values
+    scaler = StandardScaler()
+    feature_names = None
+    targets = set()
+    for chunk in _chunks(data_path, chunk_size, target_column):
+        if feature_names is None:
+            feature_names = [c for c in chunk.select_dtypes(include=[np.number]).columns if c != target_column]
+            if not feature_names:
+                raise ValueError("No numeric feature columns")
+        if len(chunk) == 0:
+            continue
+        scaler.partial_fit(_chunk_features(chunk, feature_names))
+        # Classifiers need every class up front; auto only needs to know if there are few
+        if target_column is not None and (
+            task_type == 'classification' or (task_type == 'auto' and len(targets) < MAX_CLASSES)
+        ):
+            targets.update(chunk[target_column].unique().tolist())
+
+    if feature_names is None or not hasattr(scaler, 'n_samples_seen_'):
+        raise ValueError(f"No rows to train on in {data_path}")
+
+    if task_type == 'auto':
+        if target_column is None:
+            task_type = 'clustering'
+        else:
+            task_type = 'classification' if len(targets) < MAX_CLASSES else 'regression'
+
+    estimator = make_incremental_estimator(task_type, model_type, **model_params)
+    classes = np.array(sorted(targets)) if task_type == 'classification' else None
+
+    # Pass 2: train on the non-holdout rows
+    training_samples = 0
+    for epoch in range(epochs):
+        for i, chunk in enumerate(_chunks(data_path, chunk_size, target_column)):
+            train = ~_holdout_mask(i, len(chunk), test_size, random_state)
+            if not train.any():
+                continue
+            X = scaler.transform(_chunk_features(chunk[train], feature_names))
+            if task_type == 'clustering':
+                estimator.partial_fit(X)
+            elif task_type == 'classification':
+                estimator.partial_fit(X, chunk.loc[train, target_column].to_numpy(), classes=classes)
+            else:
+                estimator.partial_fit(X, chunk.loc[train, target_column].to_numpy(dtype=float))
+            if epoch == 0:
+                training_samples += int(train.sum())
+
+    # Pass 3: streaming metrics on the holdout rows
+    metrics = _StreamingMetrics(task_type)
+    for i, chunk in enumerate(_chunks(data_path, chunk_size, target_column)):
+        test = _holdout_mask(i, len(chunk), test_size, random_state)
+        if not test.any():
+            continue
+        X = scaler.transform(_chunk_features(chunk[test], feature_names))
+        y = chunk.loc[test, target_column].to_numpy() if target_column is not None else None
+        metrics.update(estimator, X, y)
+
+    logger.info(f"Trained {type(estimator).__name__} on {training_samples} rows out of core")
+    return IncrementalTrainingResult(
+        model=Pipeline([('scaler', scaler), ('model', estimator)]),
+        task_type=task_type,
+        feature_names=feature_names,
+        metrics=metrics.result(),
+        training_samples=training_samples,
+        test_samples=metrics.n,
+        classes=classes.tolist() if classes is not None else []
+    )
@@ -0,0 +1,78 @@
+"""
+In-memory model cache
+Keeps deserialized models so prediction requests don't unpickle the model
+file on every call
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, Union
+
+from storage.lru import ByteBudgetLRU, file_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_CACHE_BYTES = int(os.getenv('MODEL_CACHE_BYTES', 1024**3))  # 1GB
+
+# (resolved path, mtime in ns, size in bytes)
+ModelKey = Tuple[str, int, int]
+
+
+class ModelCache:
+    """
+    LRU cache of loaded models with a byte budget.
+
+    Entries are keyed by model file path + mtime + size, so a rewritten
+    file is loaded again. A model's cost is its file size, which for
+    pickled estimators is close to their footprint in memory. Cached models
+    are shared between requests and must not be refitted in place.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MODEL_CACHE_BYTES):
+        self._store = ByteBudgetLRU(max_bytes, kind="Model")
+
+    @property
+    def max_bytes(self) -> int:
+        return self._store.max_bytes
+
+    @staticmethod
+    def make_key(path: Union[str, Path]) -> ModelKey:
+        """Build the cache key for a model file on disk"""
+        return file_version(path)
+
+    def get(self, path: Union[str, Path], loader: Callable[[Path], Any]) -> Any:
+        """Return the model stored at ``path``, calling ``loader`` on a miss"""
+        key = self.make_key(path)
+        model = self._store.get(key)
+        if model is not None:
+            return model
+
+        # Load outside the lock so cached models keep being served meanwhile
+        model = loader(Path(path))
+        self.put(key, model)
+        return model
+
+    def put(self, key: ModelKey, model: Any) -> None:
+        """Insert a model, costed at its file size"""
+        self._store.put(key, model, key[2])
+
+    def contains(self, path: Union[str, Path]) -> bool:
+        """Whether the current version of ``path`` is cached"""
+        try:
+            key = self.make_key(path)
+        except FileNotFoundError:
+            return False
+        return key in self._store
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """Drop every cached version of ``path``"""
+        self._store.invalidate(path)
+
+    def clear(self) -> None:
+        """Drop all cached models and reset counters"""
+        self._store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for sizing the budget"""
+        return self._store.get_stats()
@@ -6,23 +6,35 @@ Manages ML model lifecycle, versioning, and deployment
 
 import json
 import pickle
-import hashlib
+import joblib
 import shutil
+import sqlite3
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from collections.abc import Mapping
+from typing import Dict, List, Any, Iterator, Optional, Union
+from dataclasses import dataclass, asdict, field, fields
 import logging
 
 import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator
+from sklearn.pipeline import Pipeline
 from sklearn.model_selection import cross_val_score, train_test_split
 from sklearn.metrics import (
     accuracy_score, precision_score, recall_score, f1_score,
     mean_squared_error, mean_absolute_error, r2_score
 )
 
+from storage import data_fingerprint
+from ml.model_cache import ModelCache
+from ml.candidates import DEFAULT_TIME_BUDGET, best_candidate, fit_candidates
+from ml.search import halving_search
+from ml.preprocessing import (
+    MODEL_STEP, PREPROCESS_STEP, build_preprocessor, describe_preprocessor, with_preprocessing
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -46,6 +58,11 @@ class ModelMetadata:
     training_data_hash: str
     file_path: str
     status: str  # draft, staging, production, archived
+    artifact_format: str = "pickle"  # joblib (memory-mappable) or pickle (older models)
+    artifact_size: int = 0  # bytes on disk
+    candidates: List[Dict[str, Any]] = field(default_factory=list)  # auto mode: every algorithm tried
+    tuning: Dict[str, Any] = field(default_factory=dict)  # hyperparameter search schedule and timings
+    preprocessing: Dict[str, List[str]] = field(default_factory=dict)  # feature columns per encoding
     
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
@@ -60,39 +77,178 @@ class ModelMetadata:
         data['created_at'] = datetime.fromisoformat(data['created_at'])
         data['updated_at'] = datetime.fromisoformat(data['updated_at'])
         return cls(**data)
+    
+    def to_row(self) -> Dict[str, Any]:
+        """Column values for the registry database"""
+        data = self.to_dict()
+        for key in JSON_FIELDS:
+            data[key] = json.dumps(data[key], default=str)
+        return data
+    
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> 'ModelMetadata':
+        """Create from a registry database row"""
+        # Columns added after a row was written are NULL; keep the field defaults
+        data = {key: row[key] for key in METADATA_FIELDS if row[key] is not None}
+        for key in JSON_FIELDS:
+            if key in data:
+                data[key] = json.loads(data[key])
+        return cls.from_dict(data)
+
+METADATA_FIELDS = [f.name for f in fields(ModelMetadata)]
+COLUMN_TYPES = {f.name: {int: 'INTEGER', float: 'REAL'}.get(f.type, 'TEXT') for f in fields(ModelMetadata)}
+# Stored as JSON text; everything else is a plain column
+JSON_FIELDS = ['tags', 'metrics', 'parameters', 'feature_names', 'candidates', 'tuning', 'preprocessing']
+VALID_STATUSES = ['draft', 'staging', 'production', 'archived']
+
+# New artifacts are uncompressed joblib files, whose NumPy arrays are loaded
+# as read-only memory maps: worker processes share one page-cache copy
+ARTIFACT_FORMAT = 'joblib'
+ARTIFACT_SUFFIXES = {'joblib': '.joblib', 'pickle': '.pkl'}
+MMAP_MODE = 'r'
+
+
+def read_artifact(path: Union[str, Path], artifact_format: str) -> BaseEstimator:
+    """Load a model file written in the given format"""
+    if artifact_format == 'joblib':
+        return joblib.load(path, mmap_mode=MMAP_MODE)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+class _ModelIndex(Mapping):
+    """Read-only model_id -> ModelMetadata view over the registry database"""
+    
+    def __init__(self, registry: 'ModelRegistry'):
+        self._registry = registry
+    
+    def __getitem__(self, model_id: str) -> ModelMetadata:
+        metadata = self._registry._get(model_id)
+        if metadata is None:
+            raise KeyError(model_id)
+        return metadata
+    
+    def __contains__(self, model_id) -> bool:
+        with self._registry._connect() as conn:
+            return conn.execute(
+                "SELECT 1 FROM models WHERE model_id = ?", (model_id,)
+            ).fetchone() is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._registry._connect() as conn:
+            rows = conn.execute("SELECT model_id FROM models").fetchall()
+        return iter(row['model_id'] for row in rows)
+    
+    def __len__(self) -> int:
+        with self._registry._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM models").fetchone()[0]
 
 class ModelRegistry:
-    """Central registry for ML models"""
+    """
+    Central registry for ML models
     
-    def __init__(self, registry_path: str = "./model_registry"):
+    Metadata lives in a SQLite database (WAL mode) so several API workers
+    can share one registry; an older registry.json is imported on first use.
+    Loaded models are kept in an LRU ModelCache.
+    """
+    
+    def __init__(self, registry_path: str = "./model_registry", model_cache: Optional[ModelCache] = None):
         self.registry_path = Path(registry_path)
         self.registry_path.mkdir(parents=True, exist_ok=True)
         
         self.models_dir = self.registry_path / "models"
         self.models_dir.mkdir(exist_ok=True)
         
+        self.db_path = self.registry_path / "registry.db"
         self.metadata_file = self.registry_path / "registry.json"
-        self.models: Dict[str, ModelMetadata] = self._load_registry()
+        self._init_database()
+        self._migrate_json_registry()
+        
+        self.model_cache = model_cache or ModelCache()
+        
+        # Lookups go to the database; metadata objects returned are copies
+        self.models: Mapping[str, ModelMetadata] = _ModelIndex(self)
     
-    def _load_registry(self) -> Dict[str, ModelMetadata]:
-        """Load model registry from disk"""
-        if self.metadata_file.exists():
-            with open(self.metadata_file, 'r') as f:
-                data = json.load(f)
-                return {
-                    model_id: ModelMetadata.from_dict(meta)
-                    for model_id, meta in data.items()
-                }
-        return {}
+    @contextmanager
+    def _connect(self):
+        """Connection committing on success, rolling back on error"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
     
-    def _save_registry(self):
-        """Save registry to disk"""
-        data = {
-            model_id: meta.to_dict()
-            for model_id, meta in self.models.items()
-        }
-        with open(self.metadata_file, 'w') as f:
-            json.dump(data, f, indent=2)
+    def _init_database(self):
+        """Create tables and indexes; add columns for newer metadata fields"""
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = ", ".join(
+                f"{name} TEXT PRIMARY KEY" if name == 'model_id' else f"{name} {COLUMN_TYPES[name]}"
+                for name in METADATA_FIELDS
+            )
+            conn.execute(f"CREATE TABLE IF NOT EXISTS models ({columns})")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS model_tags (
+                    model_id TEXT NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (model_id, tag)
+                )
+            """)
+            
+            existing = {row['name'] for row in conn.execute("PRAGMA table_info(models)")}
+            for name in METADATA_FIELDS:
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE models ADD COLUMN {name} {COLUMN_TYPES[name]}")
+            
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_models_name_status ON models (name, status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_models_status ON models (status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_models_type ON models (model_type)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_models_created ON models (created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_model_tags_tag ON model_tags (tag)")
+    
+    def _migrate_json_registry(self):
+        """One-time import of a registry.json written by earlier versions"""
+        if not self.metadata_file.exists():
+            return
+        
+        with open(self.metadata_file, 'r') as f:
+            data = json.load(f)
+        
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for meta in data.values():
+                self._insert(conn, ModelMetadata.from_dict(meta), replace=False)
+        
+        try:
+            self.metadata_file.rename(self.metadata_file.with_suffix('.json.migrated'))
+        except FileNotFoundError:
+            pass  # Another worker migrated it first
+        logger.info(f"Migrated {len(data)} models from {self.metadata_file} to {self.db_path}")
+    
+    def _insert(self, conn: sqlite3.Connection, metadata: ModelMetadata, replace: bool = True):
+        """Write a model row and its tags"""
+        row = metadata.to_row()
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        cursor = conn.execute(
+            f"{verb} INTO models ({', '.join(row)}) VALUES ({', '.join('?' for _ in row)})",
+            list(row.values())
+        )
+        if cursor.rowcount:
+            conn.execute("DELETE FROM model_tags WHERE model_id = ?", (metadata.model_id,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO model_tags (model_id, tag) VALUES (?, ?)",
+                [(metadata.model_id, tag) for tag in metadata.tags]
+            )
+    
+    def _get(self, model_id: str) -> Optional[ModelMetadata]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM models WHERE model_id = ?", (model_id,)).fetchone()
+        return ModelMetadata.from_row(row) if row else None
     
     def _generate_model_id(self, name: str, version: str) -> str:
         """Generate unique model ID"""
@@ -102,11 +258,7 @@ class ModelRegistry:
     
     def _calculate_data_hash(self, X: Union[pd.DataFrame, np.ndarray]) -> str:
         """Calculate hash of training data for versioning"""
-        if isinstance(X, pd.DataFrame):
-            data_str = X.to_json()
-        else:
-            data_str = str(X.tolist())
-        return hashlib.sha256(data_str.encode()).hexdigest()[:16]
+        return data_fingerprint(X)[:16]
     
     def register_model(
         self,
@@ -121,12 +273,27 @@ class ModelRegistry:
         author: str = "unknown",
         description: str = "",
         tags: List[str] = None,
-        auto_evaluate: bool = True
+        auto_evaluate: bool = True,
+        candidates: List[Dict[str, Any]] = None,
+        tuning: Dict[str, Any] = None
     ) -> str:
-        """Register a new model in the registry"""
+        """
+        Register a new model in the registry
+        
+        model may be a Pipeline whose first step is a fitted preprocessing
+        stage (ml.preprocessing): it is stored in the same artifact, X_train
+        and X_test are the raw features, and algorithm and parameters
+        describe the final estimator.
+        """
         
         model_id = self._generate_model_id(name, version)
         
+        preprocessing = {}
+        estimator = model
+        if isinstance(model, Pipeline) and PREPROCESS_STEP in model.named_steps:
+            preprocessing = describe_preprocessor(model.named_steps[PREPROCESS_STEP])
+            estimator = model[-1]
+        
         # Get feature names
         if isinstance(X_train, pd.DataFrame):
             feature_names = X_train.columns.tolist()
@@ -145,9 +312,8 @@ class ModelRegistry:
             metrics = self.evaluate_model(model, X_test, y_test, model_type)
         
         # Save model
-        model_path = self.models_dir / f"{model_id}.pkl"
-        with open(model_path, 'wb') as f:
-            pickle.dump(model, f)
+        model_path = self.models_dir / f"{model_id}{ARTIFACT_SUFFIXES[ARTIFACT_FORMAT]}"
+        joblib.dump(model, model_path)
         
         # Create metadata
         metadata = ModelMetadata(
@@ -155,24 +321,29 @@ class ModelRegistry:
             name=name,
             version=version,
             model_type=model_type,
-            algorithm=type(model).__name__,
+            algorithm=type(estimator).__name__,
             created_at=datetime.now(),
             updated_at=datetime.now(),
             author=author,
             description=description,
             tags=tags or [],
             metrics=metrics,
-            parameters=model.get_params(),
+            parameters=estimator.get_params(),
             feature_names=feature_names,
             target_name=target_name,
             training_data_hash=self._calculate_data_hash(X_train),
             file_path=str(model_path),
-            status="draft"
+            status="draft",
+            artifact_format=ARTIFACT_FORMAT,
+            artifact_size=model_path.stat().st_size,
+            candidates=candidates or [],
+            tuning=tuning or {},
+            preprocessing=preprocessing
         )
         
         # Register model
-        self.models[model_id] = metadata
-        self._save_registry()
+        with self._connect() as conn:
+            self._insert(conn, metadata)
         
         logger.info(f"Model registered: {model_id}")
         return model_id
@@ -207,13 +378,27 @@ class ModelRegistry:
         return metrics
     
     def load_model(self, model_id: str) -> BaseEstimator:
-        """Load model from registry"""
-        if model_id not in self.models:
+        """Load model from registry (served from the model cache when loaded before)"""
+        metadata = self._get(model_id)
+        if metadata is None:
             raise ValueError(f"Model {model_id} not found in registry")
         
-        metadata = self.models[model_id]
-        with open(metadata.file_path, 'rb') as f:
-            return pickle.load(f)
+        return self.model_cache.get(
+            metadata.file_path,
+            lambda path: read_artifact(path, metadata.artifact_format)
+        )
+    
+    def warm_cache(self, status: str = 'production') -> List[str]:
+        """Load every model with the given status into the model cache"""
+        loaded = []
+        for metadata in self.list_models(status=status):
+            try:
+                self.load_model(metadata.model_id)
+                loaded.append(metadata.model_id)
+            except Exception as e:
+                logger.warning(f"Could not pre-load model {metadata.model_id}: {e}")
+        logger.info(f"Pre-loaded {len(loaded)} {status} models")
+        return loaded
     
     def get_model_metadata(self, model_id: str) -> ModelMetadata:
         """Get model metadata"""
@@ -230,55 +415,90 @@ class ModelRegistry:
     ) -> List[ModelMetadata]:
         """List models with optional filtering"""
         
-        models = list(self.models.values())
+        clauses, params = [], []
         
         if name:
-            models = [m for m in models if name.lower() in m.name.lower()]
+            # Case-insensitive substring match
+            escaped = name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
         
         if status:
-            models = [m for m in models if m.status == status]
+            clauses.append("status = ?")
+            params.append(status)
         
         if model_type:
-            models = [m for m in models if m.model_type == model_type]
+            clauses.append("model_type = ?")
+            params.append(model_type)
         
         if tags:
-            models = [m for m in models if any(tag in m.tags for tag in tags)]
+            clauses.append(
+                f"model_id IN (SELECT model_id FROM model_tags WHERE tag IN ({', '.join('?' for _ in tags)}))"
+            )
+            params.extend(tags)
         
-        # Sort by creation date (newest first)
-        models.sort(key=lambda x: x.created_at, reverse=True)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
         
-        return models
+        # Newest first
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM models {where} ORDER BY created_at DESC, rowid ASC", params
+            ).fetchall()
+        
+        return [ModelMetadata.from_row(row) for row in rows]
     
     def promote_model(self, model_id: str, new_status: str) -> bool:
         """Promote model to new status (staging, production)"""
         if model_id not in self.models:
             return False
         
-        valid_statuses = ['draft', 'staging', 'production', 'archived']
-        if new_status not in valid_statuses:
-            raise ValueError(f"Invalid status. Must be one of {valid_statuses}")
-        
-        # If promoting to production, demote current production model
-        if new_status == 'production':
-            model_name = self.models[model_id].name
-            for mid, meta in self.models.items():
-                if meta.name == model_name and meta.status == 'production' and mid != model_id:
-                    meta.status = 'archived'
-                    meta.updated_at = datetime.now()
+        if new_status not in VALID_STATUSES:
+            raise ValueError(f"Invalid status. Must be one of {VALID_STATUSES}")
+        
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            # Demotion and promotion commit together, so a name never has two
+            # production models (or none) in between
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT name, file_path FROM models WHERE model_id = ?", (model_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            
+            # Archived models stop taking cache space
+            retired = [row['file_path']] if new_status == 'archived' else []
+            
+            if new_status == 'production':
+                retired.extend(r['file_path'] for r in conn.execute(
+                    "SELECT file_path FROM models WHERE name = ? AND status = 'production' AND model_id != ?",
+                    (row['name'], model_id)
+                ))
+                conn.execute(
+                    "UPDATE models SET status = 'archived', updated_at = ? "
+                    "WHERE name = ? AND status = 'production' AND model_id != ?",
+                    (now, row['name'], model_id)
+                )
+            
+            conn.execute(
+                "UPDATE models SET status = ?, updated_at = ? WHERE model_id = ?",
+                (new_status, now, model_id)
+            )
         
-        self.models[model_id].status = new_status
-        self.models[model_id].updated_at = datetime.now()
-        self._save_registry()
+        for path in retired:
+            self.model_cache.invalidate(path)
         
         logger.info(f"Model {model_id} promoted to {new_status}")
         return True
     
     def get_production_model(self, name: str) -> Optional[BaseEstimator]:
         """Get current production model by name"""
-        for model_id, meta in self.models.items():
-            if meta.name == name and meta.status == 'production':
-                return self.load_model(model_id)
-        return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT model_id FROM models WHERE name = ? AND status = 'production' LIMIT 1",
+                (name,)
+            ).fetchone()
+        return self.load_model(row['model_id']) if row else None
     
     def compare_models(
         self,
@@ -321,12 +541,14 @@ class ModelRegistry:
         
         # Delete model file
         model_path = Path(self.models[model_id].file_path)
+        self.model_cache.invalidate(model_path)
         if model_path.exists():
             model_path.unlink()
         
         # Remove from registry
-        del self.models[model_id]
-        self._save_registry()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM models WHERE model_id = ?", (model_id,))
+            conn.execute("DELETE FROM model_tags WHERE model_id = ?", (model_id,))
         
         logger.info(f"Model {model_id} deleted")
         return True
@@ -347,8 +569,8 @@ class ModelRegistry:
         # Copy model file
         metadata = self.models[model_id]
         model_src = Path(metadata.file_path)
-        model_dst = export_dir / "model.pkl"
-        shutil.copy2(model_src, model_dst)
+        model_file = f"model{ARTIFACT_SUFFIXES[metadata.artifact_format]}"
+        shutil.copy2(model_src, export_dir / model_file)
         
         # Export metadata
         if include_metadata:
@@ -359,11 +581,19 @@ class ModelRegistry:
         # Create requirements file
         req_path = export_dir / "requirements.txt"
         with open(req_path, 'w') as f:
-            f.write("scikit-learn>=1.0.0\n")
+            f.write("scikit-learn>=1.2.0\n")
             f.write("pandas>=1.3.0\n")
             f.write("numpy>=1.21.0\n")
         
         # Create usage example
+        if metadata.artifact_format == 'joblib':
+            load_code = f"import joblib\nimport pandas as pd\n\n# Load model\nmodel = joblib.load('{model_file}')"
+        else:
+            load_code = (
+                f"import pickle\nimport pandas as pd\n\n# Load model\n"
+                f"with open('{model_file}', 'rb') as f:\n    model = pickle.load(f)"
+            )
+        
         usage_path = export_dir / "usage.py"
         with open(usage_path, 'w') as f:
             f.write(f"""#!/usr/bin/env python3
@@ -371,12 +601,7 @@ class ModelRegistry:
 Usage example for model {model_id}
 \"\"\"
 
-import pickle
-import pandas as pd
-
-# Load model
-with open('model.pkl', 'rb') as f:
-    model = pickle.load(f)
+{load_code}
 
 # Example prediction
 # Replace with your actual data
@@ -409,9 +634,28 @@ class ModelTrainer:
         test_size: float = 0.2,
         cv_folds: int = 5,
         auto_tune: bool = True,
+        time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+        search: str = "halving",
         **kwargs
     ) -> str:
-        """Train and register a model with automatic tuning"""
+        """
+        Train and register a model with automatic tuning
+        
+        algorithm="auto" fits every candidate algorithm concurrently (see
+        ml.candidates) and keeps the best test score; candidates still
+        running after time_budget seconds are dropped. Each candidate's
+        score and fit time is stored in the model's metadata.
+        
+        With auto_tune, random forests are tuned by successive halving
+        (search="halving", see ml.search; time_budget bounds it too) or an
+        exhaustive GridSearchCV (search="grid"). The search schedule and
+        per-rung timings are stored in the model's metadata.
+        
+        DataFrame features are encoded by a preprocessing stage (see
+        ml.preprocessing) that every candidate and every search fold fits on
+        its own training rows; the registered model is a Pipeline of that
+        stage and the chosen estimator, so it predicts from raw feature frames.
+        """
         
         from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
         from sklearn.linear_model import LogisticRegression, LinearRegression
@@ -423,6 +667,10 @@ class ModelTrainer:
             X, y, test_size=test_size, random_state=42
         )
         
+        # Encodings are chosen from the training columns; the stage itself is
+        # fitted inside each candidate and search fold (see with_preprocessing)
+        preprocessor = build_preprocessor(X_train) if isinstance(X_train, pd.DataFrame) else None
+        
         # Select algorithm
         if algorithm == "auto":
             if model_type == "classification":
@@ -439,27 +687,22 @@ class ModelTrainer:
                 }
             
             # Train all models and select best
-            best_score = -float('inf')
-            best_model = None
-            best_algo = None
-            
-            for algo, model in models.items():
-                try:
-                    model.fit(X_train, y_train)
-                    score = model.score(X_test, y_test)
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_model = model
-                        best_algo = algo
-                    
-                    logger.info(f"{algo}: score = {score:.4f}")
-                except Exception as e:
-                    logger.warning(f"Failed to train {algo}: {e}")
+            models = {key: with_preprocessing(preprocessor, m) for key, m in models.items()}
+            results = fit_candidates(models, X_train, y_train, X_test, y_test, time_budget=time_budget)
+            for result in results:
+                if result.status == 'fitted':
+                    logger.info(f"{result.name}: score = {result.score:.4f} ({result.fit_time:.2f}s)")
+                else:
+                    logger.warning(f"Failed to train {result.name}: {result.error or result.status}")
             
-            model = best_model
-            algorithm = best_algo
+            best = best_candidate(results)
+            model = best.estimator
+            algorithm = best.name
+            candidates = [result.to_dict() for result in results]
+            tuning = None
         else:
+            candidates = None
+            tuning = None
             # Use specified algorithm
             if model_type == "classification":
                 if algorithm == "rf":
@@ -484,17 +727,38 @@ class ModelTrainer:
                     'min_samples_split': [2, 5]
                 }
                 
-                grid_search = GridSearchCV(
-                    model, param_grid, cv=cv_folds,
-                    scoring='accuracy' if model_type == 'classification' else 'r2',
-                    n_jobs=-1
-                )
+                scoring = 'accuracy' if model_type == 'classification' else 'r2'
                 
-                grid_search.fit(X_train, y_train)
-                model = grid_search.best_estimator_
-                logger.info(f"Best params: {grid_search.best_params_}")
+                if search == "halving":
+                    result = halving_search(
+                        model, param_grid, X_train, y_train, scoring=scoring,
+                        cv=cv_folds, time_budget=time_budget, preprocessor=preprocessor
+                    )
+                    model = result.best_estimator
+                    tuning = result.to_dict()
+                    logger.info(f"Best params: {result.best_params}")
+                else:
+                    pipeline = with_preprocessing(preprocessor, model)
+                    prefix = f'{MODEL_STEP}__' if pipeline is not model else ''
+                    grid_search = GridSearchCV(
+                        pipeline, {prefix + key: values for key, values in param_grid.items()},
+                        cv=cv_folds,
+                        scoring=scoring,
+                        n_jobs=-1
+                    )
+                    
+                    grid_search.fit(X_train, y_train)
+                    model = grid_search.best_estimator_
+                    best_params = {key[len(prefix):]: value for key, value in grid_search.best_params_.items()}
+                    tuning = {
+                        'search': 'grid',
+                        'best_params': best_params,
+                        'best_score': float(grid_search.best_score_),
+                        'refit_seconds': float(grid_search.refit_time_)
+                    }
+                    logger.info(f"Best params: {best_params}")
             else:
-                model.fit(X_train, y_train)
+                model = with_preprocessing(preprocessor, model).fit(X_train, y_train)
         
         # Register model
         model_id = self.registry.register_model(
@@ -508,7 +772,9 @@ class ModelTrainer:
             model_type=model_type,
             author=kwargs.get('author', 'auto-trainer'),
             description=kwargs.get('description', f'Auto-trained {algorithm} model'),
-            tags=kwargs.get('tags', ['auto-trained', algorithm])
+            tags=kwargs.get('tags', ['auto-trained', algorithm]),
+            candidates=candidates,
+            tuning=tuning
         )
         
         return model_id
\ No newline at end of file
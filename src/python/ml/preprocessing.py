@@ -0,0 +1,116 @@
+"""
+Feature preprocessing
+Builds the ColumnTransformer that is fitted in front of every model:
+numeric columns are median-imputed and standardized, low-cardinality
+categoricals are ordinal-encoded, and high-cardinality ones are hashed into a
+fixed number of buckets. Each step is a column-wise array operation. The
+fitted stage is pickled with the model, so prediction frames get exactly the
+training transform.
+
+The stage learns from the rows it is fitted on (medians, scales, category
+codes), so model selection fits it inside every fold, as the first step of
+a Pipeline, never once on rows that are later scored.
+"""
+
+import os
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, clone
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, OrdinalEncoder, StandardScaler
+
+logger = logging.getLogger(__name__)
+
+# Categoricals with more distinct values than this are hashed instead of ordinal-encoded
+MAX_ORDINAL_CATEGORIES = int(os.getenv('MAX_ORDINAL_CATEGORIES', '50'))
+FEATURE_HASH_BUCKETS = int(os.getenv('FEATURE_HASH_BUCKETS', '1024'))
+
+# Names of the preprocessing and estimator steps in model pipelines
+PREPROCESS_STEP = 'preprocess'
+MODEL_STEP = 'model'
+
+
+def hash_buckets(X, n_buckets: int = FEATURE_HASH_BUCKETS) -> np.ndarray:
+    """
+    Bucket of every value, column by column
+
+    Uses pandas' hash of the string form, which (unlike hash()) is the same in
+    every process. Missing values share one bucket.
+    """
+    frame = pd.DataFrame(X)
+    buckets = np.empty(frame.shape, dtype=float)
+    for i in range(frame.shape[1]):
+        values = frame.iloc[:, i].astype('string').fillna('').to_numpy(dtype=object)
+        buckets[:, i] = pd.util.hash_array(values) % np.uint64(n_buckets)
+    return buckets
+
+
+def feature_columns(df: pd.DataFrame, target_column: Optional[str] = None) -> List[str]:
+    """Columns a model can use: numeric, boolean and categorical (not datetimes)"""
+    usable = df.select_dtypes(include=[np.number, 'bool', 'object', 'category', 'string']).columns
+    return [c for c in usable if c != target_column]
+
+
+def build_preprocessor(X: pd.DataFrame) -> ColumnTransformer:
+    """
+    Unfitted preprocessing stage for the columns of X
+
+    Args:
+        X: Training features; column types and cardinalities pick the encoding
+
+    Returns:
+        ColumnTransformer with pandas output, one output column per input
+        column under the same name
+    """
+    numeric = X.select_dtypes(include=[np.number, 'bool']).columns.tolist()
+    categorical = [c for c in X.columns if c not in numeric]
+    cardinality = X[categorical].nunique()
+    ordinal = [c for c in categorical if cardinality[c] <= MAX_ORDINAL_CATEGORIES]
+    hashed = [c for c in categorical if cardinality[c] > MAX_ORDINAL_CATEGORIES]
+
+    transformers = []
+    if numeric:
+        transformers.append(('numeric', Pipeline([
+            # keep_empty_features: an all-missing column stays (as zeros) so
+            # prediction frames keep the training layout
+            ('impute', SimpleImputer(strategy='median', keep_empty_features=True)),
+            ('scale', StandardScaler())
+        ]), numeric))
+    if ordinal:
+        transformers.append(('ordinal', OrdinalEncoder(
+            handle_unknown='use_encoded_value', unknown_value=-1,
+            encoded_missing_value=-1, dtype=float
+        ), ordinal))
+    if hashed:
+        transformers.append(('hashed', FunctionTransformer(
+            hash_buckets, feature_names_out='one-to-one'
+        ), hashed))
+
+    if not transformers:
+        raise ValueError("No usable feature columns")
+
+    preprocessor = ColumnTransformer(transformers, verbose_feature_names_out=False)
+    return preprocessor.set_output(transform='pandas')
+
+
+def with_preprocessing(preprocessor: Optional[ColumnTransformer], estimator: BaseEstimator) -> BaseEstimator:
+    """
+    Pipeline of a fresh copy of the preprocessing stage and estimator
+
+    Fitting the pipeline fits the stage on the same rows as the estimator,
+    so cross-validation and searches re-fit it per fold. Without a stage
+    (array features) the estimator is returned as is.
+    """
+    if preprocessor is None:
+        return estimator
+    return Pipeline([(PREPROCESS_STEP, clone(preprocessor)), (MODEL_STEP, estimator)])
+
+
+def describe_preprocessor(preprocessor: ColumnTransformer) -> Dict[str, List[str]]:
+    """Columns per encoding ({'numeric', 'ordinal', 'hashed'}), for model metadata"""
+    return {name: list(columns) for name, _, columns in preprocessor.transformers}
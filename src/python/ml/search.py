@@ -0,0 +1,187 @@
+"""
+Successive-halving hyperparameter search
+Every configuration is cross-validated on a small sample of the training
+rows; each rung keeps the best 1/factor of them and multiplies the sample
+size by factor, so only the last few configurations see all the data.
+Rungs stop early once the next one would overrun a wall-clock budget.
+An optional preprocessing stage is fitted with the estimator on every
+fold's training rows.
+"""
+
+import math
+import time
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, clone, is_classifier
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, check_cv
+
+from ml.preprocessing import with_preprocessing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FACTOR = 3
+
+
+@dataclass
+class Rung:
+    """One round of the search"""
+    rung: int
+    n_samples: int
+    n_candidates: int
+    seconds: float
+    best_score: float
+    best_params: Dict[str, Any]
+
+
+@dataclass
+class SearchResult:
+    """Winning configuration (refitted on all rows) and the schedule that found it"""
+    best_params: Dict[str, Any]
+    best_score: float
+    factor: int
+    rungs: List[Rung]
+    stopped_early: bool
+    refit_seconds: float
+    best_estimator: Optional[BaseEstimator] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Everything but the estimator, for model metadata"""
+        return {
+            'search': 'halving',
+            'best_params': self.best_params,
+            'best_score': self.best_score,
+            'factor': self.factor,
+            'rungs': [asdict(rung) for rung in self.rungs],
+            'stopped_early': self.stopped_early,
+            'refit_seconds': self.refit_seconds
+        }
+
+
+def resource_schedule(n_samples: int, n_candidates: int, factor: int, min_samples: int) -> List[int]:
+    """
+    Sample sizes per rung, ending at all rows
+
+    As many rungs as it takes to narrow n_candidates down to one, or as
+    fit between min_samples and n_samples, whichever is fewer.
+    """
+    n_rungs = 1 + math.floor(math.log(max(n_candidates, 1), factor))
+    if min_samples < n_samples:
+        n_rungs = min(n_rungs, 1 + math.floor(math.log(n_samples / min_samples, factor)))
+    else:
+        n_rungs = 1
+    return [max(min_samples, n_samples // factor ** (n_rungs - 1 - i)) for i in range(n_rungs)]
+
+
+def _score_fold(estimator, params, preprocessor, X, y, train, test, scorer) -> float:
+    """Fold score, or NaN when the configuration fails (GridSearchCV's error_score)"""
+    try:
+        model = with_preprocessing(preprocessor, clone(estimator).set_params(**params))
+        model.fit(X.iloc[train], y.iloc[train])
+        return scorer(model, X.iloc[test], y.iloc[test])
+    except Exception as e:
+        logger.warning(f"Halving search fit failed for {params}: {e}")
+        return np.nan
+
+
+def halving_search(
+    estimator: BaseEstimator,
+    param_grid: Dict[str, List[Any]],
+    X: pd.DataFrame,
+    y: pd.Series,
+    scoring: str,
+    cv: int = 5,
+    factor: int = DEFAULT_FACTOR,
+    time_budget: Optional[float] = None,
+    n_jobs: int = -1,
+    random_state: int = 42,
+    preprocessor=None
+) -> SearchResult:
+    """
+    Successive-halving search over a parameter grid
+
+    Args:
+        estimator: Unfitted estimator to tune
+        param_grid: As for GridSearchCV
+        X, y: Training rows
+        scoring: sklearn scorer name
+        cv: Folds per evaluation
+        factor: Candidates kept (1/factor) and sample growth (x factor) per rung
+        time_budget: Seconds for the whole search; rungs that would not fit
+            are skipped and the leader of the last completed rung wins
+        n_jobs: Parallel (candidate, fold) fits per rung
+        random_state: Seed of the row sample order
+        preprocessor: Unfitted stage (see ml.preprocessing) to fit in front
+            of the estimator on each fold's training rows; param_grid and
+            the reported parameters refer to the estimator alone
+
+    Returns:
+        SearchResult with the best configuration refitted on all of X (a
+        Pipeline of the stage and the estimator when preprocessor is given)
+    """
+    start = time.monotonic()
+    X = X.reset_index(drop=True) if isinstance(X, pd.DataFrame) else pd.DataFrame(X)
+    y = y.reset_index(drop=True) if isinstance(y, pd.Series) else pd.Series(y)
+    scorer = get_scorer(scoring)
+    candidates = list(ParameterGrid(param_grid))
+
+    # Smallest sample every class can still be split across the folds with
+    min_samples = 2 * cv * (y.nunique() if is_classifier(estimator) else 1)
+    schedule = resource_schedule(len(X), len(candidates), factor, min_samples)
+    order = np.random.default_rng(random_state).permutation(len(X))
+
+    rungs: List[Rung] = []
+    stopped_early = False
+    for i, n_samples in enumerate(schedule):
+        if rungs and time_budget is not None:
+            # Fit cost grows with the sample and shrinks with the candidate count
+            last = rungs[-1]
+            estimate = last.seconds * (n_samples / last.n_samples) * (len(candidates) / last.n_candidates)
+            if time.monotonic() - start + estimate > time_budget:
+                logger.info(f"Halving search stopped before rung {i}: ~{estimate:.1f}s would exceed the budget")
+                stopped_early = True
+                break
+
+        rung_start = time.monotonic()
+        X_rung = X.iloc[order[:n_samples]].reset_index(drop=True)
+        y_rung = y.iloc[order[:n_samples]].reset_index(drop=True)
+        splits = list(check_cv(cv, y_rung, classifier=is_classifier(estimator)).split(X_rung, y_rung))
+
+        fold_scores = Parallel(n_jobs=n_jobs)(
+            delayed(_score_fold)(estimator, params, preprocessor, X_rung, y_rung, train, test, scorer)
+            for params in candidates for train, test in splits
+        )
+        scores = np.nanmean(np.array(fold_scores, dtype=float).reshape(len(candidates), len(splits)), axis=1)
+        ranking = np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind='stable')
+
+        rungs.append(Rung(
+            rung=i,
+            n_samples=n_samples,
+            n_candidates=len(candidates),
+            seconds=time.monotonic() - rung_start,
+            best_score=float(scores[ranking[0]]),
+            best_params=candidates[ranking[0]]
+        ))
+        logger.info(f"Rung {i}: {len(candidates)} candidates on {n_samples} rows in {rungs[-1].seconds:.2f}s, "
+                    f"best {rungs[-1].best_score:.4f}")
+
+        candidates = [candidates[j] for j in ranking[:max(1, math.ceil(len(candidates) / factor))]]
+
+    best = rungs[-1]
+    refit_start = time.monotonic()
+    best_estimator = with_preprocessing(preprocessor, clone(estimator).set_params(**best.best_params)).fit(X, y)
+
+    return SearchResult(
+        best_params=best.best_params,
+        best_score=best.best_score,
+        factor=factor,
+        rungs=rungs,
+        stopped_early=stopped_early,
+        refit_seconds=time.monotonic() - refit_start,
+        best_estimator=best_estimator
+    )
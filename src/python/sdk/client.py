@@ -9,13 +9,25 @@ import time
 import requests
 import pandas as pd
 import websocket
-from typing import Dict, List, Any, Optional, Union
+from typing import BinaryIO, Dict, List, Any, Optional, Union
 from pathlib import Path
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Binary body formats for bulk prediction; the content types the server's
+# storage.columnar accepts
+ARROW_STREAM_TYPE = 'application/vnd.apache.arrow.stream'
+PARQUET_TYPE = 'application/vnd.apache.parquet'
+COLUMNAR_CONTENT_TYPES = {
+    'arrow': ARROW_STREAM_TYPE,
+    'parquet': PARQUET_TYPE
+}
+
+# Longest single job-status long-poll (the server caps it at 60 seconds)
+JOB_POLL_SECONDS = 30
+
 class APIClient:
     """REST API client for the platform"""
     
@@ -42,9 +54,11 @@ class APIClient:
         endpoint: str,
         data: Dict = None,
         files: Dict = None,
-        params: Dict = None
+        params: Dict = None,
+        content: Union[bytes, BinaryIO] = None,
+        headers: Dict = None
     ) -> requests.Response:
-        """Make HTTP request"""
+        """Make HTTP request (JSON data, or a raw body in content; files are streamed)"""
         url = f"{self.base_url}{endpoint}"
         
         try:
@@ -52,8 +66,10 @@ class APIClient:
                 method=method,
                 url=url,
                 json=data,
+                data=content,
                 files=files,
-                params=params
+                params=params,
+                headers=headers
             )
             response.raise_for_status()
             return response
@@ -98,15 +114,19 @@ class APIClient:
     # === Data Management ===
     
     def upload_file(self, file_path: Union[str, Path]) -> Dict:
-        """Upload data file"""
+        """Upload data file (streamed as the raw request body)"""
         file_path = Path(file_path)
         
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
         with open(file_path, 'rb') as f:
-            files = {'file': (file_path.name, f)}
-            response = self._request('POST', '/api/v1/upload', files=files)
+            response = self._request(
+                'POST', '/api/v1/upload',
+                content=f,
+                params={'filename': file_path.name},
+                headers={'Content-Type': 'application/octet-stream'}
+            )
         
         return response.json()
     
@@ -119,6 +139,11 @@ class APIClient:
         response = self._request('POST', '/api/v1/upload', files=files)
         return response.json()
     
+    def get_session(self, session_id: str) -> Dict:
+        """Get an upload session; row count and final dtypes appear once its status is 'ready'"""
+        response = self._request('GET', f'/api/v1/sessions/{session_id}')
+        return response.json()
+    
     # === Analysis ===
     
     def analyze(
@@ -139,22 +164,25 @@ class APIClient:
         response = self._request('POST', '/api/v1/analyze', data=data)
         return response.json()
     
-    def get_job_status(self, job_id: str) -> Dict:
-        """Get analysis job status"""
-        response = self._request('GET', f'/api/v1/jobs/{job_id}')
+    def get_job_status(self, job_id: str, wait: float = None) -> Dict:
+        """Get analysis job status, waiting up to wait seconds for it to finish"""
+        params = {'wait': wait} if wait else None
+        response = self._request('GET', f'/api/v1/jobs/{job_id}', params=params)
         return response.json()
     
     def wait_for_job(self, job_id: str, timeout: int = 300) -> Dict:
-        """Wait for job completion"""
-        start_time = time.time()
+        """Wait for job completion (long-polls the status endpoint)"""
+        deadline = time.time() + timeout
         
-        while time.time() - start_time < timeout:
-            result = self.get_job_status(job_id)
+        while True:
+            remaining = deadline - time.time()
+            result = self.get_job_status(job_id, wait=min(JOB_POLL_SECONDS, max(remaining, 0)))
             
             if result['status'] in ['completed', 'failed']:
                 return result
             
-            time.sleep(2)
+            if time.time() >= deadline:
+                break
         
         raise TimeoutError(f"Job {job_id} did not complete within {timeout} seconds")
     
@@ -187,9 +215,16 @@ class APIClient:
         algorithm: str = "auto",
         name: str = "model",
         version: str = "1.0",
-        test_size: float = 0.2
+        test_size: float = 0.2,
+        time_budget: float = None,
+        search: str = "halving"
     ) -> Dict:
-        """Train a new model"""
+        """
+        Train a new model
+        
+        time_budget bounds auto mode's candidates and the hyperparameter
+        search; search is "halving" (successive halving) or "grid"
+        """
         data = {
             'session_id': session_id,
             'target': target,
@@ -198,8 +233,11 @@ class APIClient:
             'algorithm': algorithm,
             'name': name,
             'version': version,
-            'test_size': test_size
+            'test_size': test_size,
+            'search': search
         }
+        if time_budget is not None:
+            data['time_budget'] = time_budget
         
         response = self._request('POST', '/api/v1/models/train', data=data)
         return response.json()
@@ -207,9 +245,25 @@ class APIClient:
     def predict(
         self,
         model_id: str,
-        data: Union[Dict, List[Dict], pd.DataFrame]
+        data: Union[Dict, List[Dict], pd.DataFrame],
+        format: str = 'json'
     ) -> Dict:
-        """Make predictions using a model"""
+        """
+        Make predictions using a model
+        
+        Args:
+            model_id: Registered model
+            data: Row, rows or DataFrame of features
+            format: 'json', or 'arrow'/'parquet' to send and receive column
+                buffers (requires pyarrow; much faster for bulk requests)
+        
+        Returns:
+            Response dict; for columnar formats predictions and
+            probabilities are NumPy arrays
+        """
+        if format in COLUMNAR_CONTENT_TYPES:
+            return self._predict_columnar(model_id, data, COLUMNAR_CONTENT_TYPES[format])
+        
         if isinstance(data, pd.DataFrame):
             data = data.to_dict('records')
         
@@ -218,6 +272,51 @@ class APIClient:
         response = self._request('POST', f'/api/v1/models/{model_id}/predict', data=request_data)
         return response.json()
     
+    def _predict_columnar(
+        self,
+        model_id: str,
+        data: Union[Dict, List[Dict], pd.DataFrame],
+        content_type: str
+    ) -> Dict:
+        """Predict with Arrow IPC or Parquet request and response bodies (requires pyarrow)"""
+        # Imported here so JSON-only callers don't need pyarrow
+        import pyarrow as pa
+        import pyarrow.ipc as pa_ipc
+        import pyarrow.parquet as pq
+        
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(data if isinstance(data, list) else [data])
+        
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        if content_type == ARROW_STREAM_TYPE:
+            with pa_ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            pq.write_table(table, sink)
+        
+        response = self._request(
+            'POST', f'/api/v1/models/{model_id}/predict',
+            content=sink.getvalue().to_pybytes(),
+            headers={'Content-Type': content_type, 'Accept': content_type}
+        )
+        
+        body = pa.BufferReader(response.content)
+        if content_type == ARROW_STREAM_TYPE:
+            frame = pa_ipc.open_stream(body).read_all().to_pandas()
+        else:
+            frame = pq.read_table(body).to_pandas()
+        probability_columns = [c for c in frame.columns if c.startswith('probability_')]
+        
+        return {
+            'predictions': frame['prediction'].to_numpy(),
+            'probabilities': frame[probability_columns].to_numpy() if probability_columns else None,
+            'batch_size': int(response.headers.get('X-Batch-Size', len(frame))),
+            'model_id': response.headers.get('X-Model-Id', model_id),
+            'model_name': response.headers.get('X-Model-Name'),
+            'model_version': response.headers.get('X-Model-Version')
+        }
+    
     def promote_model(self, model_id: str, status: str) -> Dict:
         """Promote model to new status"""
         data = {'status': status}
@@ -0,0 +1,35 @@
+from .lru import ByteBudgetLRU, file_version
+from .dataset_cache import DatasetCache, get_dataset_cache, load_dataset, read_dataset
+from .ingestion import IngestedDataset, UploadInspection, ingest_file, inspect_upload, read_preview
+from .shared_frame import SharedFrame, SharedFrameHandle, share_frame, attach_frame
+from .fingerprint import data_fingerprint, file_fingerprint
+from .result_cache import ResultCache, get_result_cache, make_result_key
+from .columnar import ARROW_STREAM_TYPE, PARQUET_TYPE, columnar_type, decode_frame, encode_frame
+
+__all__ = [
+    'ByteBudgetLRU',
+    'file_version',
+    'DatasetCache',
+    'get_dataset_cache',
+    'load_dataset',
+    'read_dataset',
+    'IngestedDataset',
+    'UploadInspection',
+    'ingest_file',
+    'inspect_upload',
+    'read_preview',
+    'SharedFrame',
+    'SharedFrameHandle',
+    'share_frame',
+    'attach_frame',
+    'data_fingerprint',
+    'file_fingerprint',
+    'ResultCache',
+    'get_result_cache',
+    'make_result_key',
+    'ARROW_STREAM_TYPE',
+    'PARQUET_TYPE',
+    'columnar_type',
+    'decode_frame',
+    'encode_frame'
+]
@@ -0,0 +1,62 @@
+"""
+Columnar request/response bodies
+Arrow IPC stream and Parquet encodings of DataFrames for HTTP bodies, so
+bulk endpoints exchange column buffers instead of per-row JSON objects
+"""
+
+import logging
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM_TYPE = 'application/vnd.apache.arrow.stream'
+PARQUET_TYPE = 'application/vnd.apache.parquet'
+COLUMNAR_TYPES = (ARROW_STREAM_TYPE, PARQUET_TYPE)
+
+
+def columnar_type(mimetype: Optional[str]) -> Optional[str]:
+    """The columnar content type named by a mimetype, or None for anything else"""
+    return mimetype if mimetype in COLUMNAR_TYPES else None
+
+
+def decode_frame(body: bytes, content_type: str) -> pd.DataFrame:
+    """Read an Arrow IPC stream or Parquet body into a DataFrame"""
+    if pa is None:
+        raise ImportError("pyarrow is required for columnar bodies")
+
+    if content_type == ARROW_STREAM_TYPE:
+        table = pa_ipc.open_stream(pa.BufferReader(body)).read_all()
+    elif content_type == PARQUET_TYPE:
+        table = pq.read_table(pa.BufferReader(body))
+    else:
+        raise ValueError(f"Unsupported content type: {content_type}")
+
+    return table.to_pandas()
+
+
+def encode_frame(df: pd.DataFrame, content_type: str) -> bytes:
+    """Write a DataFrame (without its index) as an Arrow IPC stream or Parquet body"""
+    if pa is None:
+        raise ImportError("pyarrow is required for columnar bodies")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+
+    if content_type == ARROW_STREAM_TYPE:
+        with pa_ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif content_type == PARQUET_TYPE:
+        pq.write_table(table, sink)
+    else:
+        raise ValueError(f"Unsupported content type: {content_type}")
+
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,117 @@
+"""
+Process-wide dataset cache
+Keeps parsed DataFrames in memory so agents don't re-read the same file per task
+"""
+
+import os
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .lru import ByteBudgetLRU, file_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_BYTES = int(os.getenv('DATASET_CACHE_BYTES', 2 * 1024**3))  # 2GB
+
+# (resolved path, mtime in ns, size in bytes, projected columns)
+CacheKey = Tuple[str, int, int, Optional[Tuple[str, ...]]]
+
+
+def read_dataset(path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a dataset from disk, picking the reader from the file suffix
+
+    Columnar formats (Parquet/Feather) only read the requested columns;
+    row formats are parsed fully and then projected.
+    """
+    path = Path(path)
+
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path, columns=columns)
+    elif path.suffix == '.feather':
+        return pd.read_feather(path, columns=columns)
+
+    if path.suffix == '.csv':
+        df = pd.read_csv(path, usecols=columns)
+    elif path.suffix in ['.xlsx', '.xls']:
+        df = pd.read_excel(path, usecols=columns)
+    elif path.suffix == '.json':
+        df = pd.read_json(path)
+    else:
+        raise ValueError(f"Unsupported file format: {path.suffix}")
+
+    return df[columns] if columns else df
+
+
+class DatasetCache:
+    """
+    LRU cache of parsed datasets with a byte budget.
+
+    Entries are keyed by path + mtime + size (plus the projected columns),
+    so a file that is rewritten on disk is re-read on next access. Cached
+    frames are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_BUDGET_BYTES):
+        self._store = ByteBudgetLRU(max_bytes, kind="Dataset")
+
+    @property
+    def max_bytes(self) -> int:
+        return self._store.max_bytes
+
+    @staticmethod
+    def make_key(path: Union[str, Path], columns: Optional[List[str]] = None) -> CacheKey:
+        """Build the cache key for a file on disk"""
+        projection = tuple(columns) if columns else None
+        return (*file_version(path), projection)
+
+    def get(self, path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Return the parsed dataset at ``path``, reading it on a miss"""
+        key = self.make_key(path, columns)
+        frame = self._store.get(key)
+        if frame is not None:
+            return frame
+
+        # Parse outside the lock so other datasets can be served meanwhile
+        frame = read_dataset(path, columns)
+        self.put(key, frame)
+        return frame
+
+    def put(self, key: CacheKey, frame: pd.DataFrame) -> None:
+        """Insert a frame, evicting least recently used entries over budget"""
+        self._store.put(key, frame, int(frame.memory_usage(deep=True).sum()))
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """Drop every cached version of ``path``"""
+        self._store.invalidate(path)
+
+    def clear(self) -> None:
+        """Drop all cached datasets and reset counters"""
+        self._store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for sizing the budget"""
+        return self._store.get_stats()
+
+
+_default_cache: Optional[DatasetCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_dataset_cache() -> DatasetCache:
+    """Get the process-wide dataset cache"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = DatasetCache()
+    return _default_cache
+
+
+def load_dataset(path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load a dataset (optionally a column subset) through the process-wide cache"""
+    return get_dataset_cache().get(path, columns)
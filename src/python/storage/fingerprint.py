@@ -0,0 +1,134 @@
+"""
+Dataset fingerprints
+Stable content identities for DataFrames, arrays and data files, used to
+key caches of results computed from them and to record model lineage
+
+Plain NumPy columns (numbers, booleans, datetimes) are hashed straight from
+their memory; other columns go through pd.util.hash_pandas_object. The
+digest is xxh3-128 when xxhash is installed, SHA-256 otherwise.
+
+Collision policy: full fingerprints cover the schema, shape, index and
+every value, so equal fingerprints mean equal data up to the hash's own
+collision odds. Sampled fingerprints (sample_rows) only cover the schema,
+shape and an evenly spaced subset of rows; they carry a 'sampled-' prefix
+so they never match a full fingerprint, and must not key cached results,
+since an edit outside the sampled rows goes unnoticed.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Files are hashed once per (resolved path, size, mtime)
+_file_fingerprints: Dict[Tuple[str, int, int], str] = {}
+_file_lock = threading.Lock()
+
+FILE_BLOCK_SIZE = 1024 * 1024
+SAMPLED_PREFIX = 'sampled-'
+
+# Dtype kinds whose memory is the value: bool, ints, floats, complex, datetimes
+RAW_KINDS = 'biufcmM'
+
+
+def _hasher():
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.sha256()
+
+
+def _update_values(digest, values: Union[pd.Series, pd.Index]):
+    """Feed one column (or the index) into the digest"""
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in RAW_KINDS:
+        digest.update(np.ascontiguousarray(values.to_numpy()).view(np.uint8))
+    elif isinstance(values, pd.Index):
+        digest.update(pd.util.hash_pandas_object(values).to_numpy())
+    else:
+        digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy())
+
+
+def _sample_positions(rows: int, sample_rows: Optional[int]) -> Optional[np.ndarray]:
+    """Evenly spaced row positions (first and last included), or None for all rows"""
+    if not sample_rows or rows <= sample_rows:
+        return None
+    return np.unique(np.linspace(0, rows - 1, sample_rows).astype(np.int64))
+
+
+def data_fingerprint(
+    data: Union[pd.DataFrame, pd.Series, np.ndarray],
+    sample_rows: Optional[int] = None
+) -> str:
+    """
+    Content fingerprint of a DataFrame, Series or array
+
+    Args:
+        data: Data to identify
+        sample_rows: Hash only this many evenly spaced rows of larger data
+            (see the collision policy above)
+
+    Returns:
+        Hex digest, prefixed with 'sampled-' when rows were sampled
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    elif not isinstance(data, pd.DataFrame):
+        data = np.asarray(data)
+        if data.dtype.kind not in RAW_KINDS:
+            data = pd.DataFrame(data.reshape(len(data), -1))
+
+    positions = _sample_positions(len(data), sample_rows)
+    digest = _hasher()
+
+    if isinstance(data, np.ndarray):
+        digest.update(json.dumps(['ndarray', data.shape, data.dtype.str]).encode())
+        if positions is not None:
+            data = data[positions]
+        digest.update(np.ascontiguousarray(data).reshape(-1).view(np.uint8))
+    else:
+        index = data.index
+        schema = {
+            'shape': data.shape,
+            'columns': [[str(col), str(dtype)] for col, dtype in data.dtypes.items()],
+            'index': [index.start, index.stop, index.step]
+            if isinstance(index, pd.RangeIndex) else str(index.dtype)
+        }
+        digest.update(json.dumps(schema).encode())
+
+        if positions is not None:
+            data = data.iloc[positions]
+        for i in range(data.shape[1]):
+            _update_values(digest, data.iloc[:, i])
+        if not isinstance(index, pd.RangeIndex):
+            _update_values(digest, data.index)
+
+    prefix = SAMPLED_PREFIX if positions is not None else ''
+    return prefix + digest.hexdigest()
+
+
+def file_fingerprint(path: Union[str, Path]) -> str:
+    """Digest of a file's bytes, memoized until the file changes"""
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+
+    with _file_lock:
+        if key in _file_fingerprints:
+            return _file_fingerprints[key]
+
+    digest = _hasher()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(FILE_BLOCK_SIZE), b''):
+            digest.update(block)
+
+    with _file_lock:
+        _file_fingerprints[key] = digest.hexdigest()
+    return _file_fingerprints[key]
@@ -0,0 +1,210 @@
+"""
+Columnar ingestion tier
+Converts uploaded CSV/XLSX/JSON files once into a typed Parquet copy so later
+loaders can read only the columns they need
+"""
+
+import logging
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from .dataset_cache import read_dataset
+
+logger = logging.getLogger(__name__)
+
+PARQUET_SUFFIX = '.parquet'
+
+
+@dataclass
+class IngestedDataset:
+    """Result of converting an upload to its columnar copy"""
+    source_path: str
+    dataset_path: str  # Path loaders should read (Parquet copy or the original)
+    rows: int
+    columns: List[str]
+    schema: Dict[str, str]  # column -> Arrow type
+    columnar: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class UploadInspection:
+    """Schema and preview of an upload read from its leading block only"""
+    preview: pd.DataFrame
+    columns: List[str]
+    schema: Dict[str, str]  # Inferred from the leading block; ingest_file has the final types
+    rows: Optional[int]  # None unless known without reading the whole file
+
+
+def columnar_path_for(source_path: Union[str, Path]) -> Path:
+    """Location of the Parquet copy stored next to an upload"""
+    source_path = Path(source_path)
+    return source_path.with_name(source_path.name + PARQUET_SUFFIX)
+
+
+def ingest_file(source_path: Union[str, Path]) -> IngestedDataset:
+    """
+    Convert an uploaded file into a typed Parquet file alongside the original.
+
+    CSVs are streamed through Arrow's CSV reader batch by batch, so the file
+    never has to be fully materialized as a pandas frame. Files that are
+    already Parquet, or environments without pyarrow, are used as-is.
+    """
+    source_path = Path(source_path)
+
+    if pa is None:
+        logger.warning("pyarrow not installed - uploads will be read from the original file")
+        return _describe_without_conversion(source_path)
+
+    try:
+        target_path = _convert_to_parquet(source_path)
+    except Exception as e:
+        logger.warning(f"Columnar conversion of {source_path.name} failed, using original file: {e}")
+        return _describe_without_conversion(source_path)
+
+    metadata = pq.ParquetFile(target_path)
+    schema = metadata.schema_arrow
+
+    return IngestedDataset(
+        source_path=str(source_path),
+        dataset_path=str(target_path),
+        rows=metadata.metadata.num_rows,
+        columns=list(schema.names),
+        schema={field.name: str(field.type) for field in schema},
+        columnar=True
+    )
+
+
+def inspect_upload(source_path: Union[str, Path], n_rows: int = 5) -> UploadInspection:
+    """
+    Columns, provisional schema and first rows of an upload, cheap enough to
+    answer the upload request with while ingest_file runs in the background.
+
+    CSVs are read one Arrow block (or n_rows with pandas) from the start of
+    the file; Parquet answers from its footer. Excel and JSON have no
+    incremental reader and are parsed in full.
+    """
+    source_path = Path(source_path)
+
+    if source_path.suffix == '.csv':
+        if pa is not None:
+            reader = pa_csv.open_csv(str(source_path))
+            first = next(iter(reader), None)
+            schema = reader.schema
+            preview = first.slice(0, n_rows).to_pandas() if first is not None else schema.empty_table().to_pandas()
+            return UploadInspection(
+                preview=preview,
+                columns=list(schema.names),
+                schema={field.name: str(field.type) for field in schema},
+                rows=None
+            )
+        preview = pd.read_csv(source_path, nrows=n_rows)
+        return UploadInspection(
+            preview=preview,
+            columns=[str(c) for c in preview.columns],
+            schema=preview.dtypes.astype(str).to_dict(),
+            rows=None
+        )
+
+    if pa is not None and source_path.suffix == PARQUET_SUFFIX:
+        metadata = pq.ParquetFile(source_path)
+        schema = metadata.schema_arrow
+        return UploadInspection(
+            preview=read_preview(source_path, n_rows),
+            columns=list(schema.names),
+            schema={field.name: str(field.type) for field in schema},
+            rows=metadata.metadata.num_rows
+        )
+
+    df = read_dataset(source_path)
+    return UploadInspection(
+        preview=df.head(n_rows),
+        columns=[str(c) for c in df.columns],
+        schema=df.dtypes.astype(str).to_dict(),
+        rows=len(df)
+    )
+
+
+def read_preview(dataset_path: Union[str, Path], n_rows: int = 5) -> pd.DataFrame:
+    """Read the first rows of a dataset without loading the whole file"""
+    dataset_path = Path(dataset_path)
+
+    if pa is not None and dataset_path.suffix == PARQUET_SUFFIX:
+        batches = pq.ParquetFile(dataset_path).iter_batches(batch_size=n_rows)
+        first = next(batches, None)
+        if first is None:
+            return pd.DataFrame()
+        return first.to_pandas()
+
+    if dataset_path.suffix == '.csv':
+        return pd.read_csv(dataset_path, nrows=n_rows)
+
+    return read_dataset(dataset_path).head(n_rows)
+
+
+def _convert_to_parquet(source_path: Path) -> Path:
+    """Write the Parquet copy of an upload and return its path"""
+    if source_path.suffix == PARQUET_SUFFIX:
+        return source_path
+
+    target_path = columnar_path_for(source_path)
+    if source_path.suffix == '.csv':
+        try:
+            _stream_csv_to_parquet(source_path, target_path)
+        except pa.ArrowInvalid as e:
+            # Types inferred from the first block can be wrong for later
+            # blocks (e.g. ints that turn into floats); let pandas decide.
+            logger.info(f"Streaming conversion of {source_path.name} failed ({e}), retrying with pandas")
+            read_dataset(source_path).to_parquet(target_path, index=False)
+    else:
+        read_dataset(source_path).to_parquet(target_path, index=False)
+    return target_path
+
+
+def _describe_without_conversion(source_path: Path) -> IngestedDataset:
+    """Describe an upload that stays in its original format"""
+    df = read_dataset(source_path)
+    return IngestedDataset(
+        source_path=str(source_path),
+        dataset_path=str(source_path),
+        rows=len(df),
+        columns=[str(c) for c in df.columns],
+        schema=df.dtypes.astype(str).to_dict(),
+        columnar=False
+    )
+
+
+def _stream_csv_to_parquet(source_path: Path, target_path: Path) -> None:
+    """Convert a CSV to Parquet one record batch at a time"""
+    reader = pa_csv.open_csv(str(source_path))
+    writer = None
+    try:
+        for batch in reader:
+            if writer is None:
+                writer = pq.ParquetWriter(str(target_path), batch.schema)
+            writer.write_batch(batch)
+        if writer is None:
+            # Header-only file
+            pq.write_table(pa.Table.from_batches([], schema=reader.schema), str(target_path))
+    except Exception:
+        if writer is not None:
+            writer.close()
+            writer = None
+        target_path.unlink(missing_ok=True)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+
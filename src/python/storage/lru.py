@@ -0,0 +1,122 @@
+"""
+Byte-budget LRU store
+Shared by the in-memory caches of file-backed objects (parsed datasets,
+loaded models): entries carry a byte cost and the least recently used ones
+are evicted once the total exceeds the budget
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# (resolved path, mtime in ns, size in bytes, ...): leading fields every key shares
+FileKey = Tuple[Any, ...]
+
+
+def file_version(path: Union[str, Path]) -> Tuple[str, int, int]:
+    """Resolved path, mtime and size identifying the current version of a file"""
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    return str(resolved), stat.st_mtime_ns, stat.st_size
+
+
+@dataclass
+class _Entry:
+    """A cached value and its cost against the budget"""
+    value: Any
+    nbytes: int
+
+
+class ByteBudgetLRU:
+    """
+    Thread-safe LRU map of file-versioned keys with a byte budget
+
+    Keys start with the fields of file_version(); storing a key drops every
+    other version of the same file. Lookups and inserts are cheap, so
+    callers load values outside the lock and put() them afterwards.
+    """
+
+    def __init__(self, max_bytes: int, kind: str = "Entry"):
+        self.max_bytes = max_bytes
+        self.kind = kind
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: FileKey) -> Optional[Any]:
+        """Cached value for key (marked most recently used), or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: FileKey, value: Any, nbytes: int) -> None:
+        """Insert a value, evicting least recently used entries over budget"""
+        with self._lock:
+            # Drop stale versions of the same file (and a concurrent insert of this key)
+            stale = [k for k in self._entries
+                     if k == key or (k[0] == key[0] and k[1:3] != key[1:3])]
+            for old_key in stale:
+                self._remove(old_key)
+
+            if nbytes > self.max_bytes:
+                logger.info(f"{self.kind} {key[0]} ({nbytes} bytes) exceeds cache budget, not cached")
+                return
+
+            self._entries[key] = _Entry(value=value, nbytes=nbytes)
+            self._current_bytes += nbytes
+
+            while self._current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def __contains__(self, key: FileKey) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """Drop every cached version of ``path``"""
+        resolved = str(Path(path).resolve())
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == resolved]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def _remove(self, key: FileKey) -> None:
+        entry = self._entries.pop(key)
+        self._current_bytes -= entry.nbytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for sizing the budget"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,164 @@
+"""
+Content-addressed task result cache
+Results are stored on disk under a key derived from the dataset
+fingerprint, task type, parameters and code version, so re-running a plan
+(or an overlapping one) on unchanged data skips the computation
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Used by get_result_cache(); WorkflowManager keeps its own cache in its workspace
+DEFAULT_RESULT_CACHE_DIR = os.getenv(
+    'RESULT_CACHE_DIR',
+    str(Path.home() / '.cache' / 'ai_data_analysis' / 'result_cache')
+)
+DEFAULT_RESULT_CACHE_BYTES = int(os.getenv('RESULT_CACHE_BYTES', 512 * 1024**2))  # 512MB
+
+ENTRY_SUFFIX = '.pkl'
+
+
+def make_result_key(fingerprint: str, task_type: str, parameters: Any, code_version: str) -> str:
+    """Stable key for a result; parameters must be JSON-serialisable (falls back to str)"""
+    payload = json.dumps(
+        [fingerprint, task_type, parameters, code_version],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk result store with size-based LRU eviction
+
+    Entries are pickled result dicts in <directory>/<key[:2]>/<key>.pkl;
+    reads bump the file mtime, which orders eviction.
+    """
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_RESULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_RESULT_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes = sum(p.stat().st_size for p in self._entries())
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+    def _entries(self):
+        return self.directory.glob(f"*/*{ENTRY_SUFFIX}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored result for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except Exception as e:
+            # Truncated or unreadable entry: treat as a miss and drop it
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            self.invalidate(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store a result, evicting least recently used entries over the budget"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+
+        # Write then rename so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+
+        with self._lock:
+            previous = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            self._bytes += len(data) - previous
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop oldest entries until under budget (lock held)"""
+        entries = []
+        for p in self._entries():
+            try:
+                stat = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, p))
+
+        self._bytes = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if self._bytes <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            self._bytes -= size
+            self.evictions += 1
+
+    def invalidate(self, key: str):
+        path = self._path(key)
+        with self._lock:
+            if path.exists():
+                self._bytes -= path.stat().st_size
+                path.unlink(missing_ok=True)
+
+    def clear(self):
+        with self._lock:
+            for p in self._entries():
+                p.unlink(missing_ok=True)
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'directory': str(self.directory),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache under RESULT_CACHE_DIR"""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+        return _result_cache
@@ -0,0 +1,149 @@
+"""
+Shared DataFrame handoff between processes
+Writes a frame once as an Arrow IPC file in shared memory (/dev/shm where
+available) so worker processes can map it and rebuild a read-only DataFrame
+without pickling or copying the numeric columns
+"""
+
+import json
+import logging
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+SHARED_DIR = Path('/dev/shm') if Path('/dev/shm').is_dir() else Path(tempfile.gettempdir())
+
+# Schema metadata key listing the columns that hold the original index
+INDEX_METADATA_KEY = b'shared_frame_index'
+
+
+@dataclass
+class SharedFrameHandle:
+    """Lightweight, picklable reference to a shared frame"""
+    path: str
+    rows: int
+    columns: List[str]
+    nbytes: int
+
+    def attach(self) -> pd.DataFrame:
+        """Map the shared file and rebuild the frame (read-only numeric columns)"""
+        return attach_frame(self.path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SharedFrameHandle':
+        return cls(**data)
+
+
+class SharedFrame:
+    """
+    Owner side of a shared frame
+
+    The file is removed by close(); processes that already mapped it keep
+    a valid view until they drop it.
+    """
+
+    def __init__(self, data: pd.DataFrame, directory: Optional[Path] = None):
+        if pa is None:
+            raise ImportError("pyarrow is required for shared frames")
+
+        directory = Path(directory) if directory else SHARED_DIR
+        path = directory / f"shared_frame_{os.getpid()}_{uuid.uuid4().hex}.arrow"
+
+        table = _to_table(data)
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        self.handle = SharedFrameHandle(
+            path=str(path),
+            rows=len(data),
+            columns=[str(col) for col in data.columns],
+            nbytes=table.nbytes
+        )
+        logger.debug(f"Shared {len(data)} rows ({table.nbytes / 1024**2:.1f} MB) at {path}")
+
+    def close(self):
+        Path(self.handle.path).unlink(missing_ok=True)
+
+    def __enter__(self) -> 'SharedFrame':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def share_frame(data: pd.DataFrame) -> SharedFrame:
+    """Place a frame in shared memory; use as a context manager or close() it"""
+    return SharedFrame(data)
+
+
+def attach_frame(handle: Union[SharedFrameHandle, Dict[str, Any], str]) -> pd.DataFrame:
+    """Rebuild a DataFrame from a handle, its dict form or the shared file path"""
+    if pa is None:
+        raise ImportError("pyarrow is required for shared frames")
+
+    if isinstance(handle, SharedFrameHandle):
+        path = handle.path
+    elif isinstance(handle, dict):
+        path = handle['path']
+    else:
+        path = str(handle)
+
+    # Buffers reference the mapping, so the view outlives the owner's unlink
+    table = pa_ipc.open_file(pa.memory_map(path)).read_all()
+
+    metadata = table.schema.metadata or {}
+    index_columns = json.loads(metadata[INDEX_METADATA_KEY]) if INDEX_METADATA_KEY in metadata else []
+    if not index_columns:
+        return table.to_pandas(split_blocks=True)
+
+    # set_index() would copy every column; build the index on its own and
+    # attach it to the zero-copy column blocks instead
+    value_columns = [name for name in table.column_names if name not in index_columns]
+    frame = table.select(value_columns).to_pandas(split_blocks=True)
+    levels = table.select(index_columns).to_pandas()
+    names = [None if name.startswith('__index_level_') else name for name in index_columns]
+    if len(index_columns) == 1:
+        frame.index = pd.Index(levels.iloc[:, 0].to_numpy(), name=names[0])
+    else:
+        frame.index = pd.MultiIndex.from_frame(levels, names=names)
+    return frame
+
+
+def _to_table(data: pd.DataFrame) -> 'pa.Table':
+    """Arrow table whose numeric columns convert back to pandas without a copy"""
+    index_columns = []
+    if not isinstance(data.index, pd.RangeIndex) or data.index.start != 0 or data.index.step != 1:
+        index_columns = [
+            name if name is not None else f"__index_level_{i}__"
+            for i, name in enumerate(data.index.names)
+        ]
+        data = data.rename_axis(index_columns).reset_index()
+
+    arrays = []
+    for col in data.columns:
+        series = data[col]
+        if series.dtype.kind in 'iuf':
+            # Keep NaN as a value: a validity bitmap would force a copy on read
+            arrays.append(pa.array(series.to_numpy()))
+        else:
+            arrays.append(pa.array(series, from_pandas=True))
+
+    metadata = {INDEX_METADATA_KEY: json.dumps(index_columns).encode()} if index_columns else None
+    return pa.Table.from_arrays(arrays, names=[str(col) for col in data.columns], metadata=metadata)
@@ -5,8 +5,12 @@ to automated Marimo analysis and results aggregation
 """
 
 import json
+import time
+import hashlib
 import uuid
+import textwrap
 import logging
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
@@ -14,7 +18,7 @@ from dataclasses import dataclass, asdict, field
 from enum import Enum
 import pandas as pd
 import asyncio
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 
 # Add parent directory to path
 import sys
@@ -22,13 +26,16 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from agents import DataAnalysisAgent, MLAgent, VisualizationAgent
 from agents.orchestrator import AgentOrchestrator
-from marimo_integration import NotebookRunner, NotebookBuilder
+from marimo_integration import NotebookRunner, NotebookBuilder, NotebookWorkerPool
 from marimo_integration.simple_notebook import create_working_marimo_notebook
+from storage import load_dataset, share_frame, file_fingerprint, make_result_key, ResultCache
 
 class SimpleNotebookGenerator:
     """Wrapper for notebook generation"""
     def generate_notebook(self, data_path: str, analysis_type: str, output_var: str, additional_code: str = "") -> str:
         """Generate a Marimo notebook with the specified analysis"""
+        # Analysis code is written flush-left by callers; it must sit inside the cell body
+        additional_code = textwrap.indent(textwrap.dedent(additional_code).strip(), '    ')
         notebook_content = f'''import marimo as mo
 
 app = mo.App()
@@ -49,15 +56,24 @@ def __():
 
 @app.cell
 def __(pd):
-    # Load data
-    df = pd.read_csv('{data_path}')
+    # Load data, mapping the plan's shared frame when the runner provides one
+    import os as _os
+    df = None
+    if _os.environ.get('SHARED_FRAME'):
+        try:
+            from storage import attach_frame
+            df = attach_frame(_os.environ['SHARED_FRAME'])
+        except Exception as _e:
+            print(f"Shared frame unavailable ({{_e}}), reading the data file")
+    if df is None:
+        df = pd.read_csv('{data_path}')
     print(f"Loaded {{len(df)}} rows and {{len(df.columns)}} columns")
     return df,
 
 @app.cell  
 def __(df, pd, np, plt, sns, stats):
     # Analysis code
-    {additional_code}
+{additional_code}
     
     # Return the output variable
     return {output_var},
@@ -175,7 +191,22 @@ class AnalysisPlan:
 class WorkflowManager:
     """Manages the complete workflow from planning to results"""
     
-    def __init__(self, workspace_path: str = "./workflow_workspace"):
+    def __init__(
+        self,
+        workspace_path: str = "./workflow_workspace",
+        isolate_notebooks: bool = False,
+        max_concurrent_tasks: int = 4,
+        max_tasks_per_user: int = 2
+    ):
+        """
+        Args:
+            workspace_path: Directory for plans, tasks, notebooks and results
+            isolate_notebooks: Run every notebook in a warm worker process;
+                otherwise only notebooks that would wait for the in-process
+                runner are sent to the worker pool
+            max_concurrent_tasks: Tasks running at the same time, across plans
+            max_tasks_per_user: Running tasks per assignee, across plans
+        """
         self.workspace_path = Path(workspace_path)
         self.workspace_path.mkdir(parents=True, exist_ok=True)
         
@@ -199,9 +230,29 @@ class WorkflowManager:
         self.notebook_generator = SimpleNotebookGenerator()
         self.orchestrator = AgentOrchestrator()
         
-        # Task queue
+        # Data sources shared while any running plan uses them: path -> shared file,
+        # with the frames and the number of plans holding each
+        self.shared_frames: Dict[str, str] = {}
+        self._shares: Dict[str, Any] = {}
+        self._share_refs: Dict[str, int] = {}
+        self._shares_lock = threading.Lock()
+        
+        # Notebook results keyed by data, task type, parameters and notebook source
+        self.result_cache = ResultCache(self.workspace_path / "result_cache")
+        
+        # Task queue; isolated notebooks run in warm worker processes (started on first use)
         self.task_queue: List[str] = []
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.isolate_notebooks = isolate_notebooks
+        self.max_concurrent_tasks = max_concurrent_tasks
+        self.max_tasks_per_user = max_tasks_per_user
+        self.executor = NotebookWorkerPool(max_workers=max_concurrent_tasks)
+        
+        # Manager-wide task slots (global and per assignee) shared by all plans
+        self._slots = threading.Condition()
+        self._running_tasks = 0
+        self._running_per_user: Dict[str, int] = {}
+        # The in-process runner executes one notebook at a time
+        self._in_process_busy = threading.Lock()
     
     # === User Management ===
     
@@ -921,12 +972,41 @@ print(f"Created {num_plots} visualizations")
     # === Task Execution ===
     
     async def execute_task(self, task_id: str) -> Dict[str, Any]:
-        """Execute a task by running its Marimo notebook"""
+        """Execute a task without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run_task, task_id)
+    
+    def run_task(self, task_id: str) -> Dict[str, Any]:
+        """Execute a task by running its Marimo notebook (blocking)"""
         if task_id not in self.tasks:
             return {'error': 'Task not found'}
         
         task = self.tasks[task_id]
-        
+        self._acquire_slot(task.assigned_to)
+        try:
+            return self._run_task(task)
+        finally:
+            self._release_slot(task.assigned_to)
+    
+    def _acquire_slot(self, user: Optional[str]):
+        """Wait for a free task slot, globally and for the assignee"""
+        with self._slots:
+            self._slots.wait_for(lambda: (
+                self._running_tasks < self.max_concurrent_tasks
+                and (not user or self._running_per_user.get(user, 0) < self.max_tasks_per_user)
+            ))
+            self._running_tasks += 1
+            if user:
+                self._running_per_user[user] = self._running_per_user.get(user, 0) + 1
+    
+    def _release_slot(self, user: Optional[str]):
+        with self._slots:
+            self._running_tasks -= 1
+            if user:
+                self._running_per_user[user] -= 1
+            self._slots.notify_all()
+    
+    def _run_task(self, task: AnalysisTask) -> Dict[str, Any]:
         try:
             # Update status
             task.status = TaskStatus.IN_PROGRESS
@@ -938,33 +1018,32 @@ print(f"Created {num_plots} visualizations")
             
             # Update status
             task.status = TaskStatus.MARIMO_RUNNING
+            start_time = time.perf_counter()
+            source = Path(task.marimo_notebook_path).read_text()
+            
+            cache_key = self._result_key(task, source)
+            cached = self.result_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                logger.info(f"Task {task.id} served from result cache")
+                return self._finish_task(task, {'results': cached}, start_time, cache_hit=True)
             
             # Run notebook
             logger.info(f"Running Marimo notebook for task {task.id}")
-            result = self.notebook_runner.run_notebook(
-                task.marimo_notebook_path,
-                inputs={'task_id': task.id, 'parameters': task.parameters}
-            )
+            inputs = {'task_id': task.id, 'parameters': task.parameters}
+            shared_path = self.shared_frames.get(task.data_source)
+            if shared_path:
+                # data_source is the fallback if the share cannot be mapped
+                inputs.update(shared_frame=shared_path, data_source=task.data_source)
             
-            # Process results
-            if 'error' in result:
-                task.status = TaskStatus.FAILED
-                task.error = result['error']
-                logger.error(f"Task {task.id} failed: {result['error']}")
-            else:
-                task.status = TaskStatus.COMPLETED
-                task.completed_at = datetime.now()
-                task.results = result.get('output', {})
-                
-                # Save results
-                self._save_task_results(task)
-                logger.info(f"Task {task.id} completed successfully")
+            result = self._run_notebook(task, source, inputs)
             
-            # Update user workload
-            if task.assigned_to and task.assigned_to in self.users:
-                self.users[task.assigned_to].workload = max(0, self.users[task.assigned_to].workload - 1)
+            if cache_key and 'error' not in result:
+                try:
+                    self.result_cache.put(cache_key, self._notebook_results(result))
+                except Exception as e:
+                    logger.warning(f"Could not cache results of task {task.id}: {e}")
             
-            return task.results or {'status': 'completed'}
+            return self._finish_task(task, result, start_time, cache_hit=False)
             
         except Exception as e:
             logger.error(f"Error executing task {task.id}: {e}")
@@ -972,6 +1051,72 @@ print(f"Created {num_plots} visualizations")
             task.error = str(e)
             return {'error': str(e)}
     
+    def _run_notebook(self, task: AnalysisTask, source: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a task's notebook in this interpreter when the in-process runner
+        is free, otherwise in the worker pool so concurrent tasks overlap
+        """
+        if not self.notebook_runner.in_process and not self.isolate_notebooks:
+            # Script mode already runs each notebook in its own process
+            return self.notebook_runner.run_notebook(task.marimo_notebook_path, inputs=inputs)
+        
+        if self.isolate_notebooks or not self._in_process_busy.acquire(blocking=False):
+            return self.executor.run(source, inputs=inputs, filename=task.marimo_notebook_path)
+        
+        try:
+            # In-process notebooks reuse the cached frame instead of re-reading it
+            data = None
+            if task.data_source and Path(task.data_source).exists():
+                data = load_dataset(task.data_source)
+            return self.notebook_runner.run_notebook(task.marimo_notebook_path, inputs=inputs, data=data)
+        finally:
+            self._in_process_busy.release()
+    
+    def _finish_task(self, task: AnalysisTask, result: Dict[str, Any],
+                     start_time: float, cache_hit: bool) -> Dict[str, Any]:
+        """Record a notebook result (fresh or cached) on the task"""
+        if 'error' in result:
+            task.status = TaskStatus.FAILED
+            task.error = result['error']
+            logger.error(f"Task {task.id} failed: {result['error']}")
+        else:
+            task.status = TaskStatus.COMPLETED
+            task.completed_at = datetime.now()
+            task.results = {
+                **self._notebook_results(result),
+                'execution_time': time.perf_counter() - start_time,
+                'cache_hit': cache_hit
+            }
+            
+            # Save results
+            self._save_task_results(task)
+            logger.info(f"Task {task.id} completed successfully")
+        
+        # Update user workload
+        if task.assigned_to and task.assigned_to in self.users:
+            self.users[task.assigned_to].workload = max(0, self.users[task.assigned_to].workload - 1)
+        
+        if task.status == TaskStatus.FAILED:
+            return {'error': task.error}
+        return task.results
+    
+    @staticmethod
+    def _notebook_results(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Notebook definitions, or captured stdout for notebooks run as scripts"""
+        results = result.get('results') or result.get('output') or {}
+        return results if isinstance(results, dict) else {'output': results}
+    
+    def _result_key(self, task: AnalysisTask, source: str) -> Optional[str]:
+        """Result cache key for a task, or None when its data has no file identity"""
+        if not task.data_source or not Path(task.data_source).is_file():
+            return None
+        return make_result_key(
+            file_fingerprint(task.data_source),
+            task.task_type.value,
+            task.parameters,
+            hashlib.sha256(source.encode()).hexdigest()
+        )
+    
     def execute_plan(self, plan_id: str) -> Dict[str, Any]:
         """Execute all tasks in a plan"""
         if plan_id not in self.plans:
@@ -983,44 +1128,12 @@ print(f"Created {num_plots} visualizations")
         # Auto-assign tasks
         self.auto_assign_tasks()
         
-        # Execute tasks with dependency management
-        completed_tasks = set()
-        max_iterations = len(plan.tasks) * 2
-        iteration = 0
-        
-        while len(completed_tasks) < len(plan.tasks) and iteration < max_iterations:
-            iteration += 1
-            tasks_to_execute = []
-            
-            for task in plan.tasks:
-                if task.id in completed_tasks:
-                    continue
-                
-                # Check dependencies
-                deps_met = all(dep in completed_tasks for dep in task.dependencies)
-                
-                if deps_met:
-                    tasks_to_execute.append(task)
-            
-            if not tasks_to_execute:
-                break
-            
-            # Execute tasks in parallel
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            async def execute_batch():
-                tasks = [self.execute_task(t.id) for t in tasks_to_execute]
-                return await asyncio.gather(*tasks)
-            
-            batch_results = loop.run_until_complete(execute_batch())
-            loop.close()
-            
-            # Process results
-            for task, result in zip(tasks_to_execute, batch_results):
-                results['tasks'][task.id] = result
-                if 'error' not in result:
-                    completed_tasks.add(task.id)
+        # Load each data source once; notebooks map it instead of re-parsing
+        shared = self._share_data_sources(plan)
+        try:
+            completed_tasks = self._execute_plan_tasks(plan, results)
+        finally:
+            self._release_data_sources(shared)
         
         # Update plan status
         if len(completed_tasks) == len(plan.tasks):
@@ -1034,6 +1147,129 @@ print(f"Created {num_plots} visualizations")
         
         return results
     
+    def _share_data_sources(self, plan: AnalysisPlan) -> List[str]:
+        """
+        Place each readable data source of a plan in shared memory for notebook
+        processes, returning the sources this plan now holds a reference to
+        
+        Plans running at the same time share one frame per source; it is
+        closed when the last of them releases it.
+        """
+        held = []
+        # A single in-process task never leaves this interpreter
+        if self.notebook_runner.in_process and not self.isolate_notebooks and len(plan.tasks) < 2:
+            return held
+        
+        for source in {t.data_source for t in plan.tasks if t.data_source}:
+            with self._shares_lock:
+                if source in self._shares:
+                    self._share_refs[source] += 1
+                    held.append(source)
+                    continue
+            if not Path(source).exists():
+                continue
+            try:
+                frame = share_frame(load_dataset(source))
+            except Exception as e:
+                # Notebooks fall back to reading the file themselves
+                logger.warning(f"Could not share data source {source}: {e}")
+                continue
+            with self._shares_lock:
+                if source in self._shares:
+                    # Another plan shared it meanwhile; use theirs
+                    frame.close()
+                    self._share_refs[source] += 1
+                else:
+                    self._shares[source] = frame
+                    self._share_refs[source] = 1
+                    self.shared_frames[source] = frame.handle.path
+            held.append(source)
+        return held
+    
+    def _release_data_sources(self, sources: List[str]):
+        """Drop a plan's references to shared data sources, closing unused frames"""
+        with self._shares_lock:
+            for source in sources:
+                self._share_refs[source] -= 1
+                if self._share_refs[source] == 0:
+                    del self._share_refs[source]
+                    self.shared_frames.pop(source, None)
+                    self._shares.pop(source).close()
+    
+    def _execute_plan_tasks(self, plan: AnalysisPlan, results: Dict[str, Any]) -> set:
+        """
+        Run plan tasks from a ready queue, returning the completed task ids
+        
+        A task starts as soon as its own dependencies have completed and a
+        slot is free, both globally (max_concurrent_tasks) and for its
+        assignee (max_tasks_per_user). Ready tasks are taken by priority,
+        then earliest deadline. Dependents of failed tasks are not run.
+        The limits are counted here to keep dispatch in priority order;
+        run_task enforces them again across every plan of the manager.
+        """
+        pending = {task.id: task for task in plan.tasks}
+        completed_tasks, failed_tasks = set(), set()
+        running: Dict[Future, AnalysisTask] = {}
+        running_per_user: Dict[str, int] = {}
+        timing = {}
+        start = time.perf_counter()
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_tasks, thread_name_prefix="plan") as pool:
+            while pending or running:
+                # Tasks downstream of a failure can never run
+                for task in list(pending.values()):
+                    failed_deps = [dep for dep in task.dependencies if dep in failed_tasks]
+                    if failed_deps:
+                        del pending[task.id]
+                        failed_tasks.add(task.id)
+                        results['tasks'][task.id] = {'error': f"Dependency {failed_deps[0]} failed"}
+                
+                ready = sorted(
+                    (t for t in pending.values() if all(dep in completed_tasks for dep in t.dependencies)),
+                    key=self._task_urgency
+                )
+                for task in ready:
+                    if len(running) >= self.max_concurrent_tasks:
+                        break
+                    user = task.assigned_to
+                    if user and running_per_user.get(user, 0) >= self.max_tasks_per_user:
+                        continue
+                    
+                    del pending[task.id]
+                    if user:
+                        running_per_user[user] = running_per_user.get(user, 0) + 1
+                    timing[task.id] = {'start': time.perf_counter() - start}
+                    running[pool.submit(self.run_task, task.id)] = task
+                
+                if not running:
+                    # Remaining tasks wait on dependencies outside the plan
+                    for task_id in pending:
+                        results['tasks'][task_id] = {'error': 'Dependencies not met'}
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    if task.assigned_to:
+                        running_per_user[task.assigned_to] -= 1
+                    timing[task.id]['end'] = time.perf_counter() - start
+                    
+                    result = future.result()
+                    results['tasks'][task.id] = result
+                    if 'error' in result:
+                        failed_tasks.add(task.id)
+                    else:
+                        completed_tasks.add(task.id)
+                        if task.deadline and task.completed_at and task.completed_at > task.deadline:
+                            logger.warning(f"Task {task.name} finished after its deadline")
+        
+        results['timing'] = {'elapsed': time.perf_counter() - start, 'tasks': timing}
+        return completed_tasks
+    
+    def _task_urgency(self, task: AnalysisTask):
+        """Sort key for ready tasks: highest priority, then earliest deadline"""
+        return (-task.priority, task.deadline or datetime.max, task.created_at or datetime.max)
+    
     def _aggregate_results(self, plan: AnalysisPlan, task_results: Dict) -> Dict:
         """Aggregate results from all tasks"""
         summary = {
@@ -21,6 +21,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src', 'python'))
 from workflow.workflow_manager import WorkflowManager
 from agents import DataAnalysisAgent, VisualizationAgent, MLAgent
 from execution.task_executor import TaskExecutor
+from execution.process_pool import get_process_backend
+from storage import share_frame
 from reporting.report_generator import ReportGenerator
 
 # Page configuration
@@ -37,7 +39,7 @@ def init_session_state():
         st.session_state.initialized = True
         st.session_state.current_view = 'overview'
         st.session_state.workflow_manager = WorkflowManager()
-        st.session_state.task_executor = TaskExecutor()
+        st.session_state.task_executor = TaskExecutor(backend=get_process_backend(), cache_results=True)
         st.session_state.report_generator = ReportGenerator()
         st.session_state.active_plans = {}
         st.session_state.task_results = {}
@@ -57,39 +59,64 @@ def execute_tasks_automatically(plan_id, tasks, data):
     successful_tasks = 0
     failed_tasks = 0
     
-    for i, task in enumerate(tasks):
-        status_text.text(f"🔄 Executing: {task['name']}...")
-        progress_bar.progress((i + 1) / len(tasks))
-        
+    # Share the frame once so worker processes map it instead of unpickling copies
+    shared = None
+    if data is not None:
         try:
-            # Execute task
-            result = st.session_state.task_executor.execute_task(task, data)
-            st.session_state.task_results[task['id']] = result
+            shared = share_frame(data)
+        except ImportError:
+            pass
+    payload = shared.handle if shared else data
+    
+    try:
+        # CPU-bound tasks start in worker processes right away and overlap
+        # with the inline tasks run one by one below
+        executor = st.session_state.task_executor
+        pooled = {
+            i: executor.submit_task(task, payload)
+            for i, task in enumerate(tasks)
+            if executor.backend is not None and executor.backend.handles(task)
+        }
+        
+        for i, task in enumerate(tasks):
+            status_text.text(f"🔄 Executing: {task['name']}...")
             
-            # Log execution
-            log_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'task': task['name'],
-                'status': result.get('status', 'unknown'),
-                'execution_time': result.get('execution_time', 'N/A')
-            }
-            st.session_state.execution_logs.append(log_entry)
+            try:
+                # Run inline tasks now; collect pooled ones as they finish
+                future = pooled.get(i)
+                result = future.result() if future else executor.execute_task(task, payload)
+                st.session_state.task_results[task['id']] = result
+                
+                # Log execution
+                log_entry = {
+                    'timestamp': datetime.now().isoformat(),
+                    'task': task['name'],
+                    'status': result.get('status', 'unknown'),
+                    'execution_time': result.get('execution_time', 'N/A')
+                }
+                st.session_state.execution_logs.append(log_entry)
+                
+                if result.get('status') == 'success':
+                    successful_tasks += 1
+                    with results_container:
+                        st.success(f"✅ {task['name']} - Completed in {result.get('execution_time', 'N/A')}")
+                else:
+                    failed_tasks += 1
+                    with results_container:
+                        st.warning(f"⚠️ {task['name']} - Failed")
             
-            if result.get('status') == 'success':
-                successful_tasks += 1
-                with results_container:
-                    st.success(f"✅ {task['name']} - Completed in {result.get('execution_time', 'N/A')}")
-            else:
+            except Exception as e:
                 failed_tasks += 1
                 with results_container:
-                    st.warning(f"⚠️ {task['name']} - Failed")
-        
-        except Exception as e:
-            failed_tasks += 1
-            with results_container:
-                st.error(f"❌ {task['name']} - Error: {str(e)}")
+                    st.error(f"❌ {task['name']} - Error: {str(e)}")
             
-        time.sleep(0.2)  # Brief pause for UI update
+            progress_bar.progress((i + 1) / len(tasks))
+            time.sleep(0.2)  # Brief pause for UI update
+    
+    finally:
+        # Unlink the shared file even if submitting or collecting raised
+        if shared:
+            shared.close()
     
     status_text.text("✅ Execution completed!")
     progress_bar.progress(1.0)
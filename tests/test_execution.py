@@ -0,0 +1,213 @@
+import pytest
+import os
+import tempfile
+from pathlib import Path
+import pandas as pd
+import numpy as np
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from execution.task_executor import TaskExecutor
+from execution.profiling import QuantileSketch, HyperLogLog, profile_file
+
+
+@pytest.fixture
+def sample_frame():
+    """Frame with missing values, duplicates and an outlier"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'value': rng.normal(100, 10, 500),
+        'count': rng.integers(0, 20, 500),
+        'category': rng.choice(['a', 'b', 'c'], 500)
+    })
+    df.loc[::25, 'value'] = np.nan
+    df.loc[3, 'value'] = 1000.0
+    return pd.concat([df, df.iloc[:10]], ignore_index=True)
+
+
+@pytest.fixture
+def sample_csv(sample_frame):
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+        sample_frame.to_csv(f, index=False)
+        path = f.name
+    yield path
+    os.unlink(path)
+
+
+def test_streaming_profile_matches_in_memory(sample_frame, sample_csv):
+    """Chunked profile reproduces the in-memory profile schema and values"""
+    executor = TaskExecutor()
+    expected = executor._profile_data(sample_frame)
+    profile = profile_file(sample_csv, chunk_size=100).profile()
+
+    assert profile['shape'] == expected['shape']
+    assert profile['columns'] == expected['columns']
+    assert profile['missing_values'] == expected['missing_values']
+    assert profile['missing_percentage'] == expected['missing_percentage']
+    assert profile['duplicates'] == expected['duplicates']
+    assert set(profile['numeric_stats']) == set(expected['numeric_stats'])
+
+    for col, stats in expected['numeric_stats'].items():
+        for key, value in stats.items():
+            assert profile['numeric_stats'][col][key] == pytest.approx(value, rel=1e-9)
+
+
+def test_streaming_mode_in_task_executor(sample_csv):
+    """Profiling tasks with mode='streaming' never load the whole frame"""
+    result = TaskExecutor().execute_task({
+        'id': 't1',
+        'type': 'data_profiling',
+        'data_path': sample_csv,
+        'mode': 'streaming',
+        'chunk_size': 64
+    })
+
+    assert result['status'] == 'success'
+    assert result['results']['streaming'] is True
+    assert result['results']['shape']['rows'] == 510
+
+
+@pytest.mark.parametrize('orient,lines', [('records', False), ('records', True), ('columns', False)])
+def test_streaming_profile_reads_json_documents_and_lines(sample_frame, orient, lines):
+    """Plain JSON documents stream like JSON Lines files, matching read_dataset"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / 'data.json'
+        sample_frame.to_json(path, orient=orient, lines=lines)
+        profile = profile_file(path, chunk_size=100).profile()
+
+    assert profile['shape'] == {'rows': 510, 'columns': 3}
+    assert profile['duplicates'] == 10
+
+
+def test_quantile_sketch_accuracy():
+    """Sketch quantiles stay close to exact ones after compaction"""
+    rng = np.random.default_rng(1)
+    values = rng.uniform(0, 1, 200_000)
+    sketch = QuantileSketch(k=512)
+    for chunk in np.array_split(values, 50):
+        sketch.update(chunk)
+
+    approx = sketch.quantiles([0.1, 0.5, 0.9])
+    exact = np.quantile(values, [0.1, 0.5, 0.9])
+    assert np.allclose(approx, exact, atol=0.02)
+
+
+def test_hyperloglog_estimate():
+    """HLL distinct estimate is within a few percent"""
+    values = pd.Series(np.arange(50_000) % 20_000)
+    hll = HyperLogLog()
+    hll.update(pd.util.hash_pandas_object(values, index=False).values)
+
+    assert hll.estimate() == pytest.approx(20_000, rel=0.05)
+
+
+def test_numeric_profile_kernel_matches_pandas():
+    """Vectorized kernel agrees with per-column pandas statistics, edge cases included"""
+    from execution.profiling import numeric_profile_kernel
+
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        'normal': rng.normal(size=200),
+        'constant': np.full(200, 5.0),
+        'all_missing': np.full(200, np.nan),
+        'single': [3.0] + [np.nan] * 199,
+        'skewed': rng.exponential(size=200)
+    })
+    df.loc[::9, 'normal'] = np.nan
+
+    stats = numeric_profile_kernel(df.to_numpy())
+
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        expected = [series.mean(), series.median(), series.std(), series.min(),
+                    series.max(), series.quantile(0.25), series.quantile(0.75)]
+        actual = [stats[key][i] for key in ['mean', 'median', 'std', 'min', 'max', 'q25', 'q75']]
+        assert np.allclose(actual, expected, equal_nan=True), col
+
+        q1, q3 = series.quantile(0.25), series.quantile(0.75)
+        iqr = q3 - q1
+        expected_outliers = ((series < q1 - 1.5 * iqr) | (series > q3 + 1.5 * iqr)).sum()
+        assert stats['outliers'][i] == expected_outliers
+
+
+def test_process_backend_matches_inline(sample_frame):
+    """CPU-bound tasks run in worker processes with the same results"""
+    from execution.process_pool import ProcessTaskBackend
+
+    backend = ProcessTaskBackend(max_workers=2)
+    try:
+        executor = TaskExecutor(backend=backend, cache_results=False)
+        tasks = [
+            {'id': 'seg', 'type': 'segmentation'},
+            {'id': 'anom', 'type': 'anomaly_detection'},
+            {'id': 'prof', 'type': 'data_profiling'}
+        ]
+        futures = [executor.submit_task(task, sample_frame) for task in tasks]
+        remote = [future.result(timeout=120) for future in futures]
+        inline = [TaskExecutor(cache_results=False).execute_task(task, sample_frame) for task in tasks]
+
+        for got, expected in zip(remote, inline):
+            assert got['status'] == 'success'
+            assert got['results'] == expected['results']
+    finally:
+        backend.shutdown()
+
+
+def test_process_backend_closes_share_when_submit_fails(sample_frame, monkeypatch):
+    """A frame shared for a task that never reaches the pool is removed"""
+    from execution import process_pool
+
+    share_frame = process_pool.share_frame
+    shares = []
+
+    def recording_share(data):
+        shares.append(share_frame(data))
+        return shares[-1]
+
+    monkeypatch.setattr(process_pool, 'share_frame', recording_share)
+    backend = process_pool.ProcessTaskBackend(max_workers=1)
+    backend.pool.shutdown()
+
+    with pytest.raises(RuntimeError):
+        backend.submit({'id': 'seg', 'type': 'segmentation'}, sample_frame)
+    assert len(shares) == 1
+    assert not Path(shares[0].handle.path).exists()
+
+
+def test_result_cache_serves_repeated_task(sample_frame, tmp_path):
+    """Same data, type and parameters skip execution; changed data does not"""
+    from storage import ResultCache
+
+    executor = TaskExecutor(result_cache=ResultCache(tmp_path))
+    task = {'id': 'prof', 'name': 'Profile', 'type': 'data_profiling'}
+
+    first = executor.execute_task(task, sample_frame)
+    second = executor.execute_task({**task, 'id': 'prof-2'}, sample_frame.copy())
+
+    assert first['cache_hit'] is False
+    assert second['cache_hit'] is True
+    assert second['task_id'] == 'prof-2'
+    assert second['results'] == first['results']
+    assert second['cached_execution_time'] == first['execution_time']
+
+    changed = sample_frame.copy()
+    changed.loc[1, 'value'] += 1
+    assert executor.execute_task(task, changed)['cache_hit'] is False
+    assert executor.execute_task({**task, 'parameters': {'x': 1}}, sample_frame)['cache_hit'] is False
+
+
+def test_result_cache_is_opt_in_and_keys_handles_by_file(sample_frame, tmp_path, monkeypatch):
+    """No cache by default; shared frame handles are keyed without attaching them"""
+    from storage import ResultCache, SharedFrameHandle, share_frame
+
+    assert TaskExecutor().result_cache is None
+
+    executor = TaskExecutor(result_cache=ResultCache(tmp_path))
+    task = {'id': 'prof', 'type': 'data_profiling'}
+    with share_frame(sample_frame) as shared:
+        monkeypatch.setattr(SharedFrameHandle, 'attach', lambda self: pytest.fail("attached"))
+        first = executor._result_key(task, shared.handle)
+        second = executor._result_key(task, shared.handle)
+
+    assert first is not None and first == second
+
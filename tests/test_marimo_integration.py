@@ -124,5 +124,106 @@ def test_notebook_runner_nonexistent_notebook():
     assert 'not found' in result['error'].lower()
 
 
+NOTEBOOK_WITH_DATA = """import marimo as mo
+
+app = mo.App()
+
+@app.cell
+def __():
+    import pandas as pd
+    return pd,
+
+@app.cell
+def __(pd):
+    df = pd.read_csv('missing.csv')
+    return df,
+
+@app.cell
+def __(df):
+    summary = {'rows': len(df), 'total': int(df['x'].sum())}
+    print(summary)
+    return summary,
+
+if __name__ == "__main__":
+    app.run()
+"""
+
+
+def test_notebook_runner_in_process_with_data():
+    """In-process runs reuse a loaded frame in place of the loading cell"""
+    import pandas as pd
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        notebook = Path(tmpdir) / "summary.py"
+        notebook.write_text(NOTEBOOK_WITH_DATA)
+        runner = NotebookRunner(Path(tmpdir))
+        data = pd.DataFrame({'x': [1, 2, 3]})
+        
+        result = runner.run_notebook(str(notebook), data=data)
+        again = runner.run_notebook(str(notebook), data=data.iloc[:2])
+        
+        assert result['success']
+        assert result['results']['summary'] == {'rows': 3, 'total': 6}
+        assert "{'rows': 3" in result['output']
+        assert again['results']['summary'] == {'rows': 2, 'total': 3}
+        
+        # Without data the notebook's own loading cell runs (and fails here)
+        assert 'error' in runner.run_notebook(str(notebook))
+
+
+def test_notebook_runner_cli_mode():
+    """CLI mode runs the notebook as a script in a new process"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        notebook = Path(tmpdir) / "script.py"
+        notebook.write_text(NOTEBOOK_WITH_DATA.replace("pd.read_csv('missing.csv')", "pd.DataFrame({'x': [4, 5]})"))
+        
+        result = NotebookRunner(Path(tmpdir), in_process=False).run_notebook(str(notebook))
+        
+        assert result['success']
+        assert "{'rows': 2, 'total': 9}" in result['output']
+
+
+def test_notebook_worker_pool_timeout_and_recycling():
+    """Pool workers run notebook source, are replaced on timeout and recycled after N jobs"""
+    from marimo_integration import NotebookWorkerPool
+    
+    ok_source = NOTEBOOK_WITH_DATA.replace("pd.read_csv('missing.csv')", "pd.DataFrame({'x': [1, 2]})")
+    slow_source = ok_source.replace("summary = {", "import time; time.sleep(30); summary = {")
+    
+    pool = NotebookWorkerPool(max_workers=1, timeout=2, max_jobs_per_worker=2)
+    try:
+        first = pool.run(ok_source)
+        assert first['results']['summary'] == {'rows': 2, 'total': 3}
+        pid = next(iter(pool._workers)).process.pid
+        
+        # Second job uses up the worker; it is replaced afterwards
+        assert 'error' not in pool.run(ok_source)
+        assert next(iter(pool._workers)).process.pid != pid
+        
+        timed_out = pool.run(slow_source)
+        assert 'timed out' in timed_out['error']
+        
+        assert pool.submit(ok_source).result(timeout=120)['success']
+    finally:
+        pool.shutdown()
+
+
+def test_notebook_worker_pool_survives_unpicklable_inputs():
+    """A job that cannot be sent fails alone and its worker is replaced, not lost"""
+    import threading
+    from marimo_integration import NotebookWorkerPool
+
+    ok_source = NOTEBOOK_WITH_DATA.replace("pd.read_csv('missing.csv')", "pd.DataFrame({'x': [1, 2]})")
+
+    pool = NotebookWorkerPool(max_workers=1, timeout=60)
+    try:
+        failed = pool.run(ok_source, inputs={'lock': threading.Lock()})
+        assert 'pickle' in failed['error']
+        assert len(pool._workers) == 1
+        assert pool.submit(ok_source).result(timeout=120)['success']
+    finally:
+        pool.shutdown()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -3,6 +3,9 @@ import tempfile
 from pathlib import Path
 import sys
 import json
+import time
+import asyncio
+import threading
 sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
 
 from agents import (
@@ -11,7 +14,7 @@ from agents import (
     VisualizationAgent,
     MLAgent
 )
-from agents.orchestrator import Task
+from agents.base import BaseAgent, AgentConfig
 
 
 def test_orchestrator_creation():
@@ -129,6 +132,24 @@ def test_visualization_agent():
         Path(test_file).unlink(missing_ok=True)
 
 
+def test_visualization_agent_honors_columns(tmp_path, monkeypatch):
+    """Auto, dashboard and report visualizations only plot the requested columns"""
+    monkeypatch.chdir(tmp_path)
+    data = tmp_path / "data.csv"
+    data.write_text("value,other,third,category\n10,1,5,A\n20,2,6,B\n30,3,7,A\n40,5,8,B\n")
+    agent = VisualizationAgent()
+    
+    auto = agent.execute({"viz_type": "auto", "data_path": str(data), "columns": ["value", "third"]})
+    assert auto["columns_analyzed"]["numeric"] == ["value", "third"]
+    
+    dashboard = agent.execute({"viz_type": "dashboard", "data_path": str(data), "columns": ["third", "value"]})
+    assert "x='third', y='value'" in Path(dashboard["dashboard_path"]).read_text()
+    
+    report = agent.execute({"viz_type": "report", "data_path": str(data), "columns": ["other"]})
+    source = Path(report["report_path"]).read_text()
+    assert "df['other']" in source and "df['value']" not in source
+
+
 def test_ml_agent_training():
     """Test ML agent model training"""
     agent = MLAgent()
@@ -158,6 +179,113 @@ def test_ml_agent_training():
         Path(test_file).unlink(missing_ok=True)
 
 
+def test_ml_agent_auto_ml_scores_both_task_types():
+    """auto_ml cross-validates regressors by R^2 and classifiers by accuracy on shared folds"""
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LinearRegression
+    from sklearn.model_selection import cross_val_score
+    from ml.cross_validation import FoldCache, cross_validate_models
+    
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'x1': rng.normal(size=300), 'x2': rng.normal(size=300)})
+    df['amount'] = 3 * df['x1'] - df['x2'] + rng.normal(scale=0.1, size=300)
+    df['label'] = (df['x1'] > 0).astype(int)
+    
+    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+        test_file = f.name
+    df.to_csv(test_file, index=False)
+    
+    try:
+        agent = MLAgent()
+        regression = agent.execute({"ml_task": "auto_ml", "data_path": test_file, "target_column": "amount"})
+        classification = agent.execute({"ml_task": "auto_ml", "data_path": test_file, "target_column": "label"})
+    finally:
+        Path(test_file).unlink(missing_ok=True)
+    
+    assert regression["task_type"] == "regression"
+    assert regression["results"]["LinearRegression"]["mean_r2"] > 0.99
+    assert classification["task_type"] == "classification"
+    assert classification["best_model"] in classification["results"]
+    assert classification["results"]["LogisticRegression"]["mean_accuracy"] > 0.9
+    
+    # Same folds as cross_val_score, with array test folds as views of one array
+    X, y = df[['x1', 'x2']], df['amount']
+    folds = FoldCache(X, y, n_folds=5)
+    array_folds = FoldCache(X.to_numpy(), y, n_folds=5)
+    assert array_folds.test(2)[0].base is array_folds.X
+    assert np.array_equal(folds.test(2)[0].to_numpy(), array_folds.test(2)[0])
+    harness = cross_validate_models({'lr': LinearRegression()}, folds, n_jobs=2)['lr']['mean_r2']
+    assert np.isclose(harness, cross_val_score(LinearRegression(), X, y, cv=5).mean())
+
+
+def test_fold_preprocessing_sees_only_training_rows():
+    """Per-fold pipelines encode a category seen only in test rows as unknown"""
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LinearRegression
+    from ml.cross_validation import FoldCache
+    from ml.preprocessing import PREPROCESS_STEP, build_preprocessor, with_preprocessing
+    
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({'x': rng.normal(size=100), 'segment': ['a', 'b'] * 49 + ['rare', 'a']})
+    y = pd.Series(rng.normal(size=100))
+    folds = FoldCache(X, y, n_folds=5)
+    preprocessor = build_preprocessor(X)
+    
+    for fold in range(folds.n_folds):
+        X_test, _ = folds.test(fold)
+        if 'rare' not in set(X_test['segment']):
+            continue
+        pipeline = with_preprocessing(preprocessor, LinearRegression()).fit(*folds.train(fold))
+        encoded = pipeline.named_steps[PREPROCESS_STEP].transform(X_test)
+        assert encoded.loc[X_test['segment'] == 'rare', 'segment'].tolist() == [-1.0]
+        break
+    else:
+        pytest.fail("rare row not in any test fold")
+
+
+def test_ml_agent_streaming_training():
+    """Streaming mode trains partial_fit models chunk by chunk with the in-memory result schema"""
+    import numpy as np
+    import pandas as pd
+    
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'x1': rng.normal(size=2000), 'x2': rng.normal(size=2000)})
+    df['amount'] = 3 * df['x1'] - df['x2'] + rng.normal(scale=0.1, size=2000)
+    df['label'] = (df['x1'] > 0).astype(int)
+    df.loc[::50, 'x2'] = np.nan
+    
+    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+        test_file = f.name
+    df.to_csv(test_file, index=False)
+    
+    try:
+        agent = MLAgent()
+        in_memory = agent.execute({"ml_task": "train", "data_path": test_file, "target_column": "amount"})
+        regression = agent.execute({"ml_task": "train", "mode": "streaming", "chunk_size": 300,
+                                    "data_path": test_file, "target_column": "amount"})
+        naive_bayes = agent.execute({"ml_task": "train", "mode": "streaming", "chunk_size": 300,
+                                     "data_path": test_file, "target_column": "label",
+                                     "model_type": "naive_bayes"})
+        clusters = agent.execute({"ml_task": "train", "mode": "streaming", "task_type": "clustering",
+                                  "data_path": test_file, "model_params": {"n_clusters": 3}})
+        predicted = agent.execute({"ml_task": "predict", "model_id": regression["model_id"],
+                                   "data_path": test_file, "output_path": test_file + ".out.csv"})
+    finally:
+        Path(test_file).unlink(missing_ok=True)
+        Path(test_file + ".out.csv").unlink(missing_ok=True)
+    
+    assert set(regression) == set(in_memory)
+    assert regression["model_type"] == "SGDRegressor"
+    assert regression["metrics"]["r2"] > 0.95
+    assert regression["training_samples"] + regression["test_samples"] == 2000
+    assert naive_bayes["task_type"] == "classification" and naive_bayes["model_type"] == "GaussianNB"
+    assert naive_bayes["metrics"]["accuracy"] > 0.9
+    assert clusters["model_type"] == "MiniBatchKMeans" and clusters["metrics"]["inertia"] > 0
+    assert predicted["predictions_count"] == 2000
+
+
 def test_workflow_save_load():
     """Test saving and loading workflows"""
     orchestrator = AgentOrchestrator()
@@ -224,5 +352,134 @@ def test_topological_sort():
     assert sorted_ids.index("C") < sorted_ids.index("A")
 
 
+class SleepAgent(BaseAgent):
+    """Agent that sleeps and records how many of its tasks overlap"""
+    
+    def __init__(self, name: str, delay: float = 0.2):
+        super().__init__(AgentConfig(name=name, description="Sleeps"))
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+    
+    def execute(self, task):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return {"done": task.get("name")}
+
+
+def test_parallel_dag_scheduler():
+    """Independent branches overlap, dependencies and agent limits hold"""
+    orchestrator = AgentOrchestrator(max_workers=4, concurrency_limits={"slow": 2, "fast": 4})
+    slow = SleepAgent("slow")
+    fast = SleepAgent("fast", delay=0.05)
+    orchestrator.register_agent("slow", slow)
+    orchestrator.register_agent("fast", fast)
+    
+    # Three slow branches (limit 2) each followed by a fast task, then a join
+    tasks = []
+    for i in range(3):
+        tasks.append(Task(id=f"s{i}", type="", data={"name": f"s{i}"}, agent_type="slow"))
+        tasks.append(Task(id=f"f{i}", type="", data={"name": f"f{i}"}, agent_type="fast",
+                          dependencies=[f"s{i}"]))
+    tasks.append(Task(id="join", type="", data={"name": "join"}, agent_type="fast",
+                      dependencies=["f0", "f1", "f2"]))
+    
+    results = asyncio.run(orchestrator.execute_parallel(tasks))
+    timing = results["timing"]
+    
+    assert all("error" not in r for r in results["results"].values())
+    assert slow.peak == 2
+    for i in range(3):
+        assert timing["tasks"][f"f{i}"]["start"] >= timing["tasks"][f"s{i}"]["end"]
+    assert timing["tasks"]["join"]["start"] >= max(timing["tasks"][f"f{i}"]["end"] for i in range(3))
+    assert timing["speedup"] > 1.2
+    assert timing["critical_path"]["tasks"][-1] == "join"
+
+
+def test_parallel_scheduler_skips_failed_dependents():
+    """Dependents of a failed task are skipped, and statuses match the results"""
+    orchestrator = AgentOrchestrator(concurrency_limits={"idle": 0})
+    tasks = [
+        Task(id="a", type="", data={}, agent_type="missing"),
+        Task(id="b", type="", data={}, agent_type="missing", dependencies=["a"]),
+        Task(id="c", type="", data={}, agent_type="missing", dependencies=["b"]),
+        Task(id="d", type="", data={}, agent_type="idle"),
+        Task(id="e", type="", data={}, agent_type="missing", dependencies=["d"]),
+    ]
+    
+    results = asyncio.run(orchestrator.execute_parallel(tasks))["results"]
+    
+    assert "error" in results["a"]
+    assert "Dependency a" in results["b"]["error"]
+    assert "Dependency b" in results["c"]["error"]
+    assert "No capacity for agent idle" in results["d"]["error"]
+    assert [t.status for t in tasks] == ["failed", "skipped", "skipped", "failed", "skipped"]
+    assert all(t.result == results[t.id] for t in tasks)
+
+
+def test_parallel_scheduler_reports_cycles_and_unknown_dependencies():
+    """Tasks that can never become ready are reported as failed"""
+    orchestrator = AgentOrchestrator()
+    orchestrator.register_agent("fast", SleepAgent("fast", delay=0.01))
+    tasks = [
+        Task(id="a", type="", data={}, agent_type="fast", dependencies=["b"]),
+        Task(id="b", type="", data={}, agent_type="fast", dependencies=["a"]),
+        Task(id="c", type="", data={}, agent_type="fast", dependencies=["a"]),
+        Task(id="d", type="", data={}, agent_type="fast", dependencies=["nope"]),
+        Task(id="e", type="", data={}, agent_type="fast"),
+    ]
+    
+    results = asyncio.run(orchestrator.execute_parallel(tasks))["results"]
+    
+    assert set(results) == {"a", "b", "c", "d", "e"}
+    assert "Dependency cycle" in results["a"]["error"]
+    assert "Dependency cycle" in results["c"]["error"]
+    assert "Unknown dependencies: nope" in results["d"]["error"]
+    assert "error" not in results["e"]
+
+
+def test_ml_agent_encodes_categorical_features():
+    """Training keeps categorical columns; predict and evaluate reuse the fitted preprocessing"""
+    import numpy as np
+    import pandas as pd
+    
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'x1': rng.normal(size=400),
+        'segment': rng.choice(['retail', 'wholesale', 'online'], size=400),
+        'store': [f"s{i}" for i in rng.integers(0, 100, size=400)]
+    })
+    df['amount'] = df['x1'] + df['segment'].map({'retail': 0, 'wholesale': 10, 'online': 20})
+    df.loc[::20, 'x1'] = np.nan
+    
+    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+        train_file = f.name
+    df.to_csv(train_file, index=False)
+    new_rows = df.head(50).assign(segment=['unknown'] + ['online'] * 49)
+    new_file = train_file + ".new.csv"
+    new_rows.to_csv(new_file, index=False)
+    
+    try:
+        agent = MLAgent()
+        trained = agent.execute({"ml_task": "train", "data_path": train_file, "target_column": "amount"})
+        evaluated = agent.execute({"ml_task": "evaluate", "model_id": trained["model_id"], "data_path": train_file})
+        predicted = agent.execute({"ml_task": "predict", "model_id": trained["model_id"],
+                                   "data_path": new_file, "output_path": new_file + ".out.csv"})
+    finally:
+        for path in [train_file, new_file, new_file + ".out.csv"]:
+            Path(path).unlink(missing_ok=True)
+    
+    assert trained["preprocessing"] == {'numeric': ['x1'], 'ordinal': ['segment'], 'hashed': ['store']}
+    assert trained["metrics"]["r2"] > 0.95
+    assert "segment" in trained["feature_importance"]
+    assert evaluated["metrics"]["r2"] > 0.95
+    assert predicted["predictions_count"] == 50
+
+
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
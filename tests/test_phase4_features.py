@@ -206,6 +206,305 @@ class TestModelRegistry:
         
         assert len(comparison) == 2
         assert 'accuracy' in comparison.columns or 'r2_score' in comparison.columns
+    
+    def test_promote_replaces_production_model(self, registry, sample_model, sample_data):
+        """Promoting a version archives the previous production version"""
+        X, y = sample_data
+        sample_model.fit(X, y)
+        
+        first = registry.register_model(sample_model, "churn", "1.0", X, y, tags=["a"])
+        registry.promote_model(first, "production")
+        second = registry.register_model(sample_model, "churn", "2.0", X, y, tags=["b"])
+        registry.promote_model(second, "production")
+        
+        assert registry.models[first].status == "archived"
+        assert [m.model_id for m in registry.list_models(status="production")] == [second]
+        assert registry.get_production_model("churn") is not None
+        assert [m.model_id for m in registry.list_models(tags=["b"])] == [second]
+        assert registry.delete_model(first)
+        assert first not in registry.models and len(registry.models) == 1
+    
+    def test_model_cache(self, registry, sample_model, sample_data):
+        """Loaded models are reused until archived or deleted; production models pre-load"""
+        X, y = sample_data
+        sample_model.fit(X, y)
+        
+        first = registry.register_model(sample_model, "churn", "1.0", X, y)
+        second = registry.register_model(sample_model, "churn", "2.0", X, y)
+        registry.promote_model(first, "production")
+        
+        assert registry.warm_cache() == [first]
+        assert registry.load_model(first) is registry.load_model(first)
+        assert registry.model_cache.get_stats()['hits'] == 2
+        
+        # The replaced production model leaves the cache
+        registry.promote_model(second, "production")
+        assert not registry.model_cache.contains(registry.models[first].file_path)
+        
+        registry.load_model(second)
+        path = registry.models[second].file_path
+        assert registry.model_cache.contains(path)
+        registry.delete_model(second)
+        assert not registry.model_cache.contains(path)
+        assert registry.model_cache.get_stats()['entries'] == 0
+    
+    def test_model_artifacts_are_memory_mapped(self, registry, sample_model, sample_data):
+        """New models are joblib files loaded as read-only maps; pickles still load"""
+        import pickle
+        X, y = sample_data
+        sample_model.fit(X, y)
+        
+        model_id = registry.register_model(sample_model, "mapped", "1.0", X, y)
+        metadata = registry.models[model_id]
+        
+        assert metadata.artifact_format == "joblib"
+        assert metadata.artifact_size == Path(metadata.file_path).stat().st_size > 0
+        loaded = registry.load_model(model_id)
+        assert isinstance(loaded.coef_, np.memmap) and not loaded.coef_.flags.writeable
+        assert (loaded.predict(X) == sample_model.predict(X)).all()
+        
+        # Models saved before artifacts had a format are plain pickles
+        legacy = registry.register_model(sample_model, "legacy", "1.0", X, y)
+        legacy_meta = registry.models[legacy]
+        legacy_path = Path(legacy_meta.file_path).with_suffix(".pkl")
+        legacy_path.write_bytes(pickle.dumps(sample_model))
+        with registry._connect() as conn:
+            conn.execute(
+                "UPDATE models SET file_path = ?, artifact_format = NULL, artifact_size = NULL WHERE model_id = ?",
+                (str(legacy_path), legacy)
+            )
+        
+        assert registry.models[legacy].artifact_format == "pickle"
+        assert (registry.load_model(legacy).predict(X) == sample_model.predict(X)).all()
+    
+    def test_registry_migrates_json_metadata(self, sample_model, sample_data):
+        """Metadata from a registry.json is imported into the database once"""
+        X, y = sample_data
+        sample_model.fit(X, y)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = ModelRegistry(registry_path=tmpdir)
+            model_id = registry.register_model(sample_model, "legacy", "1.0", X, y, tags=["old"])
+            metadata = registry.models[model_id].to_dict()
+            
+            Path(tmpdir, "registry.db").unlink()
+            Path(tmpdir, "registry.json").write_text(json.dumps({model_id: metadata}))
+            
+            migrated = ModelRegistry(registry_path=tmpdir)
+            
+            assert migrated.models[model_id].to_dict() == metadata
+            assert migrated.list_models(tags=["old"])[0].model_id == model_id
+            assert not Path(tmpdir, "registry.json").exists()
+            assert len(ModelRegistry(registry_path=tmpdir).models) == 1
+
+class TestPredictionBatcher:
+    """Test micro-batched predictions"""
+    
+    @pytest.fixture
+    def registered_model(self):
+        """Registry holding one fitted classifier"""
+        from sklearn.linear_model import LogisticRegression
+        X = pd.DataFrame({'f1': np.random.randn(200), 'f2': np.random.randn(200)})
+        y = pd.Series((X['f1'] > 0).astype(int), name='target')
+        model = LogisticRegression().fit(X, y)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = ModelRegistry(registry_path=tmpdir)
+            model_id = registry.register_model(model, "batched", "1.0", X, y)
+            yield registry, model_id, model, X
+    
+    def test_concurrent_requests_share_batches(self, registered_model):
+        """Concurrent single-row requests are coalesced and fanned back out"""
+        from concurrent.futures import ThreadPoolExecutor
+        from ml.batching import PredictionBatcher
+        registry, model_id, model, X = registered_model
+        batcher = PredictionBatcher(registry, batch_window_ms=50, max_batch_size=16)
+        
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(lambda i: batcher.predict(model_id, X.iloc[[i]]), range(64)))
+        
+        assert [r['predictions'][0] for r in results] == model.predict(X.iloc[:64]).tolist()
+        assert np.allclose([r['probabilities'][0] for r in results], model.predict_proba(X.iloc[:64]))
+        stats = batcher.get_stats()
+        assert stats['rows'] == 64
+        assert stats['batches'] < 64 and stats['max_batch_rows'] <= 16
+    
+    def test_bad_request_fails_alone(self, registered_model):
+        """A request that cannot be predicted does not fail its batch"""
+        from ml.batching import PredictionBatcher
+        registry, model_id, model, X = registered_model
+        batcher = PredictionBatcher(registry, batch_window_ms=50)
+        
+        good = batcher.submit(model_id, X.iloc[:3])
+        bad = batcher.submit(model_id, pd.DataFrame({'f1': ['x'], 'f2': ['y']}))
+        
+        assert good.result(timeout=10)['predictions'].tolist() == model.predict(X.iloc[:3]).tolist()
+        with pytest.raises(ValueError):
+            bad.result(timeout=10)
+
+class TestJobQueue:
+    """Test the persistent analysis job queue"""
+    
+    @pytest.fixture
+    def job_queue(self):
+        from api.job_queue import JobQueue
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield JobQueue(Path(tmpdir) / "jobs.db")
+    
+    def test_workers_run_queued_jobs(self, job_queue):
+        """Workers complete or fail jobs and long-polls see the outcome"""
+        from api.job_queue import JobQueue, JobWorkerPool
+        
+        def handler(payload):
+            if payload['n'] < 0:
+                raise ValueError("negative")
+            return {'square': payload['n'] ** 2}
+        
+        ok = job_queue.enqueue('square', {'n': 4}, user_id='u1')
+        bad = job_queue.enqueue('square', {'n': -1}, user_id='u1')
+        assert job_queue.get(ok)['status'] == 'queued'
+        
+        workers = JobWorkerPool(job_queue, {'square': handler}, max_workers=2)
+        workers.start()
+        try:
+            done = job_queue.wait(ok, timeout=10)
+            failed = job_queue.wait(bad, timeout=10)
+        finally:
+            workers.shutdown()
+        
+        assert done['status'] == 'completed' and done['result'] == {'square': 16}
+        assert failed['status'] == 'failed' and failed['error'] == 'negative'
+        # State lives in the database, visible to other processes' queues
+        assert JobQueue(job_queue.db_path).count_by_status('u1') == {'completed': 1, 'failed': 1}
+    
+    def test_jobs_are_claimed_once(self, job_queue):
+        """Each queued job is handed to exactly one claimer, oldest first"""
+        first = job_queue.enqueue('noop', {})
+        second = job_queue.enqueue('noop', {})
+        
+        assert job_queue.claim()['id'] == first
+        assert job_queue.claim()['id'] == second
+        assert job_queue.claim() is None
+        assert job_queue.wait(first, timeout=0.1)['status'] == 'running'
+    
+    def test_only_lapsed_leases_are_requeued(self, job_queue):
+        """A job held by a live worker stays running; a lapsed one runs again elsewhere"""
+        live = job_queue.enqueue('noop', {})
+        lapsed = job_queue.enqueue('noop', {})
+        job_queue.claim('worker-a')
+        job_queue.claim('worker-b')
+        with job_queue._connect() as conn:
+            conn.execute("UPDATE jobs SET started_at = ? WHERE id = ?",
+                         ((datetime.now() - timedelta(hours=2)).isoformat(), live))
+            conn.execute("UPDATE jobs SET lease_expires = ? WHERE id = ?",
+                         ((datetime.now() - timedelta(seconds=1)).isoformat(), lapsed))
+        
+        assert job_queue.requeue_stale() == 1
+        assert job_queue.get(live)['status'] == 'running'
+        assert job_queue.claim('worker-c')['id'] == lapsed
+        
+        # The original worker's late outcome does not overwrite the new run
+        assert job_queue.complete(lapsed, {'by': 'b'}, 'worker-b') is False
+        assert job_queue.complete(lapsed, {'by': 'c'}, 'worker-c') is True
+        assert job_queue.get(lapsed)['result'] == {'by': 'c'}
+    
+    def test_workers_renew_leases_of_long_jobs(self, job_queue, monkeypatch):
+        """Jobs outliving the lease duration keep their lease while they run"""
+        from api import job_queue as job_queue_module
+        from api.job_queue import JobQueue, JobWorkerPool
+        monkeypatch.setattr(job_queue_module, 'LEASE_DURATION', timedelta(seconds=0.5))
+        monkeypatch.setattr(job_queue_module, 'LEASE_RENEW_INTERVAL', timedelta(seconds=0.1))
+        runs = []
+        
+        def slow(payload):
+            runs.append(payload)
+            time.sleep(1.5)
+            return 'done'
+        
+        job_id = job_queue.enqueue('slow', {})
+        workers = JobWorkerPool(job_queue, {'slow': slow}, max_workers=1)
+        workers.start()
+        try:
+            # Another API process starting up meanwhile
+            for _ in range(6):
+                time.sleep(0.2)
+                assert JobQueue(job_queue.db_path).requeue_stale() == 0
+            done = job_queue.wait(job_id, timeout=10)
+        finally:
+            workers.shutdown()
+        
+        assert done['status'] == 'completed' and done['result'] == 'done'
+        assert len(runs) == 1
+    
+    def test_numpy_results_stay_numeric(self, job_queue):
+        """numpy scalars and arrays in results come back as JSON numbers"""
+        job_id = job_queue.enqueue('profile', {})
+        job_queue.claim()
+        job_queue.complete(job_id, {
+            'missing_values': {'a': np.int64(12)},
+            'mean': np.float64(1.5),
+            'shape': np.array([3, 2]),
+            'when': datetime(2024, 1, 1)
+        })
+        
+        result = job_queue.get(job_id)['result']
+        assert result['missing_values'] == {'a': 12}
+        assert result['mean'] == 1.5
+        assert result['shape'] == [3, 2]
+        assert result['when'] == '2024-01-01 00:00:00'
+
+class TestAPIDataHandoff:
+    """Test that API endpoints hand agents a dataset reference"""
+    
+    @pytest.fixture
+    def api(self, tmp_path, monkeypatch):
+        import agents.orchestrator
+        from agents.orchestrator import AgentOrchestrator
+        # api_server imports an OrchestrationAgent the agents package does not define
+        monkeypatch.setattr(agents.orchestrator, 'OrchestrationAgent', AgentOrchestrator, raising=False)
+        monkeypatch.setenv('JOB_QUEUE_DB', str(tmp_path / 'jobs.db'))
+        monkeypatch.setenv('PREWARM_MODELS', 'false')
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delitem(sys.modules, 'api.api_server', raising=False)
+        from api import api_server
+        
+        data_path = tmp_path / 'data.csv'
+        pd.DataFrame({'a': range(5), 'b': list('xyzxy')}).to_csv(data_path, index=False)
+        api_server.sessions['s1'] = {'file_path': str(data_path), 'status': 'ready'}
+        api_server.api_keys['key'] = {'user_id': 'u1'}
+        
+        tasks = []
+        
+        def fake_execute(task):
+            tasks.append(task)
+            return {'success': True}
+        
+        for name in ('data_analysis', 'visualization'):
+            monkeypatch.setattr(api_server.agents[name], 'execute', fake_execute)
+        try:
+            yield api_server, tasks, str(data_path)
+        finally:
+            api_server.job_workers.shutdown()
+    
+    def test_analyze_and_visualize_pass_data_path(self, api):
+        """Agents get data_path, never a serialized frame"""
+        api_server, tasks, data_path = api
+        client = api_server.app.test_client()
+        headers = {'X-API-Key': 'key'}
+        
+        response = client.post('/api/v1/analyze', json={'session_id': 's1', 'type': 'analyze'}, headers=headers)
+        assert response.status_code == 202
+        job = api_server.job_queue.wait(response.get_json()['job_id'], timeout=10)
+        assert job['status'] == 'completed'
+        
+        response = client.post('/api/v1/visualize', json={'session_id': 's1', 'type': 'histogram', 'columns': ['a']},
+                               headers=headers)
+        assert response.status_code == 200
+        
+        analyze, visualize = tasks
+        assert analyze == {'type': 'analyze', 'data_path': data_path}
+        assert visualize['data_path'] == data_path and visualize['columns'] == ['a']
+        assert visualize['viz_type'] == 'histogram'
+        assert not any('data' in t for t in tasks)
 
 class TestMonitoringSystem:
     """Test monitoring system"""
@@ -445,6 +744,52 @@ class TestAPIClient:
         
         assert result['session_id'] == 'session_123'
     
+    @patch('sdk.client.requests.Session')
+    def test_columnar_predict(self, mock_session):
+        """Arrow predictions send and receive column buffers"""
+        from storage import ARROW_STREAM_TYPE, decode_frame, encode_frame
+        client = APIClient(api_key="test_key")
+        X = pd.DataFrame({'f1': [0.1, 0.2, 0.3], 'f2': [1.0, 2.0, 3.0]})
+        
+        mock_response = Mock()
+        mock_response.content = encode_frame(pd.DataFrame({
+            'prediction': [0, 1, 1],
+            'probability_0': [0.9, 0.2, 0.4],
+            'probability_1': [0.1, 0.8, 0.6]
+        }), ARROW_STREAM_TYPE)
+        mock_response.headers = {'X-Model-Id': 'model_1', 'X-Batch-Size': '3'}
+        mock_response.raise_for_status = Mock()
+        client.session.request = Mock(return_value=mock_response)
+        
+        result = client.predict('model_1', X, format='arrow')
+        
+        request = client.session.request.call_args.kwargs
+        assert request['headers']['Content-Type'] == ARROW_STREAM_TYPE
+        pd.testing.assert_frame_equal(decode_frame(request['data'], ARROW_STREAM_TYPE), X)
+        assert result['predictions'].tolist() == [0, 1, 1]
+        assert result['probabilities'].shape == (3, 2)
+        assert result['batch_size'] == 3
+    
+    @patch('sdk.client.requests.Session')
+    def test_wait_for_job_long_polls(self, mock_session):
+        """wait_for_job asks the server to hold the request instead of sleeping"""
+        client = APIClient(api_key="test_key")
+        
+        running = Mock()
+        running.json.return_value = {'id': 'job_1', 'status': 'running'}
+        completed = Mock()
+        completed.json.return_value = {'id': 'job_1', 'status': 'completed', 'result': {}}
+        client.session.request = Mock(side_effect=[running, completed])
+        
+        with patch('sdk.client.time.sleep') as sleep:
+            result = client.wait_for_job('job_1', timeout=300)
+        
+        assert result['status'] == 'completed'
+        assert not sleep.called
+        for call in client.session.request.call_args_list:
+            assert call.kwargs['url'].endswith('/api/v1/jobs/job_1')
+            assert 0 < call.kwargs['params']['wait'] <= 30
+    
     @patch('sdk.client.requests.Session')
     def test_model_operations(self, mock_session):
         """Test model-related operations"""
@@ -509,6 +854,185 @@ class TestIntegration:
             prod_model = registry.get_production_model("integration_test")
             assert prod_model is not None
     
+    def test_auto_training_records_candidates(self):
+        """Auto mode keeps the best candidate and records all of them"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = ModelRegistry(registry_path=tmpdir)
+            trainer = ModelTrainer(registry)
+            X = pd.DataFrame({'feature1': np.random.randn(200), 'feature2': np.random.randn(200)})
+            y = pd.Series((X['feature1'] + 0.1 * np.random.randn(200) > 0).astype(int))
+            
+            model_id = trainer.train_model(X=X, y=y, algorithm="auto", name="auto_test")
+            
+            metadata = registry.get_model_metadata(model_id)
+            candidates = {c['name']: c for c in metadata.candidates}
+            assert set(candidates) == {'rf', 'lr', 'svm'}
+            # Recorded by model, not by the preprocessing pipeline around it
+            assert {name: c['algorithm'] for name, c in candidates.items()} == {
+                'rf': 'RandomForestClassifier', 'lr': 'LogisticRegression', 'svm': 'SVC'
+            }
+            assert all(c['status'] == 'fitted' and c['fit_time'] > 0 for c in candidates.values())
+            best = max(candidates.values(), key=lambda c: c['score'])
+            assert metadata.tags == ['auto-trained', best['name']]
+            # Served models predict single rows; no per-call thread pools
+            assert registry.load_model(model_id)[-1].get_params().get('n_jobs') is None
+            
+            with pytest.raises(ValueError, match="No candidate"):
+                trainer.train_model(X=X, y=y, algorithm="auto", time_budget=0)
+    
+    def test_halving_search_tunes_random_forest(self):
+        """RF tuning narrows the grid rung by rung and records the schedule"""
+        from ml.search import resource_schedule
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = ModelRegistry(registry_path=tmpdir)
+            trainer = ModelTrainer(registry)
+            X = pd.DataFrame({'feature1': np.random.randn(600), 'feature2': np.random.randn(600)})
+            y = pd.Series((X['feature1'] > 0).astype(int))
+            
+            model_id = trainer.train_model(X=X, y=y, algorithm="rf", cv_folds=3, name="tuned")
+            
+            tuning = registry.get_model_metadata(model_id).tuning
+            rungs = tuning['rungs']
+            assert tuning['search'] == 'halving'
+            assert [r['n_candidates'] for r in rungs] == [18, 6, 2]
+            assert rungs[-1]['n_samples'] == 480
+            assert all(r['seconds'] > 0 for r in rungs)
+            assert registry.load_model(model_id)[-1].get_params()['n_estimators'] == tuning['best_params']['n_estimators']
+        
+        assert resource_schedule(90, 18, 3, 10) == [10, 30, 90]
+        assert resource_schedule(100, 2, 3, 10) == [100]
+        
+        # An exhausted budget keeps the leader of the first rung
+        from sklearn.linear_model import LogisticRegression
+        from ml.search import halving_search
+        result = halving_search(LogisticRegression(), {'C': [0.01, 0.1, 1, 10]}, X, y,
+                                scoring='accuracy', cv=3, time_budget=0)
+        assert result.stopped_early and len(result.rungs) == 1
+        assert result.best_estimator.get_params()['C'] == result.best_params['C']
+
+        # A configuration whose fits raise loses its rung instead of aborting the search
+        result = halving_search(LogisticRegression(), {'C': [-1, 1]}, X, y, scoring='accuracy', cv=3)
+        assert result.best_params == {'C': 1}
+    
+    def test_training_encodes_categorical_features(self):
+        """DataFrame features are encoded by a preprocessing stage registered with the model"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = ModelRegistry(registry_path=tmpdir)
+            trainer = ModelTrainer(registry)
+            rng = np.random.default_rng(0)
+            X = pd.DataFrame({
+                'amount': rng.normal(size=300),
+                'region': rng.choice(['north', 'south', 'east'], size=300),
+                'customer': [f"c{i}" for i in rng.integers(0, 200, size=300)]
+            })
+            X.loc[::10, 'amount'] = np.nan
+            y = pd.Series((X['region'] == 'north').astype(int))
+            
+            model_id = trainer.train_model(X=X, y=y, algorithm="rf", auto_tune=False, name="encoded")
+            
+            metadata = registry.get_model_metadata(model_id)
+            assert metadata.algorithm == 'RandomForestClassifier'
+            assert metadata.preprocessing == {'numeric': ['amount'], 'ordinal': ['region'], 'hashed': ['customer']}
+            assert metadata.metrics['accuracy'] == 1.0
+            # Raw rows, including an unseen category and a missing value, predict as they are
+            rows = pd.DataFrame({'amount': [np.nan, 0.5], 'region': ['north', 'west'], 'customer': ['c1', 'new']})
+            assert registry.load_model(model_id).predict(rows)[0] == 1
+    
+    def test_candidates_fit_in_process_pool(self):
+        """Large enough candidate sets are fitted concurrently in pool workers"""
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.ensemble import RandomForestClassifier
+        from ml.candidates import CandidatePool, core_budget, fit_candidates
+        X = pd.DataFrame({'f1': np.random.randn(400), 'f2': np.random.randn(400)})
+        y = (X['f1'] > 0).astype(int)
+        pool = CandidatePool(max_workers=2)
+        try:
+            results = fit_candidates(
+                {'rf': RandomForestClassifier(n_estimators=20), 'lr': LogisticRegression()},
+                X[:300], y[:300], X[300:], y[300:], pool=pool
+            )
+        finally:
+            pool.shutdown()
+        
+        assert [r.status for r in results] == ['fitted', 'fitted']
+        assert results[1].score > 0.9
+        assert core_budget(3, 2)[0] <= 2
+    
+    def test_candidate_budget_stops_running_fits(self):
+        """Fits past the time budget are killed; pool errors become failed results"""
+        import time
+        from sklearn.ensemble import GradientBoostingClassifier
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import FunctionTransformer
+        from ml.candidates import CandidatePool, fit_candidates
+        X = pd.DataFrame(np.random.randn(3000, 20))
+        y = (X[0] > 0).astype(int)
+        pool = CandidatePool(max_workers=2)
+        try:
+            pool.warm()
+            workers = pool.workers()
+            start = time.perf_counter()
+            results = fit_candidates(
+                {
+                    'slow': GradientBoostingClassifier(n_estimators=5000),
+                    'unpicklable': make_pipeline(FunctionTransformer(lambda x: x), LogisticRegression())
+                },
+                X[:2500], y[:2500], X[2500:], y[2500:], time_budget=2, pool=pool
+            )
+            elapsed = time.perf_counter() - start
+            
+            assert [r.status for r in results] == ['timed_out', 'failed']
+            assert 'pickle' in results[1].error.lower()
+            assert elapsed < 10
+            assert not any(process.is_alive() for process in workers)
+            
+            # The next training gets fresh workers
+            again = fit_candidates(
+                {'lr': LogisticRegression()}, X[:2500], y[:2500], X[2500:], y[2500:], pool=pool
+            )
+            assert again[0].status == 'fitted'
+        finally:
+            pool.shutdown()
+
+    def test_candidate_budget_spares_other_trainings(self):
+        """A training that finds the pool held runs, and is killed, in a private pool"""
+        from sklearn.ensemble import GradientBoostingClassifier
+        from ml.candidates import CandidatePool, fit_candidates
+        X = pd.DataFrame(np.random.randn(3000, 20))
+        y = (X[0] > 0).astype(int)
+        pool = CandidatePool(max_workers=2)
+        try:
+            pool.warm()
+            workers = pool.workers()
+            assert pool.claim()  # another training is using the pool
+            try:
+                results = fit_candidates(
+                    {'slow': GradientBoostingClassifier(n_estimators=5000)},
+                    X[:2500], y[:2500], X[2500:], y[2500:], time_budget=2, pool=pool
+                )
+            finally:
+                pool.release()
+
+            assert [r.status for r in results] == ['timed_out']
+            assert all(process.is_alive() for process in workers)
+        finally:
+            pool.shutdown()
+
+    def test_candidate_pool_terminate_without_worker_table(self):
+        """Where the worker table is unknown, terminate() shuts down instead of killing"""
+        from ml import candidates
+        pool = candidates.CandidatePool(max_workers=1)
+        pool.warm()
+        executor = pool.pool
+        with patch.object(candidates, '_WORKER_TABLE_VERSIONS', ((2, 0), (2, 7))):
+            assert pool.workers() == []
+            pool.terminate()
+        
+        assert pool._pool is None
+        with pytest.raises(RuntimeError):
+            executor.submit(int)
+
     def test_monitoring_workflow(self):
         """Test monitoring workflow"""
         monitoring = MonitoringSystem()
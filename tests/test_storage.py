@@ -0,0 +1,265 @@
+import pytest
+import os
+import tempfile
+from pathlib import Path
+import pandas as pd
+import numpy as np
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "python"))
+
+from storage import DatasetCache, get_dataset_cache
+from agents import DataAnalysisAgent
+
+
+@pytest.fixture
+def csv_file():
+    """Small CSV file on disk"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+        f.write("a,b\n1,2\n3,4\n5,6\n")
+        path = f.name
+    yield path
+    os.unlink(path)
+
+
+def test_dataset_cache_hit_and_miss(csv_file):
+    """Second read of an unchanged file is served from memory"""
+    cache = DatasetCache()
+
+    first = cache.get(csv_file)
+    second = cache.get(csv_file)
+
+    assert first is second
+    stats = cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+
+
+def test_dataset_cache_reloads_changed_file(csv_file):
+    """Rewriting the file invalidates the cached frame"""
+    cache = DatasetCache()
+    assert len(cache.get(csv_file)) == 3
+
+    with open(csv_file, 'a') as f:
+        f.write("7,8\n")
+
+    assert len(cache.get(csv_file)) == 4
+    assert cache.get_stats()['entries'] == 1
+
+
+def test_dataset_cache_evicts_over_budget():
+    """Least recently used frames are evicted when over the byte budget"""
+    paths = []
+    for _ in range(3):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            pd.DataFrame({'x': np.arange(100)}).to_csv(f, index=False)
+            paths.append(f.name)
+
+    try:
+        one_frame = int(pd.read_csv(paths[0]).memory_usage(deep=True).sum())
+        cache = DatasetCache(max_bytes=one_frame * 2)
+
+        for path in paths:
+            cache.get(path)
+
+        stats = cache.get_stats()
+        assert stats['entries'] == 2
+        assert stats['evictions'] == 1
+        assert stats['bytes'] <= stats['max_bytes']
+    finally:
+        for path in paths:
+            os.unlink(path)
+
+
+def test_agents_share_dataset_cache(csv_file):
+    """Agents load data through the process-wide cache"""
+    cache = get_dataset_cache()
+    cache.clear()
+
+    agent = DataAnalysisAgent()
+    agent.execute({'type': 'analyze', 'data_path': csv_file})
+    agent.execute({'type': 'summary', 'data_path': csv_file})
+
+    stats = cache.get_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+
+
+def test_ingest_csv_creates_parquet_copy(csv_file):
+    """CSV uploads are converted once into a typed Parquet file"""
+    from storage import ingest_file, read_preview, read_dataset
+
+    dataset = ingest_file(csv_file)
+    try:
+        assert dataset.columnar
+        assert dataset.dataset_path.endswith('.csv.parquet')
+        assert dataset.rows == 3
+        assert dataset.columns == ['a', 'b']
+        assert dataset.schema['a'] == 'int64'
+
+        assert len(read_preview(dataset.dataset_path, n_rows=2)) == 2
+
+        projected = read_dataset(dataset.dataset_path, columns=['b'])
+        assert list(projected.columns) == ['b']
+        assert projected['b'].tolist() == [2, 4, 6]
+    finally:
+        Path(dataset.dataset_path).unlink(missing_ok=True)
+
+
+def test_inspect_upload_reads_leading_block(tmp_path):
+    """Upload inspection returns schema and preview without counting rows"""
+    from storage import inspect_upload
+
+    path = tmp_path / "upload.csv"
+    pd.DataFrame({'a': range(100_000), 'b': ['x', 'y'] * 50_000}).to_csv(path, index=False)
+
+    inspection = inspect_upload(path, n_rows=3)
+
+    assert inspection.columns == ['a', 'b']
+    assert inspection.schema['a'] == 'int64'
+    assert inspection.preview['a'].tolist() == [0, 1, 2]
+    assert inspection.rows is None
+    assert not Path(str(path) + '.parquet').exists()
+
+
+def test_dataset_cache_keys_on_projection(csv_file):
+    """Different column projections of one file are cached separately"""
+    cache = DatasetCache()
+
+    full = cache.get(csv_file)
+    only_a = cache.get(csv_file, columns=['a'])
+
+    assert list(full.columns) == ['a', 'b']
+    assert list(only_a.columns) == ['a']
+    assert cache.get_stats()['entries'] == 2
+
+
+def test_shared_frame_round_trip():
+    """Shared frames rebuild with read-only numeric columns and survive close()"""
+    from storage import share_frame, attach_frame
+
+    df = pd.DataFrame({
+        'x': [1.0, np.nan, 3.0],
+        'n': [1, 2, 3],
+        'label': ['a', None, 'c']
+    }, index=pd.Index([10, 20, 30], name='id'))
+
+    with share_frame(df) as shared:
+        handle = shared.handle
+        view = handle.attach()
+        from_dict = attach_frame(handle.to_dict())
+
+    assert not Path(handle.path).exists()
+    assert view.equals(df)
+    assert from_dict.equals(df)
+    assert not view['x'].to_numpy().flags.writeable
+    assert handle.rows == 3
+
+
+def test_shared_frame_restores_unnamed_and_multi_index():
+    """Index levels come back with their original names and columns stay views"""
+    from storage import share_frame
+
+    df = pd.DataFrame({'x': [1.0, 2.0, 3.0]}, index=[5, 6, 7])
+    multi = df.set_index(pd.MultiIndex.from_tuples([('a', 1), ('a', 2), ('b', 1)], names=['k', None]))
+
+    with share_frame(df) as shared, share_frame(multi) as shared_multi:
+        view = shared.handle.attach()
+        multi_view = shared_multi.handle.attach()
+
+    assert view.equals(df) and view.index.name is None
+    assert multi_view.equals(multi) and list(multi_view.index.names) == ['k', None]
+    assert not multi_view['x'].to_numpy().flags.writeable
+
+
+def test_ml_agent_trains_from_shared_frame():
+    """MLAgent accepts a shared frame handle instead of a data_path"""
+    from storage import share_frame
+    from agents import MLAgent
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'a': rng.normal(size=60), 'b': rng.normal(size=60)})
+    df['y'] = 2 * df['a'] + rng.normal(scale=0.1, size=60)
+
+    with share_frame(df) as shared:
+        result = MLAgent().execute({
+            'ml_task': 'train',
+            'shared_frame': shared.handle.to_dict(),
+            'target_column': 'y',
+            'task_type': 'regression'
+        })
+
+    assert 'error' not in result
+    assert result['model_id'].startswith('shared_y')
+
+
+def test_data_fingerprint_tracks_content():
+    """Fingerprints are stable across copies and change with values, dtypes or index"""
+    from storage import data_fingerprint
+
+    df = pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']})
+
+    assert data_fingerprint(df) == data_fingerprint(df.copy())
+    assert data_fingerprint(df) != data_fingerprint(df.assign(a=[1, 2, 4]))
+    assert data_fingerprint(df) != data_fingerprint(df.astype({'a': 'float64'}))
+    assert data_fingerprint(df) != data_fingerprint(df.set_axis([5, 6, 7]))
+
+
+def test_data_fingerprint_arrays_and_sampling():
+    """Arrays hash by memory; sampled fingerprints are marked and only see sampled rows"""
+    from storage import data_fingerprint
+
+    X = np.arange(20, dtype=float).reshape(10, 2)
+    assert data_fingerprint(X) == data_fingerprint(X.copy(order='F'))
+    assert data_fingerprint(X) != data_fingerprint(X.reshape(2, 10))
+    assert data_fingerprint(np.array(['a', None, 'c'], dtype=object))
+
+    df = pd.DataFrame({'a': np.arange(1000), 'b': np.random.default_rng(0).normal(size=1000)})
+    sampled = data_fingerprint(df, sample_rows=100)
+    assert sampled.startswith('sampled-')
+    assert sampled != data_fingerprint(df)
+    assert data_fingerprint(df, sample_rows=5000) == data_fingerprint(df)
+
+    edited = df.copy()
+    edited.loc[1, 'b'] += 1  # between sampled rows: only the full fingerprint sees it
+    assert data_fingerprint(edited, sample_rows=100) == sampled
+    assert data_fingerprint(edited) != data_fingerprint(df)
+
+
+def test_result_cache_round_trip_and_eviction(tmp_path):
+    """Entries survive a new cache instance; least recently used go first over budget"""
+    from storage import ResultCache, make_result_key
+
+    key = make_result_key('fp', 'data_profiling', {'mode': None}, 'v1')
+    assert key == make_result_key('fp', 'data_profiling', {'mode': None}, 'v1')
+    assert key != make_result_key('fp', 'data_profiling', {'mode': None}, 'v2')
+
+    cache = ResultCache(tmp_path)
+    assert cache.get(key) is None
+    cache.put(key, {'status': 'success', 'results': {'rows': 3}})
+    assert ResultCache(tmp_path).get(key) == {'status': 'success', 'results': {'rows': 3}}
+
+    payload = {'blob': 'x' * 1000}
+    small = ResultCache(tmp_path / 'small', max_bytes=2500)
+    for i in range(3):
+        small.put(f'{i:02d}key', payload)
+        os.utime(small._path(f'{i:02d}key'), (i, i))
+
+    small.put('03key', payload)
+
+    assert small.get('00key') is None
+    assert small.get('01key') is None
+    assert small.get('03key') == payload
+    assert small.get_stats()['evictions'] == 2
+
+
+def test_columnar_bodies_round_trip():
+    """Arrow stream and Parquet bodies decode to the encoded frame"""
+    from storage import ARROW_STREAM_TYPE, PARQUET_TYPE, columnar_type, decode_frame, encode_frame
+
+    df = pd.DataFrame({'x': np.arange(5, dtype=float), 'label': list('abcde')})
+
+    for content_type in [ARROW_STREAM_TYPE, PARQUET_TYPE]:
+        assert columnar_type(content_type) == content_type
+        pd.testing.assert_frame_equal(decode_frame(encode_frame(df, content_type), content_type), df)
+    assert columnar_type('application/json') is None
@@ -286,6 +286,201 @@ class TestWorkflowManager:
         assert 'key_findings' in summary
         assert 'recommendations' in summary
     
+    def test_plan_scheduler_ready_queue(self, workflow_manager):
+        """Dependents start when their own prerequisites finish; caps and failures respected"""
+        import time
+        durations = {'slow': 0.6, 'fast': 0.05, 'after_fast': 0.05, 'after_slow': 0.05,
+                     'user_1': 0.2, 'user_2': 0.2, 'broken': 0.0, 'after_broken': 0.0}
+        
+        def make_task(task_id, deps=(), user=None, priority=1):
+            task = AnalysisTask(
+                id=task_id, name=task_id, description="", task_type=TaskType.CUSTOM,
+                status=TaskStatus.PENDING, created_at=datetime.now(),
+                dependencies=list(deps), assigned_to=user, priority=priority
+            )
+            workflow_manager.tasks[task_id] = task
+            return task
+        
+        tasks = [
+            make_task('slow', priority=5),
+            make_task('fast', priority=4),
+            make_task('after_fast', ['fast']),
+            make_task('after_slow', ['slow']),
+            make_task('user_1', user='ana_001'),
+            make_task('user_2', user='ana_001'),
+            make_task('broken'),
+            make_task('after_broken', ['broken'])
+        ]
+        plan = AnalysisPlan(
+            id="sched_plan", name="Scheduling", description="", created_by="mgr_001",
+            created_at=datetime.now(), objectives=[], data_sources=[], tasks=tasks, timeline={}
+        )
+        workflow_manager.plans[plan.id] = plan
+        workflow_manager.max_concurrent_tasks = 4
+        workflow_manager.max_tasks_per_user = 1
+        
+        ran = []
+        
+        def fake_run_task(task_id):
+            ran.append(task_id)
+            time.sleep(durations[task_id])
+            if task_id == 'broken':
+                return {'error': 'boom'}
+            return {'done': task_id}
+        
+        workflow_manager.run_task = fake_run_task
+        results = workflow_manager.execute_plan(plan.id)
+        timing = results['timing']['tasks']
+        
+        # Highest priority dispatched first
+        assert ran[:2] == ['slow', 'fast']
+        # after_fast does not wait for the slow sibling
+        assert timing['after_fast']['start'] < timing['slow']['end']
+        assert timing['after_slow']['start'] >= timing['slow']['end']
+        # One running task per user
+        first, second = sorted(['user_1', 'user_2'], key=lambda t: timing[t]['start'])
+        assert timing[second]['start'] >= timing[first]['end']
+        # Dependents of failures are skipped
+        assert 'after_broken' not in ran
+        assert 'broken' in results['tasks']['after_broken']['error']
+        assert results['timing']['elapsed'] < sum(durations.values())
+    
+    def test_concurrent_tasks_overflow_to_worker_pool(self, workflow_manager, tmp_path):
+        """Ready tasks overlap: one runs in-process, the rest go to the worker pool"""
+        import time
+        import threading
+        tasks = []
+        for i in range(2):
+            notebook = tmp_path / f"nb_{i}.py"
+            notebook.write_text(f"# notebook {i}\n")
+            task = AnalysisTask(
+                id=f"t{i}", name=f"t{i}", description="", task_type=TaskType.CUSTOM,
+                status=TaskStatus.PENDING, created_at=datetime.now(),
+                marimo_notebook_path=str(notebook)
+            )
+            workflow_manager.tasks[task.id] = task
+            tasks.append(task)
+        plan = AnalysisPlan(
+            id="overlap_plan", name="Overlap", description="", created_by="mgr_001",
+            created_at=datetime.now(), objectives=[], data_sources=[], tasks=tasks, timeline={}
+        )
+        workflow_manager.plans[plan.id] = plan
+        
+        both_started = threading.Barrier(2, timeout=5)
+        used = []
+        
+        def fake_run(kind):
+            def run(*args, **kwargs):
+                used.append(kind)
+                both_started.wait()
+                time.sleep(0.1)
+                return {'success': True, 'results': {'kind': kind}}
+            return run
+        
+        workflow_manager.notebook_runner.run_notebook = fake_run('in_process')
+        workflow_manager.executor.run = fake_run('pool')
+        results = workflow_manager.execute_plan(plan.id)
+        
+        assert sorted(used) == ['in_process', 'pool']
+        assert all('error' not in r for r in results['tasks'].values())
+    
+    def test_task_slots_are_shared_across_plans(self, workflow_manager):
+        """max_concurrent_tasks holds for run_task calls from different plans"""
+        import time
+        import threading
+        workflow_manager.max_concurrent_tasks = 1
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+        
+        def fake_run_task(task):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.05)
+            with lock:
+                state['running'] -= 1
+            return {'done': task.id}
+        
+        workflow_manager._run_task = fake_run_task
+        for i in range(3):
+            workflow_manager.tasks[f"p{i}"] = AnalysisTask(
+                id=f"p{i}", name=f"p{i}", description="", task_type=TaskType.CUSTOM,
+                status=TaskStatus.PENDING, created_at=datetime.now()
+            )
+        threads = [threading.Thread(target=workflow_manager.run_task, args=(f"p{i}",)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert state['peak'] == 1
+    
+    def test_shared_frames_outlive_overlapping_plans(self, workflow_manager, sample_data):
+        """A data source shared by two running plans stays mapped until both finish"""
+        from storage import attach_frame
+        from marimo_integration.notebook_runner import notebook_defs
+        
+        def plan_on(plan_id):
+            tasks = [
+                AnalysisTask(
+                    id=f"{plan_id}_{i}", name="", description="", task_type=TaskType.CUSTOM,
+                    status=TaskStatus.PENDING, created_at=datetime.now(), data_source=sample_data
+                )
+                for i in range(2)
+            ]
+            return AnalysisPlan(
+                id=plan_id, name=plan_id, description="", created_by="mgr_001",
+                created_at=datetime.now(), objectives=[], data_sources=[sample_data],
+                tasks=tasks, timeline={}
+            )
+        
+        held_a = workflow_manager._share_data_sources(plan_on("a"))
+        path = workflow_manager.shared_frames[sample_data]
+        held_b = workflow_manager._share_data_sources(plan_on("b"))
+        assert workflow_manager.shared_frames[sample_data] == path
+        
+        workflow_manager._release_data_sources(held_a)
+        assert len(attach_frame(path)) == 100
+        
+        workflow_manager._release_data_sources(held_b)
+        assert sample_data not in workflow_manager.shared_frames
+        assert not Path(path).exists()
+        # Tasks still holding the old path read the data file instead
+        defs = notebook_defs({'shared_frame': path, 'data_source': sample_data})
+        assert len(defs['df']) == 100
+    
+    def test_run_task_reuses_cached_results(self, workflow_manager, sample_data, tmp_path):
+        """Re-running a task on unchanged data and notebook skips the notebook"""
+        notebook = tmp_path / "profile.py"
+        notebook.write_text("# profile notebook\n")
+        task = AnalysisTask(
+            id="cached_task", name="Profile", description="", task_type=TaskType.DATA_PROFILING,
+            status=TaskStatus.PENDING, created_at=datetime.now(),
+            data_source=sample_data, marimo_notebook_path=str(notebook)
+        )
+        workflow_manager.tasks[task.id] = task
+        
+        calls = []
+        
+        def fake_run_notebook(path, inputs=None, data=None):
+            calls.append(path)
+            return {'success': True, 'results': {'rows': 100}}
+        
+        workflow_manager.notebook_runner.run_notebook = fake_run_notebook
+        
+        first = workflow_manager.run_task(task.id)
+        second = workflow_manager.run_task(task.id)
+        
+        assert len(calls) == 1
+        assert first['cache_hit'] is False and second['cache_hit'] is True
+        assert second['rows'] == 100
+        assert task.status == TaskStatus.COMPLETED
+        
+        # A changed notebook is a different computation
+        notebook.write_text("# profile notebook v2\n")
+        assert workflow_manager.run_task(task.id)['cache_hit'] is False
+        assert len(calls) == 2
+    
     def test_results_aggregation(self, workflow_manager):
         """Test results aggregation from multiple tasks"""
         # Create mock plan and task results